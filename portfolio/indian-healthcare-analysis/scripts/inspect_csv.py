@@ -1,91 +1,186 @@
 """
 CSV Inspector - Understand your NFHS-5 data structure
 Run this BEFORE loading to see what's in your files
+
+Each file is profiled from its header and a sample of rows spread over the
+memory-mapped file (nfhs/csv_profile.py), and the state files are profiled
+in parallel, so the whole raw folder takes well under a second. Row counts,
+dtypes and null rates are then estimates; --full parses every row.
+
+Usage:
+    python scripts/inspect_csv.py
+    python scripts/inspect_csv.py --full      # exact row counts, reads everything
 """
 
-import pandas as pd
+import argparse
+import time
 from pathlib import Path
 
-print("=" * 70)
-print("NFHS-5 DATA INSPECTOR")
-print("=" * 70)
+import pandas as pd
+
+from nfhs.csv_profile import profile_csv, profile_files
 
 RAW_DATA_DIR = Path('data/raw/nfhs5')
 
-# Check India.csv
-india_csv = RAW_DATA_DIR / 'India.csv'
-print("\n" + "-" * 70)
-print("📄 INDIA.CSV")
-print("-" * 70)
-
-if india_csv.exists():
-    df = pd.read_csv(india_csv)
-    print(f"✓ File exists: {india_csv.stat().st_size / 1024:.0f} KB")
-    print(f"✓ Rows: {len(df):,}")
-    print(f"✓ Columns: {len(df.columns)}")
+KEY_COLUMNS = ['State', 'District', 'Indicator', 'NFHS-5', 'NFHS-4']
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Inspect the raw NFHS-5 CSV files")
+    parser.add_argument('--full', action='store_true',
+                        help="parse every row instead of a sample (exact, but slow on big files)")
+    parser.add_argument('--workers', type=int, default=4,
+                        help="threads profiling the state files")
+    parser.add_argument('--data-dir', type=Path, default=RAW_DATA_DIR,
+                        help="folder with India.csv and _states/")
+    return parser.parse_args()
+
+
+def rows_text(profile):
+    """'1,234' for exact counts, '~1,234 (...)' for estimates"""
+    if profile.exact:
+        return f"{profile.rows:,}"
+    return f"~{profile.rows:,} (estimated from {len(profile.sample):,} sampled rows)"
+
+
+def print_duplicates(profile, indent=""):
+    """Warn about columns that clash once case and spacing are ignored"""
+    for names in profile.duplicates:
+        print(f"{indent}⚠️ Duplicate columns: {' / '.join(names)}")
+        if set(names) == {'District', 'DISTRICT'}:
+            print(f"{indent}   (the loader keeps 'District' and drops 'DISTRICT')")
+
+
+def print_column_profile(profile):
+    """dtype and share of empty values per column"""
+    table = pd.DataFrame({'dtype': profile.dtypes.astype(str),
+                          'null %': (100 * profile.null_rates).round(1)})
+    print(table.to_string())
+
+
+def inspect_india(india_csv, full):
+    """Profile India.csv"""
+    print("\n" + "-" * 70)
+    print("📄 INDIA.CSV")
+    print("-" * 70)
+
+    if not india_csv.exists():
+        print("✗ India.csv not found")
+        return
+
+    profile = profile_csv(india_csv, full=full)
+    if profile.error:
+        print(f"✗ {profile.error}")
+        return
+
+    print(f"✓ File exists: {profile.size / 1024:.0f} KB")
+    print(f"✓ Rows: {rows_text(profile)}")
+    print(f"✓ Columns: {len(profile.columns)}")
     print(f"\nColumn names:")
-    for i, col in enumerate(df.columns, 1):
+    for i, col in enumerate(profile.columns, 1):
         print(f"  {i}. {col}")
-    
+    print_duplicates(profile, indent="  ")
+
     print(f"\nFirst 5 rows:")
-    print(df.head().to_string())
-    
-    print(f"\nData types:")
-    print(df.dtypes)
-    
+    print(profile.sample.head().to_string())
+
+    print(f"\nData types{'' if profile.exact else ' (from the sample)'}:")
+    print_column_profile(profile)
+
     # Check for key columns
-    key_cols = ['State', 'District', 'Indicator', 'NFHS-5', 'NFHS-4']
-    present = [col for col in key_cols if col in df.columns]
+    present = [col for col in KEY_COLUMNS if col in profile.columns]
     print(f"\nKey columns found: {present}")
-    
-else:
-    print("✗ India.csv not found")
-
-# Check India_Change.csv
-print("\n" + "-" * 70)
-print("📄 INDIA_CHANGE.CSV")
-print("-" * 70)
-
-india_change = RAW_DATA_DIR / 'India_Change.csv'
-if india_change.exists():
-    df = pd.read_csv(india_change)
-    print(f"✓ File exists: {india_change.stat().st_size / 1024:.0f} KB")
-    print(f"✓ Rows: {len(df):,}")
-    print(f"✓ Columns: {list(df.columns)}")
+
+
+def inspect_change(india_change, full):
+    """Profile India_Change.csv"""
+    print("\n" + "-" * 70)
+    print("📄 INDIA_CHANGE.CSV")
+    print("-" * 70)
+
+    if not india_change.exists():
+        print("✗ India_Change.csv not found")
+        return
+
+    profile = profile_csv(india_change, full=full)
+    if profile.error:
+        print(f"✗ {profile.error}")
+        return
+
+    print(f"✓ File exists: {profile.size / 1024:.0f} KB")
+    print(f"✓ Rows: {rows_text(profile)}")
+    print(f"✓ Columns: {profile.columns}")
+    print_duplicates(profile, indent="  ")
     print(f"\nFirst 3 rows:")
-    print(df.head(3).to_string())
-else:
-    print("✗ India_Change.csv not found")
-
-# Check _states folder
-print("\n" + "-" * 70)
-print("📁 _STATES FOLDER")
-print("-" * 70)
-
-states_folder = RAW_DATA_DIR / '_states'
-if states_folder.exists():
-    csv_files = list(states_folder.glob("*.csv"))
+    print(profile.sample.head(3).to_string())
+
+
+def inspect_states(states_folder, full, workers):
+    """Profile every state file in parallel"""
+    print("\n" + "-" * 70)
+    print("📁 _STATES FOLDER")
+    print("-" * 70)
+
+    if not states_folder.exists():
+        print("✗ _states folder not found")
+        return
+
+    csv_files = sorted(states_folder.glob("*.csv"))
     print(f"✓ Found {len(csv_files)} state CSV files")
-    
-    if csv_files:
-        print(f"\nFirst 10 files:")
-        for f in csv_files[:10]:
-            print(f"  • {f.name}")
-        
-        # Inspect first state file
-        print(f"\n📊 Sample from first file: {csv_files[0].name}")
-        df = pd.read_csv(csv_files[0])
-        print(f"  Rows: {len(df):,}")
-        print(f"  Columns: {list(df.columns)}")
+    if not csv_files:
+        return
+
+    profiles = profile_files(csv_files, workers=workers, full=full)
+    reference = next((p.columns for p in profiles if not p.error), [])
+
+    print(f"\n  {'File':<34}{'KB':>8}{'Rows':>12}{'Cols':>6}  Notes")
+    for profile in profiles:
+        if profile.error:
+            print(f"  {profile.path.name:<34}{profile.size / 1024:>8.0f}{'':>12}{'':>6}  ✗ {profile.error}")
+            continue
+        notes = []
+        if profile.duplicates:
+            notes.append("duplicate columns: " + ', '.join('/'.join(g) for g in profile.duplicates))
+        if profile.columns != reference:
+            notes.append("columns differ from the first file")
+        rows = f"{profile.rows:,}" if profile.exact else f"~{profile.rows:,}"
+        print(f"  {profile.path.name:<34}{profile.size / 1024:>8.0f}{rows:>12}"
+              f"{len(profile.columns):>6}  {'; '.join(notes)}")
+
+    # Inspect first state file
+    first = next((p for p in profiles if not p.error), None)
+    if first is not None:
+        print(f"\n📊 Sample from first file: {first.path.name}")
+        print(f"  Rows: {rows_text(first)}")
+        print(f"  Columns: {first.columns}")
+        print_duplicates(first, indent="  ")
         print(f"\nFirst 3 rows:")
-        print(df.head(3).to_string())
-else:
-    print("✗ _states folder not found")
-
-print("\n" + "=" * 70)
-print("INSPECTION COMPLETE")
-print("=" * 70)
-print("\n💡 Recommended next steps:")
-print("1. Review the column structure above")
-print("2. Run the custom data loader: python scripts/02_load_data_custom.py")
-print("3. The loader will adapt to your CSV structure automatically")
\ No newline at end of file
+        print(first.sample.head(3).to_string())
+
+
+def main():
+    """Main execution function"""
+    args = parse_args()
+    start = time.perf_counter()
+
+    print("=" * 70)
+    print("NFHS-5 DATA INSPECTOR")
+    print("=" * 70)
+    print(f"(mode: {'full read' if args.full else 'sampled profile'})")
+
+    inspect_india(args.data_dir / 'India.csv', args.full)
+    inspect_change(args.data_dir / 'India_Change.csv', args.full)
+    inspect_states(args.data_dir / '_states', args.full, args.workers)
+
+    print("\n" + "=" * 70)
+    print(f"INSPECTION COMPLETE ({time.perf_counter() - start:.2f}s)")
+    print("=" * 70)
+    print("\n💡 Recommended next steps:")
+    print("1. Review the column structure above")
+    print("2. Run the custom data loader: python scripts/02_load_data_custom.py")
+    print("3. The loader will adapt to your CSV structure automatically")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+NFHS-5 normalisation and ingestion package
+Author: RK
+
+One copy of the lookups, column normalisation and load logic behind the
+01/02/03 loader scripts, which are thin wrappers around `python -m nfhs`.
+
+Importing the package has no side effects and doesn't import pandas:
+only the state lookups are loaded here, the loaders on first use.
+"""
+
+from .lookups import (STATE_ALIASES, STATE_CODES, STATE_REGIONS,
+                      resolve_state, state_code, state_region)
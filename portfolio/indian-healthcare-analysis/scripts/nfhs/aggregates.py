@@ -0,0 +1,183 @@
+"""
+Materialised summary tables for the analysis reports
+Author: RK
+Description: Pre-aggregated rollups of fact_health_metrics, refreshed by the
+             loader after every load, so reports such as first_analysis.py
+             read a few thousand rows instead of scanning the fact table.
+
+agg_state_indicator holds additive counts and sums, so any coarser rollup
+(state, indicator, region, category, national) can be derived from it
+exactly. Districts get their own rollup because they are finer than a state.
+"""
+
+AGGREGATE_TABLES = ['agg_state_indicator', 'agg_district', 'agg_region', 'agg_category']
+
+AGGREGATE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS agg_state_indicator (
+        state_id INTEGER,
+        indicator_id INTEGER,
+        data_points INTEGER NOT NULL,      -- all fact rows
+        nfhs5_count INTEGER NOT NULL,      -- rows with an NFHS-5 value
+        nfhs5_sum REAL,
+        nfhs4_count INTEGER NOT NULL,      -- rows with an NFHS-4 value
+        nfhs4_sum REAL,
+        compared INTEGER NOT NULL,         -- rows with both values (= change_value set)
+        compared_nfhs5_sum REAL,           -- NFHS-5 sum over those rows
+        change_sum REAL,
+        improved INTEGER NOT NULL,
+        declined INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_agg_state_indicator
+        ON agg_state_indicator(state_id, indicator_id);
+
+    CREATE TABLE IF NOT EXISTS agg_district (
+        district_id INTEGER,
+        state_id INTEGER,
+        measured INTEGER NOT NULL,         -- rows with an NFHS-4 value
+        improved INTEGER NOT NULL,
+        declined INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_agg_district ON agg_district(state_id, district_id);
+
+    CREATE TABLE IF NOT EXISTS agg_region (
+        region TEXT PRIMARY KEY,
+        num_states INTEGER NOT NULL,       -- states with NFHS-5 values
+        data_points INTEGER NOT NULL,      -- rows with an NFHS-5 value
+        improved INTEGER NOT NULL,
+        pct_improved REAL,
+        avg_nfhs5 REAL
+    );
+
+    CREATE TABLE IF NOT EXISTS agg_category (
+        category TEXT PRIMARY KEY,
+        num_indicators INTEGER NOT NULL,   -- indicators with NFHS-4 values
+        measurements INTEGER NOT NULL,     -- rows with an NFHS-4 value
+        avg_nfhs5 REAL,                    -- over rows with both values
+        improved INTEGER NOT NULL,
+        declined INTEGER NOT NULL
+    );
+'''
+
+# Additive measures of agg_state_indicator, in column order. trend = 1 is 1/0,
+# or NULL (ignored by SUM) when a value is missing. trend is direction-aware:
+# a fall in stunting counts as improved (see trends.py).
+MEASURES_SQL = '''
+        COUNT(*) as data_points,
+        COUNT(nfhs5_value) as nfhs5_count,
+        SUM(nfhs5_value) as nfhs5_sum,
+        COUNT(nfhs4_value) as nfhs4_count,
+        SUM(nfhs4_value) as nfhs4_sum,
+        COUNT(change_value) as compared,
+        SUM(CASE WHEN change_value IS NOT NULL THEN nfhs5_value END) as compared_nfhs5_sum,
+        SUM(change_value) as change_sum,
+        IFNULL(SUM(trend = 1), 0) as improved,
+        IFNULL(SUM(trend = -1), 0) as declined
+'''
+
+STATE_INDICATOR_SELECT = f'''
+    SELECT
+        state_id,
+        indicator_id,{MEASURES_SQL}
+    FROM fact_health_metrics
+'''
+
+DISTRICT_SELECT = '''
+    SELECT
+        district_id,
+        state_id,
+        COUNT(nfhs4_value) as measured,
+        IFNULL(SUM(trend = 1), 0) as improved,
+        IFNULL(SUM(trend = -1), 0) as declined
+    FROM fact_health_metrics
+    WHERE district_id IS NOT NULL
+'''
+
+REGION_INSERT = '''
+    INSERT INTO agg_region
+    SELECT
+        s.region,
+        COUNT(DISTINCT CASE WHEN a.nfhs5_count > 0 THEN a.state_id END),
+        SUM(a.nfhs5_count),
+        SUM(a.improved),
+        100.0 * SUM(a.improved) / SUM(a.nfhs5_count),
+        SUM(a.nfhs5_sum) / SUM(a.nfhs5_count)
+    FROM agg_state_indicator a
+    JOIN dim_states s ON s.state_id = a.state_id
+    WHERE s.region IS NOT NULL
+    GROUP BY s.region
+    HAVING SUM(a.nfhs5_count) > 0
+'''
+
+CATEGORY_INSERT = '''
+    INSERT INTO agg_category
+    SELECT
+        i.category,
+        COUNT(DISTINCT CASE WHEN a.nfhs4_count > 0 THEN a.indicator_id END),
+        SUM(a.nfhs4_count),
+        SUM(a.compared_nfhs5_sum) / SUM(a.compared),
+        SUM(a.improved),
+        SUM(a.declined)
+    FROM agg_state_indicator a
+    JOIN dim_indicators i ON i.indicator_id = a.indicator_id
+    WHERE i.category IS NOT NULL
+    GROUP BY i.category
+    HAVING SUM(a.nfhs4_count) > 0
+'''
+
+
+def ensure_aggregates(conn):
+    """Create the summary tables; True if any of them was missing"""
+    existing = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'agg_%'")}
+    conn.executescript(AGGREGATE_SCHEMA)
+    return not set(AGGREGATE_TABLES) <= existing
+
+
+def aggregates_available(conn):
+    """True if the database has the summary tables"""
+    existing = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'agg_%'")}
+    return set(AGGREGATE_TABLES) <= existing
+
+
+def refresh_aggregates(conn, states=None):
+    """Rebuild the summary tables from the fact table.
+
+    With states=None everything is rebuilt; otherwise only the rows of the
+    given state names are recomputed (using idx_fact_state), along with
+    rows of states that no longer exist. Region and category rollups are
+    always rebuilt from agg_state_indicator, which is small.
+    Returns the number of agg_state_indicator rows written.
+    """
+    cursor = conn.cursor()
+    if states is None:
+        cursor.execute("DELETE FROM agg_state_indicator")
+        cursor.execute("DELETE FROM agg_district")
+        where = ''
+    else:
+        names = sorted(set(states))
+        state_ids = [row[0] for row in cursor.execute(
+            f"SELECT state_id FROM dim_states WHERE state_name IN ({', '.join('?' * len(names))})",
+            names)] if names else []
+        ids = ', '.join(str(int(state_id)) for state_id in state_ids) or 'NULL'
+        stale = f'''state_id IN ({ids}) OR state_id IS NULL
+                    OR state_id NOT IN (SELECT state_id FROM dim_states)'''
+        cursor.execute(f"DELETE FROM agg_state_indicator WHERE {stale}")
+        cursor.execute(f"DELETE FROM agg_district WHERE {stale}")
+        where = f"state_id IN ({ids}) OR state_id IS NULL"
+
+    written = cursor.execute(
+        "INSERT INTO agg_state_indicator " + STATE_INDICATOR_SELECT
+        + (f" WHERE {where}" if where else '') + " GROUP BY state_id, indicator_id"
+    ).rowcount
+    cursor.execute(
+        "INSERT INTO agg_district " + DISTRICT_SELECT
+        + (f" AND ({where})" if where else '') + " GROUP BY district_id"
+    )
+
+    cursor.execute("DELETE FROM agg_region")
+    cursor.execute(REGION_INSERT)
+    cursor.execute("DELETE FROM agg_category")
+    cursor.execute(CATEGORY_INSERT)
+    conn.commit()
+    return written
@@ -0,0 +1,469 @@
+"""
+Analysis engine for the first_analysis.py report
+Author: RK
+Description: Builds every section of the report (state ranking, key
+             indicators, regions, best/worst districts, categories and the
+             national trend) with one of three interchangeable methods:
+
+    views        one query per section against vw_health_analysis (the
+                 original report, 7 scans of the fact table)
+    summary      one query per section against the agg_* tables
+                 maintained by the loader (see aggregates.py)
+    grouped      two grouped reads of the fact table, one per grain the
+                 sections need (state x indicator and district), every
+                 section derived from those few thousand rows with pandas
+
+compare_methods() times them against each other and checks they agree.
+Pass a QueryCache (query_cache.py) to serve repeated runs from disk, and a
+ReadPool (read_pool.py) to run a method's independent queries concurrently
+on read-only connections. Key indicators are found with the full-text
+index (indicator_search.py) and filtered by indicator_id.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import DISTRICT_SELECT, MEASURES_SQL, aggregates_available
+from .indicator_search import id_list_sql, search_indicators
+
+METHODS = ['views', 'summary', 'grouped']
+
+SECTIONS = ['states', 'indicators', 'regions', 'best_districts',
+            'worst_districts', 'categories', 'totals']
+
+# Indicators shown in the national overview: names with a word starting with any of these
+KEY_INDICATOR_TERMS = ['immuniz', 'institutional', 'antenatal', 'stunting', 'anaemic']
+
+TOP_STATES = 10
+TOP_DISTRICTS = 5
+MIN_DISTRICT_INDICATORS = 50
+
+VIEW_QUERIES = {
+    'states': f"""
+        SELECT
+            state_name,
+            region,
+            COUNT(*) as total_indicators,
+            COUNT(CASE WHEN trend = 'Improved' THEN 1 END) as improved_count,
+            COUNT(CASE WHEN trend = 'Declined' THEN 1 END) as declined_count,
+            ROUND(100.0 * COUNT(CASE WHEN trend = 'Improved' THEN 1 END) / COUNT(*), 1) as improvement_rate
+        FROM vw_health_analysis
+        WHERE nfhs4_value IS NOT NULL AND nfhs5_value IS NOT NULL
+        GROUP BY state_id  -- state_name and region are fixed per state_id
+        ORDER BY improvement_rate DESC, state_name
+        LIMIT {TOP_STATES}
+    """,
+    'indicators': f"""
+        SELECT
+            indicator,
+            category,
+            COUNT(DISTINCT state_name) as states_covered,
+            ROUND(AVG(nfhs5_value), 2) as avg_nfhs5,
+            ROUND(AVG(nfhs4_value), 2) as avg_nfhs4,
+            ROUND(AVG(change_value), 2) as avg_change
+        FROM vw_health_analysis
+        WHERE indicator_id IN ({{key_indicator_ids}})
+        GROUP BY indicator_id
+        ORDER BY avg_change DESC, indicator
+    """,
+    'regions': """
+        SELECT
+            region,
+            COUNT(DISTINCT state_name) as num_states,
+            COUNT(*) as total_data_points,
+            ROUND(AVG(CASE WHEN trend = 'Improved' THEN 1.0 ELSE 0.0 END) * 100, 1) as pct_improved,
+            ROUND(AVG(nfhs5_value), 2) as avg_current_value
+        FROM vw_health_analysis
+        WHERE region IS NOT NULL
+          AND nfhs5_value IS NOT NULL
+        GROUP BY region
+        ORDER BY pct_improved DESC, region
+    """,
+    'best_districts': f"""
+        SELECT
+            state_name,
+            district_name,
+            COUNT(*) as indicators_measured,
+            COUNT(CASE WHEN trend = 'Improved' THEN 1 END) as improved_indicators,
+            ROUND(100.0 * COUNT(CASE WHEN trend = 'Improved' THEN 1 END) / COUNT(*), 1) as improvement_rate
+        FROM vw_health_analysis
+        WHERE district_id IS NOT NULL
+          AND nfhs4_value IS NOT NULL
+        GROUP BY district_id
+        HAVING indicators_measured >= {MIN_DISTRICT_INDICATORS}
+        ORDER BY improvement_rate DESC, state_name, district_name
+        LIMIT {TOP_DISTRICTS}
+    """,
+    'worst_districts': f"""
+        SELECT
+            state_name,
+            district_name,
+            COUNT(*) as indicators_measured,
+            COUNT(CASE WHEN trend = 'Declined' THEN 1 END) as declined_indicators,
+            ROUND(100.0 * COUNT(CASE WHEN trend = 'Declined' THEN 1 END) / COUNT(*), 1) as decline_rate
+        FROM vw_health_analysis
+        WHERE district_id IS NOT NULL
+          AND nfhs4_value IS NOT NULL
+        GROUP BY district_id
+        HAVING indicators_measured >= {MIN_DISTRICT_INDICATORS}
+        ORDER BY decline_rate DESC, state_name, district_name
+        LIMIT {TOP_DISTRICTS}
+    """,
+    'categories': """
+        SELECT
+            category,
+            COUNT(DISTINCT indicator) as num_indicators,
+            COUNT(*) as total_measurements,
+            ROUND(AVG(nfhs5_value), 2) as avg_value,
+            COUNT(CASE WHEN trend = 'Improved' THEN 1 END) as improved_count,
+            COUNT(CASE WHEN trend = 'Declined' THEN 1 END) as declined_count
+        FROM vw_health_analysis
+        WHERE category IS NOT NULL
+          AND nfhs4_value IS NOT NULL
+        GROUP BY category
+        ORDER BY num_indicators DESC, category
+    """,
+    'improved': """
+        SELECT COUNT(*) as count
+        FROM vw_health_analysis
+        WHERE trend = 'Improved' AND nfhs4_value IS NOT NULL
+    """,
+    'declined': """
+        SELECT COUNT(*) as count
+        FROM vw_health_analysis
+        WHERE trend = 'Declined' AND nfhs4_value IS NOT NULL
+    """,
+}
+
+SUMMARY_QUERIES = {
+    'states': f"""
+        SELECT
+            s.state_name,
+            s.region,
+            SUM(a.compared) as total_indicators,
+            SUM(a.improved) as improved_count,
+            SUM(a.declined) as declined_count,
+            ROUND(100.0 * SUM(a.improved) / SUM(a.compared), 1) as improvement_rate
+        FROM agg_state_indicator a
+        LEFT JOIN dim_states s ON s.state_id = a.state_id
+        GROUP BY a.state_id
+        HAVING SUM(a.compared) > 0
+        ORDER BY improvement_rate DESC, s.state_name
+        LIMIT {TOP_STATES}
+    """,
+    'indicators': f"""
+        SELECT
+            i.indicator_name as indicator,
+            i.category,
+            COUNT(DISTINCT a.state_id) as states_covered,
+            ROUND(SUM(a.nfhs5_sum) / SUM(a.nfhs5_count), 2) as avg_nfhs5,
+            ROUND(SUM(a.nfhs4_sum) / SUM(a.nfhs4_count), 2) as avg_nfhs4,
+            ROUND(SUM(a.change_sum) / SUM(a.compared), 2) as avg_change
+        FROM agg_state_indicator a
+        JOIN dim_indicators i ON i.indicator_id = a.indicator_id
+        WHERE a.indicator_id IN ({{key_indicator_ids}})
+        GROUP BY a.indicator_id
+        ORDER BY avg_change DESC, indicator
+    """,
+    'regions': """
+        SELECT
+            region,
+            num_states,
+            data_points as total_data_points,
+            ROUND(pct_improved, 1) as pct_improved,
+            ROUND(avg_nfhs5, 2) as avg_current_value
+        FROM agg_region
+        ORDER BY pct_improved DESC, region
+    """,
+    'best_districts': f"""
+        SELECT
+            s.state_name,
+            d.district_name,
+            a.measured as indicators_measured,
+            a.improved as improved_indicators,
+            ROUND(100.0 * a.improved / a.measured, 1) as improvement_rate
+        FROM agg_district a
+        JOIN dim_districts d ON d.district_id = a.district_id
+        LEFT JOIN dim_states s ON s.state_id = a.state_id
+        WHERE a.measured >= {MIN_DISTRICT_INDICATORS}
+        ORDER BY improvement_rate DESC, s.state_name, d.district_name
+        LIMIT {TOP_DISTRICTS}
+    """,
+    'worst_districts': f"""
+        SELECT
+            s.state_name,
+            d.district_name,
+            a.measured as indicators_measured,
+            a.declined as declined_indicators,
+            ROUND(100.0 * a.declined / a.measured, 1) as decline_rate
+        FROM agg_district a
+        JOIN dim_districts d ON d.district_id = a.district_id
+        LEFT JOIN dim_states s ON s.state_id = a.state_id
+        WHERE a.measured >= {MIN_DISTRICT_INDICATORS}
+        ORDER BY decline_rate DESC, s.state_name, d.district_name
+        LIMIT {TOP_DISTRICTS}
+    """,
+    'categories': """
+        SELECT
+            category,
+            num_indicators,
+            measurements as total_measurements,
+            ROUND(avg_nfhs5, 2) as avg_value,
+            improved as improved_count,
+            declined as declined_count
+        FROM agg_category
+        ORDER BY num_indicators DESC, category
+    """,
+    'totals': """
+        SELECT SUM(improved) as improved, SUM(declined) as declined
+        FROM agg_state_indicator
+    """,
+}
+
+# The reads of the grouped method, aggregated in SQL to the
+# coarsest grain each section needs, so pandas only sees a few thousand rows.
+# State, indicator, region, category and national sections roll up from
+# additive measures per (state, indicator); districts need their own grain.
+# NOT INDEXED: no index covers every measure, and a plain table scan is
+# ~40% faster than walking idx_fact_indicator with a row lookup per entry.
+# The district rollup is covered by idx_fact_district.
+GROUPED_QUERIES = {
+    'state_indicator': f"""
+        SELECT
+            state_id,
+            indicator_id,{MEASURES_SQL}
+        FROM fact_health_metrics NOT INDEXED
+        GROUP BY state_id, indicator_id
+    """,
+    'district': DISTRICT_SELECT + " GROUP BY district_id",
+}
+
+
+def sql_round(values, digits):
+    """Round half away from zero like SQLite's ROUND (numpy rounds half to even)"""
+    scale = 10 ** digits
+    return np.sign(values) * np.floor(np.abs(values) * scale + 0.5) / scale
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator with NULL (NaN) where the denominator is 0"""
+    return numerator / denominator.where(denominator != 0)
+
+
+def _reader(conn, cache):
+    """read_sql(sql) function: through the cache if there is one"""
+    if cache is not None:
+        return cache.read_sql
+    return lambda sql, params=None: pd.read_sql(sql, conn, params=params)
+
+
+def _read_all(conn, queries, cache=None, pool=None):
+    """{name: DataFrame} for independent queries: concurrently on the pool's
+    connections if there is one, else one after another on conn"""
+    if pool is not None:
+        return pool.run(queries, cache=cache)[0]
+    read_sql = _reader(conn, cache)
+    return {name: read_sql(sql) for name, sql in queries.items()}
+
+
+def key_indicator_ids(conn):
+    """Ids of the indicators shown in the national overview"""
+    return search_indicators(conn, KEY_INDICATOR_TERMS, column='indicator_name')
+
+
+def _section_queries(conn, queries):
+    """Section queries with the key indicator ids filled in"""
+    queries = dict(queries)
+    queries['indicators'] = queries['indicators'].format(
+        key_indicator_ids=id_list_sql(key_indicator_ids(conn)))
+    return queries
+
+
+def _totals(improved, declined):
+    return {'improved': int(improved or 0), 'declined': int(declined or 0)}
+
+
+def views_report(conn, cache=None, pool=None):
+    """The original report: one query per section against vw_health_analysis"""
+    results = _read_all(conn, _section_queries(conn, VIEW_QUERIES), cache, pool)
+    report = {name: results[name] for name in SECTIONS[:-1]}
+    report['totals'] = _totals(results['improved']['count'][0],
+                               results['declined']['count'][0])
+    return report
+
+
+def summary_report(conn, cache=None, pool=None):
+    """One small query per section against the agg_* summary tables"""
+    results = _read_all(conn, _section_queries(conn, SUMMARY_QUERIES), cache, pool)
+    report = {name: results[name] for name in SECTIONS[:-1]}
+    totals = results['totals']
+    report['totals'] = _totals(totals['improved'][0], totals['declined'][0])
+    return report
+
+
+def grouped_report(conn, cache=None, pool=None):
+    """Group the fact table once per grain and derive every section from the results"""
+    results = _read_all(conn, {
+        **GROUPED_QUERIES,
+        'states': "SELECT state_id, state_name, region FROM dim_states",
+        'districts': "SELECT district_id, district_name FROM dim_districts",
+        'indicators': "SELECT indicator_id, indicator_name as indicator, category "
+                      "FROM dim_indicators",
+    }, cache, pool)
+    states, districts, indicators = results['states'], results['districts'], results['indicators']
+    partials = (results['state_indicator']
+                .merge(states, on='state_id', how='left')
+                .merge(indicators, on='indicator_id', how='left'))
+    report = {}
+
+    # States ranked by share of compared indicators that improved
+    by_state = partials.groupby('state_id', dropna=False).agg(
+        state_name=('state_name', 'first'), region=('region', 'first'),
+        total_indicators=('compared', 'sum'), improved_count=('improved', 'sum'),
+        declined_count=('declined', 'sum'))
+    by_state = by_state[by_state['total_indicators'] > 0]
+    by_state['improvement_rate'] = sql_round(
+        100.0 * by_state['improved_count'] / by_state['total_indicators'], 1)
+    report['states'] = (by_state
+                        .sort_values(['improvement_rate', 'state_name'], ascending=[False, True])
+                        .head(TOP_STATES).reset_index(drop=True))
+
+    # Key indicators, national averages
+    key = partials[partials['indicator_id'].isin(key_indicator_ids(conn))]
+    by_indicator = key.groupby('indicator_id').agg(
+        indicator=('indicator', 'first'), category=('category', 'first'),
+        states_covered=('state_id', 'nunique'),
+        nfhs5_sum=('nfhs5_sum', 'sum'), nfhs5_count=('nfhs5_count', 'sum'),
+        nfhs4_sum=('nfhs4_sum', 'sum'), nfhs4_count=('nfhs4_count', 'sum'),
+        change_sum=('change_sum', 'sum'), compared=('compared', 'sum'))
+    report['indicators'] = pd.DataFrame({
+        'indicator': by_indicator['indicator'],
+        'category': by_indicator['category'],
+        'states_covered': by_indicator['states_covered'],
+        'avg_nfhs5': sql_round(_ratio(by_indicator['nfhs5_sum'], by_indicator['nfhs5_count']), 2),
+        'avg_nfhs4': sql_round(_ratio(by_indicator['nfhs4_sum'], by_indicator['nfhs4_count']), 2),
+        'avg_change': sql_round(_ratio(by_indicator['change_sum'], by_indicator['compared']), 2),
+    }).sort_values(['avg_change', 'indicator'], ascending=[False, True]).reset_index(drop=True)
+
+    # Regions: rows with an NFHS-5 value
+    with_region = partials[partials['region'].notna()]
+    by_region = with_region.groupby('region').agg(
+        total_data_points=('nfhs5_count', 'sum'), improved=('improved', 'sum'),
+        nfhs5_sum=('nfhs5_sum', 'sum'))
+    by_region['num_states'] = (with_region[with_region['nfhs5_count'] > 0]
+                               .groupby('region')['state_id'].nunique())
+    by_region = by_region[by_region['total_data_points'] > 0]
+    report['regions'] = pd.DataFrame({
+        'region': by_region.index,
+        'num_states': by_region['num_states'].fillna(0).astype(int).values,
+        'total_data_points': by_region['total_data_points'].values,
+        'pct_improved': sql_round(
+            100.0 * by_region['improved'] / by_region['total_data_points'], 1).values,
+        'avg_current_value': sql_round(
+            by_region['nfhs5_sum'] / by_region['total_data_points'], 2).values,
+    }).sort_values(['pct_improved', 'region'], ascending=[False, True]).reset_index(drop=True)
+
+    # Districts with enough measured indicators, best and worst
+    by_district = results['district']
+    by_district = (by_district[by_district['measured'] >= MIN_DISTRICT_INDICATORS]
+                   .merge(states[['state_id', 'state_name']], on='state_id', how='left')
+                   .merge(districts, on='district_id', how='inner'))
+    for name, count, rate in [('best_districts', 'improved', 'improvement_rate'),
+                              ('worst_districts', 'declined', 'decline_rate')]:
+        section = pd.DataFrame({
+            'state_name': by_district['state_name'],
+            'district_name': by_district['district_name'],
+            'indicators_measured': by_district['measured'],
+            f"{count}_indicators": by_district[count],
+            rate: sql_round(100.0 * by_district[count] / by_district['measured'], 1),
+        })
+        report[name] = (section
+                        .sort_values([rate, 'state_name', 'district_name'],
+                                     ascending=[False, True, True])
+                        .head(TOP_DISTRICTS).reset_index(drop=True))
+
+    # Categories: rows with an NFHS-4 value
+    with_category = partials[partials['category'].notna()]
+    by_category = with_category.groupby('category').agg(
+        total_measurements=('nfhs4_count', 'sum'), compared=('compared', 'sum'),
+        compared_nfhs5_sum=('compared_nfhs5_sum', 'sum'),
+        improved_count=('improved', 'sum'), declined_count=('declined', 'sum'))
+    by_category['num_indicators'] = (with_category[with_category['nfhs4_count'] > 0]
+                                     .groupby('category')['indicator'].nunique())
+    by_category = by_category[by_category['total_measurements'] > 0]
+    report['categories'] = pd.DataFrame({
+        'category': by_category.index,
+        'num_indicators': by_category['num_indicators'].fillna(0).astype(int).values,
+        'total_measurements': by_category['total_measurements'].values,
+        'avg_value': sql_round(
+            _ratio(by_category['compared_nfhs5_sum'], by_category['compared']), 2).values,
+        'improved_count': by_category['improved_count'].values,
+        'declined_count': by_category['declined_count'].values,
+    }).sort_values(['num_indicators', 'category'], ascending=[False, True]).reset_index(drop=True)
+
+    report['totals'] = _totals(partials['improved'].sum(), partials['declined'].sum())
+    return report
+
+
+REPORT_BUILDERS = {
+    'views': views_report,
+    'summary': summary_report,
+    'grouped': grouped_report,
+}
+
+
+def default_method(conn):
+    """Summary tables when the loader has built them, otherwise grouped reads"""
+    return 'summary' if aggregates_available(conn) else 'grouped'
+
+
+def build_report(conn, method=None, cache=None, pool=None):
+    """Every report section as {section: DataFrame, 'totals': {...}}"""
+    return REPORT_BUILDERS[method or default_method(conn)](conn, cache, pool)
+
+
+def reports_match(report, other, tolerance=0.1):
+    """True if two reports hold the same rows; rounded rates and averages may
+    differ in their last digit because floats are summed in a different order"""
+    if report['totals'] != other['totals']:
+        return False
+    for name in SECTIONS[:-1]:
+        left, right = report[name], other[name]
+        if list(left.columns) != list(right.columns) or len(left) != len(right):
+            return False
+        for column in left.columns:
+            a, b = left[column], right[column]
+            if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+                a, b = a.astype(float).to_numpy(), b.astype(float).to_numpy()
+                if not np.allclose(a, b, rtol=0, atol=tolerance, equal_nan=True):
+                    return False
+            elif not a.fillna('').astype(str).equals(b.fillna('').astype(str)):
+                return False
+    return True
+
+
+def compare_methods(conn, repeat=3, methods=None, pool=None):
+    """Time each method (best of `repeat` runs) and check its result against the first.
+
+    With a pool, each method runs its queries concurrently on it.
+    Returns a DataFrame with one row per method.
+    """
+    methods = methods or [m for m in METHODS if m != 'summary' or aggregates_available(conn)]
+    rows = []
+    reference = None
+    for method in methods:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            report = build_report(conn, method, pool=pool)
+            best = min(best, time.perf_counter() - start)
+        if reference is None:
+            reference = report
+        rows.append({'method': method, 'best_ms': best * 1000,
+                     'matches': reports_match(reference, report)})
+
+    timings = pd.DataFrame(rows)
+    timings['speedup'] = timings['best_ms'].iloc[0] / timings['best_ms']
+    return timings
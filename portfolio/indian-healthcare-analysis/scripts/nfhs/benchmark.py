@@ -0,0 +1,242 @@
+"""
+Load and query benchmark
+Author: RK
+Description: Times the star schema loader stage by stage, and the
+             first_analysis.py report methods, on synthetic data sets
+             (synthetic.py). Results are appended to a JSON history and
+             compared with the previous run of the same configuration, so
+             regressions stand out.
+
+Each scale gets its own project tree under data/processed/benchmark/. The
+loader runs in a child process (`python -m nfhs load --full`) pointed at
+that tree with NFHS_PROJECT_DIR, so its wall time and peak memory belong
+to the load alone. Only the data moves: the load still reads this
+project's docs/data_dictionary.md, so trend directions are classified as
+in a real load.
+
+Run it through the CLI: python -m nfhs bench --help
+"""
+
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .analysis import compare_methods
+from .config import PROCESSED_DIR, PROJECT_DIR
+from .synthetic import generate
+
+BENCH_DIR = PROCESSED_DIR / 'benchmark'
+HISTORY_PATH = BENCH_DIR / 'history.json'
+
+# A metric this much worse than the previous comparable run is flagged...
+REGRESSION_THRESHOLD = 0.10
+# ...unless it moved by less than this, which is timer noise
+NOISE_S = 0.05
+NOISE_MS = 5.0
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def prepare_data(scale, seed, regenerate=False):
+    """Project tree with a synthetic data set; reused while scale and seed match"""
+    project_dir = BENCH_DIR / f"scale_{scale:g}"
+    marker = project_dir / 'dataset.json'
+    wanted = {'scale': scale, 'seed': seed}
+    if not regenerate and marker.exists():
+        dataset = json.loads(marker.read_text(encoding='utf-8'))
+        if {key: dataset.get(key) for key in wanted} == wanted:
+            return project_dir, dataset['rows']
+
+    files, rows = generate(project_dir, scale, seed)
+    marker.write_text(json.dumps({**wanted, 'files': files, 'rows': rows}), encoding='utf-8')
+    return project_dir, rows
+
+
+def loader_options(args):
+    """The `nfhs load` flags a run was made with"""
+    return {'workers': args.workers, 'bulk': args.bulk,
+            'chunksize': args.chunksize, 'parquet': not args.no_parquet,
+            'validate': not args.no_validate}
+
+
+def run_loader(project_dir, options):
+    """Full load of project_dir in a child process; returns its stats"""
+    stats_path = project_dir / 'load_stats.json'
+    command = [sys.executable, '-m', 'nfhs', 'load', '--full',
+               '--workers', str(options['workers']), '--stats-json', str(stats_path)]
+    if options['bulk']:
+        command.append('--bulk')
+    if options['chunksize']:
+        command += ['--chunksize', str(options['chunksize'])]
+    if not options['parquet']:
+        command.append('--no-parquet')
+    if not options.get('validate', True):
+        command.append('--no-validate')
+
+    env = dict(os.environ, NFHS_PROJECT_DIR=str(project_dir),
+               PYTHONPATH=os.pathsep.join(filter(None, [str(SCRIPTS_DIR),
+                                                        os.environ.get('PYTHONPATH')])))
+    log_path = project_dir / 'load.log'
+    start = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        result = subprocess.run(command, env=env, stdout=log, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"loader exited with {result.returncode}, see {log_path}")
+
+    stats = json.loads(stats_path.read_text(encoding='utf-8'))
+    stats['wall_s'] = wall
+    return stats
+
+
+def time_queries(db_path, repeat):
+    """Best time per first_analysis.py method in ms, and whether they agree"""
+    conn = sqlite3.connect(db_path)
+    try:
+        timings = compare_methods(conn, repeat=repeat)
+    finally:
+        conn.close()
+    return ({row.method: round(row.best_ms, 2) for row in timings.itertuples(index=False)},
+            bool(timings['matches'].all()))
+
+
+def git_commit():
+    """Short hash of the checked out commit, if this is a git work tree"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmark(scale, args):
+    """Generate (or reuse) one data set, load it and time the queries"""
+    project_dir, rows = prepare_data(scale, args.seed, args.regenerate)
+    options = loader_options(args)
+    load = run_loader(project_dir, options)
+    queries, agree = time_queries(project_dir / 'data' / 'database' / 'healthcare_india.db',
+                                  args.repeat)
+
+    stages = load['stages']
+    ingest = stages.get("Load India.csv", 0) + stages.get("Load state files", 0)
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'machine': f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        'scale': scale,
+        'seed': args.seed,
+        'options': options,
+        'rows': rows,
+        'load': {
+            'wall_s': round(load['wall_s'], 3),
+            'rows_loaded': load['rows_loaded'],
+            'rows_per_s': round(load['rows_loaded'] / load['wall_s']),
+            'ingest_rows_per_s': round(load['rows_loaded'] / ingest) if ingest else None,
+            'peak_rss_mb': load['peak_rss_mb'],
+            'peak_worker_rss_mb': load['peak_worker_rss_mb'],
+            'validation_s': (load.get('validation') or {}).get('seconds'),
+            'quarantined': (load.get('validation') or {}).get('quarantined'),
+            'stages_s': {step: round(seconds, 3) for step, seconds in stages.items()},
+        },
+        'queries_ms': queries,
+        'queries_agree': agree,
+    }
+
+
+def load_history(path):
+    """Every recorded run, oldest first"""
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def save_history(path, history):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix('.tmp')
+    partial.write_text(json.dumps(history, indent=2), encoding='utf-8')
+    os.replace(partial, path)
+
+
+def previous_run(history, entry):
+    """Latest earlier run with the same scale, seed and loader options"""
+    for old in reversed(history):
+        if all(old.get(key) == entry[key] for key in ('scale', 'seed', 'options')):
+            return old
+    return None
+
+
+def compared_metrics(entry):
+    """(label, value, True if higher is better, noise floor) for every tracked metric"""
+    load = entry['load']
+    metrics = [("Load wall time (s)", load['wall_s'], False, NOISE_S),
+               ("Load throughput (rows/s)", load['rows_per_s'], True, 0),
+               ("Peak memory (MB)", load['peak_rss_mb'], False, 0),
+               ("Validation (s)", load.get('validation_s'), False, NOISE_S)]
+    metrics += [(f"Stage: {step} (s)", seconds, False, NOISE_S)
+                for step, seconds in load['stages_s'].items()]
+    metrics += [(f"Query: {method} (ms)", ms, False, NOISE_MS)
+                for method, ms in entry['queries_ms'].items()]
+    return metrics
+
+
+def print_result(entry, previous):
+    """Print one run next to the previous comparable one; returns the regressions"""
+    print(f"\n📊 Scale {entry['scale']:g}: {entry['rows']:,} rows"
+          + (f" (vs {previous['timestamp']}, commit {previous.get('commit') or '?'})"
+             if previous else " (first run with these options)"))
+    old_metrics = {metric[0]: metric[1] for metric in compared_metrics(previous)} if previous else {}
+    regressions = []
+    for label, value, higher_is_better, noise in compared_metrics(entry):
+        if value is None:
+            continue
+        line = f"  • {label:<36} {value:>14,.2f}"
+        old = old_metrics.get(label)
+        if old:
+            change = (value - old) / old
+            worse = -change if higher_is_better else change
+            flagged = worse > REGRESSION_THRESHOLD and abs(value - old) >= noise
+            line += f"   {change:+7.1%}" + ("  ⚠️ regression" if flagged else "")
+            if flagged:
+                regressions.append(label)
+        print(line)
+    if not entry['queries_agree']:
+        print("  ✗ Report methods returned different results")
+    return regressions
+
+
+def main(args):
+    """Run the benchmark for parsed `nfhs bench` arguments; returns an exit code"""
+    print("=" * 70)
+    print("INDIAN HEALTHCARE ANALYSIS - LOAD & QUERY BENCHMARK")
+    print("=" * 70)
+
+    history_path = Path(args.history) if args.history else HISTORY_PATH
+    history = load_history(history_path)
+    regressions = []
+
+    for scale in args.scale or [1.0]:
+        print(f"\n⏳ Scale {scale:g}: generating data and loading it...")
+        try:
+            entry = run_benchmark(scale, args)
+        except RuntimeError as e:
+            print(f"✗ {e}")
+            return 1
+        regressions += print_result(entry, previous_run(history, entry))
+        history.append(entry)
+        save_history(history_path, history)
+
+    print(f"\n✓ History: {history_path} ({len(history)} runs)")
+    if regressions:
+        print(f"⚠️ {len(regressions)} metrics regressed by more than "
+              f"{REGRESSION_THRESHOLD:.0%}")
+        return 2
+    return 0
@@ -0,0 +1,135 @@
+"""
+Command line entry point for the NFHS loaders
+Author: RK
+
+Usage (from scripts/, or with scripts/ on PYTHONPATH):
+    python -m nfhs load               # star schema, incremental (03_final_loader.py)
+    python -m nfhs load --full --bulk
+    python -m nfhs load --full --metrics load.jsonl --profile "state files"
+    python -m nfhs raw                # raw india_data/states_data tables (02_load_data_custom.py)
+    python -m nfhs seed               # sql/schema.sql dimensions (01_load_data.py)
+    python -m nfhs report             # CSV/JSON report packs from sql/report_specs.json
+    python -m nfhs search anaemic     # indicators matching free-text terms
+    python -m nfhs generate --scale 10 --out /tmp/nfhs10   # synthetic NFHS-5 files
+    python -m nfhs bench --scale 1 --scale 10              # time loads and queries
+
+Only argparse is imported up front; a command imports its module (and
+pandas) when it runs, so --help and argument errors return immediately.
+"""
+
+import argparse
+import importlib
+
+COMMANDS = {
+    'load': 'nfhs.loader',
+    'raw': 'nfhs.raw',
+    'seed': 'nfhs.seed',
+    'report': 'nfhs.reports',
+    'search': 'nfhs.indicator_search',
+    'generate': 'nfhs.synthetic',
+    'bench': 'nfhs.benchmark',
+}
+
+
+def build_parser():
+    """Argument parser with one sub-command per loader"""
+    parser = argparse.ArgumentParser(prog='nfhs', description="Load NFHS-5 CSV files into SQLite and report on them")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('load', help="load the star schema (dimensions + fact table)")
+    load.add_argument('--workers', type=int, default=1,
+                      help="processes used to parse state files "
+                           "(1 = serial, 0 = one per CPU core)")
+    load.add_argument('--bulk', action='store_true',
+                      help="load all rows in one transaction with executemany "
+                           "and synchronous=OFF")
+    load.add_argument('--full', action='store_true',
+                      help="delete the database and reload every file")
+    load.add_argument('--no-parquet', action='store_true',
+                      help="don't update the Parquet cache in data/processed")
+    load.add_argument('--no-validate', action='store_true',
+                      help="skip the data-quality checks (nothing is quarantined)")
+    load.add_argument('--chunksize', type=int, default=None, metavar='ROWS',
+                      help="stream each CSV in chunks of this many rows; peak "
+                           "memory follows the chunk size, not the file size "
+                           "(--bulk adds its 256 MB SQLite page cache on top)")
+    load.add_argument('--stats-json', default=None, metavar='FILE',
+                      help="also write the stage timings, rows loaded and peak memory to FILE")
+    load.add_argument('--metrics', default=None, metavar='FILE',
+                      help="write per-stage and per-file metrics (wall/CPU time, rows, "
+                           "bytes, pages, peak memory) to FILE as JSON lines")
+    load.add_argument('--profile', default=None, metavar='STAGE',
+                      help="profile the first stage whose name contains STAGE, "
+                           "e.g. 'state files' or 'summary'")
+    load.add_argument('--profiler', choices=['cprofile', 'tracemalloc'], default='cprofile',
+                      help="what --profile records: call times or memory allocations")
+
+    raw = commands.add_parser('raw', help="copy the CSV files as-is into raw tables")
+    raw.add_argument('--sample', type=int, default=5, metavar='FILES',
+                     help="number of state files copied into states_data")
+
+    commands.add_parser('seed', help="create sql/schema.sql and fill its state/district dimensions")
+
+    report = commands.add_parser('report', help="write national, state and region report packs")
+    report.add_argument('--db', default=None,
+                        help="SQLite database (default: data/database/healthcare_india.db)")
+    report.add_argument('--specs', default=None, metavar='FILE',
+                        help="report spec file (default: sql/report_specs.json)")
+    report.add_argument('--out', default=None, metavar='DIR',
+                        help="output folder (default: data/processed/reports)")
+    report.add_argument('--report', action='append', metavar='NAME',
+                        help="only run the reports with this name (repeatable)")
+    report.add_argument('--state', action='append', metavar='NAME',
+                        help="only write packs for this state and its region (repeatable)")
+    report.add_argument('--pack', action='append', choices=['national', 'state', 'region'],
+                        help="only write this kind of pack (repeatable)")
+    report.add_argument('--workers', type=int, default=4,
+                        help="threads writing the output files")
+
+    search = commands.add_parser('search', help="find indicators by name or category")
+    search.add_argument('terms', nargs='+', metavar='TERM',
+                        help="words matched as prefixes; an indicator matches any TERM")
+    search.add_argument('--db', default=None,
+                        help="SQLite database (default: data/database/healthcare_india.db)")
+    search.add_argument('--column', choices=['indicator_name', 'category'], default=None,
+                        help="only search this column")
+
+    generate = commands.add_parser('generate', help="write synthetic NFHS-5 CSV files")
+    generate.add_argument('--out', required=True, metavar='DIR',
+                          help="project folder; files go to DIR/data/raw/nfhs5")
+    generate.add_argument('--scale', type=float, default=1.0,
+                          help="size relative to NFHS-5 (1 = ~707 districts x 131 indicators)")
+    generate.add_argument('--seed', type=int, default=0,
+                          help="random seed; the same seed gives identical files")
+
+    bench = commands.add_parser('bench', help="time loader stages and report queries "
+                                              "on synthetic data")
+    bench.add_argument('--scale', type=float, action='append',
+                       help="data set size relative to NFHS-5 (repeatable, default 1)")
+    bench.add_argument('--seed', type=int, default=0, help="random seed of the data sets")
+    bench.add_argument('--repeat', type=int, default=3,
+                       help="runs per report method (best one counts)")
+    bench.add_argument('--workers', type=int, default=1, help="passed to `nfhs load`")
+    bench.add_argument('--bulk', action='store_true', help="passed to `nfhs load`")
+    bench.add_argument('--chunksize', type=int, default=None, metavar='ROWS',
+                       help="passed to `nfhs load`")
+    bench.add_argument('--no-parquet', action='store_true', help="passed to `nfhs load`")
+    bench.add_argument('--no-validate', action='store_true', help="passed to `nfhs load`")
+    bench.add_argument('--regenerate', action='store_true',
+                       help="write the data sets again even if they exist")
+    bench.add_argument('--history', default=None, metavar='FILE',
+                       help="JSON history (default: data/processed/benchmark/history.json)")
+    return parser
+
+
+def main(argv=None):
+    """Parse argv and run the chosen loader; returns an exit code"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'chunksize', None) is not None and args.chunksize < 1:
+        parser.error("--chunksize must be a positive number of rows")
+    if args.command == 'report' and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    module = importlib.import_module(COMMANDS[args.command])
+    return module.main(args) or 0
@@ -0,0 +1,22 @@
+"""
+Project paths shared by the NFHS loaders
+Author: RK
+"""
+
+import os
+from pathlib import Path
+
+# This project: the schema, data dictionary and report specs always come from here
+PROJECT_DIR = Path(__file__).resolve().parent.parent.parent
+
+# NFHS_PROJECT_DIR points the data/ paths at another tree, e.g. the
+# synthetic data sets written by `python -m nfhs generate`
+BASE_DIR = Path(os.environ.get('NFHS_PROJECT_DIR') or PROJECT_DIR)
+DATA_DIR = BASE_DIR / 'data'
+RAW_DATA_DIR = DATA_DIR / 'raw' / 'nfhs5'
+PROCESSED_DIR = DATA_DIR / 'processed'
+DATABASE_PATH = DATA_DIR / 'database' / 'healthcare_india.db'
+SQL_SCHEMA_PATH = PROJECT_DIR / 'sql' / 'schema.sql'
+DATA_DICTIONARY_PATH = PROJECT_DIR / 'docs' / 'data_dictionary.md'
+REPORT_SPECS_PATH = PROJECT_DIR / 'sql' / 'report_specs.json'
+REPORTS_DIR = PROCESSED_DIR / 'reports'
@@ -0,0 +1,122 @@
+"""
+Sampled CSV profiling
+Author: RK
+Description: Profiles an NFHS CSV without parsing all of it. The file is
+             memory-mapped. Only the header and a few evenly spaced byte
+             ranges are parsed, each cut to whole lines. Dtypes, null rates
+             and the row count are estimated from that sample. Duplicate
+             columns (e.g. 'District' and 'DISTRICT') come from the header,
+             so they are exact.
+
+Files that fit in the sample budget are parsed whole, so their profile
+is exact. profile_files() profiles many files at once on a thread pool.
+"""
+
+import csv
+import io
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Byte ranges sampled from each file, and the size of each range
+SAMPLE_BLOCKS = 8
+BLOCK_BYTES = 64 * 1024
+
+
+class CsvProfile:
+    """What profiling found out about one CSV file"""
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size           # bytes
+        self.columns = []          # header names, as written
+        self.duplicates = []       # groups of names equal up to case and spacing
+        self.rows = 0              # data rows; estimated unless self.exact
+        self.exact = True
+        self.sample = None         # DataFrame of the rows that were parsed
+        self.error = None
+
+    @property
+    def dtypes(self):
+        return self.sample.dtypes
+
+    @property
+    def null_rates(self):
+        """Share of empty values per column, in the sample"""
+        return self.sample.isna().mean()
+
+
+def duplicate_columns(columns):
+    """Groups of column names that only differ in case or spacing"""
+    groups = {}
+    for name in columns:
+        groups.setdefault(' '.join(name.split()).casefold(), []).append(name)
+    return [names for names in groups.values() if len(names) > 1]
+
+
+def _sample_ranges(mm, start, blocks, block_bytes):
+    """Whole lines from `blocks` evenly spaced ranges of mm[start:]; the first
+    range starts right after the header, so the sample begins with the head rows"""
+    size = len(mm)
+    step = (size - start) // blocks
+    ranges = []
+    for i in range(blocks):
+        offset = start + i * step
+        if i:
+            # Skip the partial line the offset landed in
+            offset = mm.find(b'\n', offset) + 1
+            if offset == 0:
+                break
+        end = min(offset + block_bytes, size)
+        if end < size:
+            end = mm.rfind(b'\n', offset, end) + 1
+            if end <= offset:
+                continue  # one line longer than the whole range
+        ranges.append(mm[offset:end])
+    return ranges
+
+
+def profile_csv(path, blocks=SAMPLE_BLOCKS, block_bytes=BLOCK_BYTES, full=False):
+    """Profile one CSV from a sample of its rows (all rows with full=True)"""
+    profile = CsvProfile(path, path.stat().st_size)
+    if profile.size == 0:
+        profile.error = "empty file"
+        return profile
+
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header_end = mm.find(b'\n') + 1 or len(mm)
+            header = mm[:header_end]
+            profile.columns = next(csv.reader([header.decode('utf-8-sig').strip('\r\n')]), [])
+
+            if full or len(mm) - header_end <= blocks * block_bytes:
+                body = [mm[header_end:]]
+            else:
+                body = _sample_ranges(mm, header_end, blocks, block_bytes)
+                profile.exact = False
+            sampled_bytes = sum(len(part) for part in body)
+
+            # Rows with the wrong number of fields (a range that began inside
+            # a quoted multi-line value) are skipped rather than misread
+            profile.sample = pd.read_csv(io.BytesIO(header + b''.join(body)),
+                                         encoding='utf-8', on_bad_lines='skip',
+                                         low_memory=False)
+    except (OSError, ValueError, UnicodeDecodeError, pd.errors.ParserError) as e:
+        profile.error = f"{type(e).__name__}: {e}"
+        return profile
+
+    profile.duplicates = duplicate_columns(profile.columns)
+    sampled_rows = len(profile.sample)
+    if profile.exact or not sampled_rows:
+        profile.rows = sampled_rows
+    else:
+        bytes_per_row = sampled_bytes / sampled_rows
+        profile.rows = int((profile.size - len(header)) / bytes_per_row)
+    return profile
+
+
+def profile_files(paths, workers=4, **options):
+    """Profile many CSV files in parallel; profiles come back in path order"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda path: profile_csv(path, **options), paths))
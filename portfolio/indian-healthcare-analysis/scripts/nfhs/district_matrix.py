@@ -0,0 +1,290 @@
+"""
+Wide district x indicator matrix
+Author: RK
+Description: The loader pivots the district rows of fact_health_metrics
+             once into dense float32 matrices, districts x indicators with
+             NaN where a district has no value, one .npy file per measure
+             (improvement is the direction-aware change, see trends.py).
+             index.json maps rows and columns back to the dimensions and
+             records the data version they were built from.
+
+DistrictMatrix opens a measure with np.load(mmap_mode='r'), so loading is
+zero-copy. Correlation, ranking and clustering then run as vectorised NumPy
+on the matrix, with no SQL and no pandas pivot per analysis.
+
+Usage:
+    from nfhs.district_matrix import DistrictMatrix
+
+    matrix = DistrictMatrix.load()                  # NFHS-5 values
+    corr = matrix.correlation()                     # indicator x indicator
+    ranks = matrix.rank('Institutional births (%)')
+    labels = matrix.cluster(k=6)
+"""
+
+import json
+import os
+import shutil
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .config import PROCESSED_DIR
+from .manifest import data_version
+
+MATRIX_DIR = PROCESSED_DIR / 'district_matrix'
+INDEX_FILE = 'index.json'
+
+MEASURES = ['nfhs5_value', 'nfhs4_value', 'change_value', 'improvement']
+
+# Correlations from fewer districts with both values are left as NaN
+MIN_PERIODS = 10
+
+MATRIX_QUERY = f'''
+    SELECT f.district_id, f.indicator_id, {', '.join(f'f.{m}' for m in MEASURES)}
+    FROM fact_health_metrics f
+    WHERE f.district_id IS NOT NULL AND f.indicator_id IS NOT NULL
+    ORDER BY f.metric_id
+'''
+
+DISTRICTS_QUERY = '''
+    SELECT d.district_id, s.state_name, d.district_name
+    FROM dim_districts d LEFT JOIN dim_states s ON s.state_id = d.state_id
+    ORDER BY s.state_name, d.district_name
+'''
+
+INDICATORS_QUERY = '''
+    SELECT indicator_id, indicator_name, category
+    FROM dim_indicators ORDER BY indicator_id
+'''
+
+
+def build_matrix(conn, matrix_dir=MATRIX_DIR):
+    """Pivot the district fact rows into one .npy file per measure.
+
+    The files are written to a temporary folder which then replaces
+    matrix_dir, so readers never see a half-written matrix. A district
+    with two rows for an indicator keeps the one loaded last. Returns the
+    matrix shape (districts, indicators).
+    """
+    districts = pd.read_sql(DISTRICTS_QUERY, conn)
+    indicators = pd.read_sql(INDICATORS_QUERY, conn)
+    facts = conn.execute(MATRIX_QUERY).fetchall()
+
+    # Column arrays straight from the tuples; None becomes NaN
+    columns = np.array(facts, dtype=np.float64).reshape(len(facts), 2 + len(MEASURES))
+    district_ids = districts['district_id'].to_numpy()
+    indicator_ids = indicators['indicator_id'].to_numpy()
+    # ids -> row/column positions; the id arrays are sorted for searchsorted
+    district_order = np.argsort(district_ids)
+    rows = district_order[np.searchsorted(district_ids, columns[:, 0], sorter=district_order)]
+    cols = np.searchsorted(indicator_ids, columns[:, 1])
+
+    shape = (len(districts), len(indicators))
+    partial = matrix_dir.with_name(matrix_dir.name + '.tmp')
+    if partial.exists():
+        shutil.rmtree(partial)
+    partial.mkdir(parents=True)
+
+    for position, measure in enumerate(MEASURES):
+        values = np.full(shape, np.nan, dtype=np.float32)
+        values[rows, cols] = columns[:, 2 + position]
+        np.save(partial / f"{measure}.npy", values)
+
+    index = {
+        'data_version': data_version(conn),
+        'shape': shape,
+        'measures': MEASURES,
+        'districts': districts.to_dict(orient='list'),
+        'indicators': indicators.to_dict(orient='list'),
+    }
+    (partial / INDEX_FILE).write_text(json.dumps(index), encoding='utf-8')
+
+    # Move the old matrix aside before swapping the new one in, so matrix_dir
+    # is only missing between two renames. Readers that already mapped the
+    # old files keep them: the files are unlinked, not truncated.
+    previous = matrix_dir.with_name(matrix_dir.name + '.old')
+    if previous.exists():
+        shutil.rmtree(previous)
+    if matrix_dir.exists():
+        os.replace(matrix_dir, previous)
+    os.replace(partial, matrix_dir)
+    if previous.exists():
+        shutil.rmtree(previous)
+    return shape
+
+
+def _zscores(values):
+    """Column z-scores in float64, NaN kept; constant columns become 0"""
+    values = np.asarray(values, dtype=np.float64)
+    with warnings.catch_warnings():
+        # Indicators no selected district has are all-NaN columns
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+    std[~(std > 0)] = 1.0
+    return (values - mean) / std
+
+
+class DistrictMatrix:
+    """One measure of the district x indicator matrix, memory-mapped"""
+
+    def __init__(self, values, districts, indicators, measure, version):
+        self.values = values            # (districts, indicators) float32, read-only mmap
+        self.districts = districts      # district_id, state_name, district_name per row
+        self.indicators = indicators    # indicator_id, indicator_name, category per column
+        self.measure = measure
+        self.data_version = version
+        self._columns_by_name = {name: i for i, name in enumerate(indicators['indicator_name'])}
+        self._columns_by_id = {int(i): pos for pos, i in enumerate(indicators['indicator_id'])}
+
+    @classmethod
+    def load(cls, measure='nfhs5_value', matrix_dir=MATRIX_DIR, conn=None):
+        """Open a measure's matrix without reading it into memory.
+
+        With conn, a matrix built from older data raises ValueError.
+        """
+        if measure not in MEASURES:
+            raise ValueError(f"measure must be one of {MEASURES}")
+        index_path = matrix_dir / INDEX_FILE
+        if not index_path.exists():
+            raise FileNotFoundError(
+                f"No district matrix at {matrix_dir} - run `python -m nfhs load` first"
+            )
+        index = json.loads(index_path.read_text(encoding='utf-8'))
+        if conn is not None and index['data_version'] != data_version(conn):
+            raise ValueError(
+                f"District matrix is from data version {index['data_version']}, the database "
+                f"is at {data_version(conn)} - run `python -m nfhs load` to rebuild it"
+            )
+        values = np.load(matrix_dir / f"{measure}.npy", mmap_mode='r')
+        return cls(values, pd.DataFrame(index['districts']), pd.DataFrame(index['indicators']),
+                   measure, index['data_version'])
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def columns(self, indicators=None):
+        """Column positions for indicator names or ids (all columns for None)"""
+        if indicators is None:
+            return np.arange(self.shape[1])
+        if isinstance(indicators, (str, int, np.integer)):
+            indicators = [indicators]
+        positions = []
+        for indicator in indicators:
+            lookup = self._columns_by_name if isinstance(indicator, str) else self._columns_by_id
+            if indicator not in lookup:
+                raise KeyError(f"Unknown indicator: {indicator!r}")
+            positions.append(lookup[indicator])
+        return np.array(positions, dtype=np.intp)
+
+    def rows(self, states=None):
+        """Row positions of the districts of the given states (all rows for None)"""
+        if states is None:
+            return np.arange(self.shape[0])
+        if isinstance(states, str):
+            states = [states]
+        return np.flatnonzero(self.districts['state_name'].isin(list(states)).to_numpy())
+
+    def _labelled(self, data, rows, cols):
+        """DataFrame of data indexed by (state, district), one column per indicator"""
+        labels = self.districts.iloc[rows]
+        return pd.DataFrame(
+            data,
+            index=pd.MultiIndex.from_frame(labels[['state_name', 'district_name']]),
+            columns=self.indicators['indicator_name'].to_numpy()[cols],
+        )
+
+    def _block(self, indicators=None, states=None):
+        """(values, row positions, column positions) of a selection; the whole
+        matrix is returned as the mmap itself, without a copy"""
+        rows, cols = self.rows(states), self.columns(indicators)
+        if indicators is None and states is None:
+            return self.values, rows, cols
+        return self.values[np.ix_(rows, cols)], rows, cols
+
+    def to_frame(self, indicators=None, states=None):
+        """Copy of (part of) the matrix as a DataFrame indexed by state and district"""
+        return self._labelled(*self._block(indicators, states))
+
+    def correlation(self, indicators=None, states=None, min_periods=MIN_PERIODS):
+        """Pearson correlation between indicators across districts.
+
+        Each pair uses the districts that have both values, like
+        DataFrame.corr(), but as a handful of matrix products.
+        """
+        x, _, cols = self._block(indicators, states)
+        x = np.asarray(x, dtype=np.float64)
+        present = ~np.isnan(x)
+        m = present.astype(np.float64)
+        x = np.where(present, x, 0.0)
+
+        # Pairwise counts, sums and sums of squares over the shared districts
+        n = m.T @ m
+        sum_x = x.T @ m                 # [i, j]: sum of column i where j is present
+        sum_xx = (x * x).T @ m
+        sum_xy = x.T @ x
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = n * sum_xy - sum_x * sum_x.T
+            var = (n * sum_xx - sum_x ** 2) * (n * sum_xx - sum_x ** 2).T
+            corr = cov / np.sqrt(var)
+        corr[n < min_periods] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+
+        names = self.indicators['indicator_name'].to_numpy()[cols]
+        return pd.DataFrame(corr, index=names, columns=names)
+
+    def rank(self, indicators=None, states=None, ascending=False):
+        """Rank districts per indicator: 1 = highest value (lowest with
+        ascending=True). Missing values get no rank; ties keep row order."""
+        x, rows, cols = self._block(indicators, states)
+        x = np.asarray(x, dtype=np.float64)
+        missing = np.isnan(x)
+        keys = x if ascending else -x
+        order = np.argsort(np.where(missing, np.inf, keys), axis=0, kind='stable')
+        ranks = np.empty_like(x)
+        np.put_along_axis(ranks, order, np.arange(1, len(rows) + 1, dtype=np.float64)[:, None],
+                          axis=0)
+        ranks[missing] = np.nan
+        return self._labelled(ranks, rows, cols)
+
+    def cluster(self, k, indicators=None, states=None, iterations=100, seed=0):
+        """k-means labels for the districts on z-scored indicators.
+
+        Missing values are set to the indicator mean (0 after scaling), so
+        they pull a district towards no cluster in particular. Starting
+        centres are chosen with k-means++ from the seed, so results repeat.
+        Returns an int array of cluster numbers, one per selected district.
+        """
+        x = _zscores(self._block(indicators, states)[0])
+        x = np.nan_to_num(x, nan=0.0)
+        if not 0 < k <= len(x):
+            raise ValueError(f"k must be between 1 and the number of districts ({len(x)})")
+
+        rng = np.random.default_rng(seed)
+        centres = [x[rng.integers(len(x))]]
+        # Squared distance of every district to its nearest centre so far
+        nearest = ((x - centres[0]) ** 2).sum(axis=1)
+        for _ in range(1, k):
+            total = nearest.sum()
+            pick = rng.choice(len(x), p=nearest / total) if total > 0 else rng.integers(len(x))
+            centres.append(x[pick])
+            nearest = np.minimum(nearest, ((x - x[pick]) ** 2).sum(axis=1))
+        centres = np.array(centres)
+
+        labels = np.full(len(x), -1)
+        for _ in range(iterations):
+            # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2; ||x||^2 doesn't change the argmin
+            distance = (centres ** 2).sum(axis=1) - 2 * x @ centres.T
+            new_labels = distance.argmin(axis=1)
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            counts = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centres)
+            np.add.at(sums, labels, x)
+            # An empty cluster keeps its old centre
+            filled = counts > 0
+            centres[filled] = sums[filled] / counts[filled, None]
+        return labels
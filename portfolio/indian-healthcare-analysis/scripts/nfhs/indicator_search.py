@@ -0,0 +1,133 @@
+"""
+Full-text search over the indicator dimension
+Author: RK
+Description: The loader builds an FTS5 index (fts_indicators) over the
+             indicator name and category of dim_indicators. search_indicators()
+             resolves free-text terms to indicator ids, so fact queries filter
+             on the indexed indicator_id instead of LIKE '%...%' patterns
+             that scan every fact row.
+
+Each term matches indicators containing all of its words, as prefixes
+('immuniz' finds 'immunized' and 'immunization'); several terms are OR-ed.
+Without FTS5 in the local SQLite build the same terms are matched with LIKE
+against dim_indicators, which is small.
+
+Usage:
+    from nfhs.indicator_search import search_indicators
+
+    ids = search_indicators(conn, ['fully immunized', 'anaemic'])
+
+or from the command line: python -m nfhs search "fully immunized" anaemic
+"""
+
+import re
+import sqlite3
+from pathlib import Path
+
+from .config import DATABASE_PATH
+
+INDEX_TABLE = 'fts_indicators'
+
+# Searchable columns of dim_indicators
+SEARCH_COLUMNS = ['indicator_name', 'category']
+
+# unicode61 token characters are letters and digits, so '_' separates words too
+_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+def fts5_available(conn):
+    """True if this SQLite build has the FTS5 extension"""
+    return bool(conn.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0])
+
+
+def index_available(conn):
+    """True if the database has the indicator search index"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (INDEX_TABLE,)).fetchone() is not None
+
+
+def build_indicator_index(conn):
+    """(Re)build fts_indicators from dim_indicators; returns the number of
+    indicators indexed, or None when SQLite has no FTS5"""
+    if not fts5_available(conn):
+        return None
+    # External content table: the text stays in dim_indicators, the index
+    # only holds the tokens, keyed by indicator_id
+    conn.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} USING fts5(
+            {', '.join(SEARCH_COLUMNS)},
+            content='dim_indicators',
+            content_rowid='indicator_id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    conn.execute(f"INSERT INTO {INDEX_TABLE}({INDEX_TABLE}) VALUES ('rebuild')")
+    conn.commit()
+    return conn.execute("SELECT COUNT(*) FROM dim_indicators").fetchone()[0]
+
+
+def _term_words(terms):
+    """Words of each non-empty term: 'Fully immunized' -> ['Fully', 'immunized']"""
+    if isinstance(terms, str):
+        terms = [terms]
+    return [words for words in (_WORD_PATTERN.findall(term) for term in terms) if words]
+
+
+def match_expression(terms, column=None):
+    """FTS5 MATCH query for any of the terms, each a prefix match on all its words"""
+    clauses = [' '.join(f'"{word}"*' for word in words) for words in _term_words(terms)]
+    expression = ' OR '.join(f"({clause})" for clause in clauses)
+    if column is not None:
+        expression = f"{column} : ({expression})"
+    return expression
+
+
+def search_indicators(conn, terms, column=None):
+    """Sorted ids of the indicators matching any of the terms.
+
+    column limits the search to 'indicator_name' or 'category'.
+    """
+    if column is not None and column not in SEARCH_COLUMNS:
+        raise ValueError(f"column must be one of {SEARCH_COLUMNS}")
+    words = _term_words(terms)
+    if not words:
+        return []
+
+    if index_available(conn):
+        rows = conn.execute(
+            f"SELECT rowid FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH ? ORDER BY rowid",
+            (match_expression(terms, column),))
+    else:
+        text = column or "indicator_name || ' ' || IFNULL(category, '')"
+        clauses = [' AND '.join([f"{text} LIKE ?"] * len(term)) for term in words]
+        rows = conn.execute(
+            "SELECT indicator_id FROM dim_indicators WHERE "
+            + ' OR '.join(f"({clause})" for clause in clauses) + " ORDER BY indicator_id",
+            [f"%{word}%" for term in words for word in term])
+    return [row[0] for row in rows]
+
+
+def id_list_sql(ids):
+    """'1, 5, 9' for an IN (...) clause; 'NULL' (matches nothing) when empty"""
+    return ', '.join(str(int(indicator_id)) for indicator_id in ids) or 'NULL'
+
+
+def main(args):
+    """Print the indicators matching parsed `nfhs search` arguments; returns an exit code"""
+    db = Path(args.db or DATABASE_PATH)
+    if not db.exists():
+        print(f"✗ Database not found: {db}")
+        return 1
+
+    conn = sqlite3.connect(db)
+    ids = search_indicators(conn, args.terms, args.column)
+    rows = conn.execute(
+        f"SELECT indicator_id, indicator_name, category FROM dim_indicators "
+        f"WHERE indicator_id IN ({id_list_sql(ids)}) ORDER BY indicator_id").fetchall()
+    method = "FTS5 index" if index_available(conn) else "LIKE (no FTS5 index)"
+    conn.close()
+
+    print(f"🔍 {len(rows)} indicators match {' OR '.join(args.terms)} ({method})")
+    for indicator_id, name, category in rows:
+        print(f"  {indicator_id:>5}  {name}  [{category or '-'}]")
+    return 0 if rows else 1
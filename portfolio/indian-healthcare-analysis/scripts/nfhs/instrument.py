@@ -0,0 +1,268 @@
+"""
+Loader instrumentation
+Author: RK
+Description: Measures each loader stage and each source file load: wall
+             time, CPU time, rows, bytes read, SQLite pages written and peak
+             memory. Every finished measurement is written as one JSON line
+             (when a metrics file is given), and the loader ends with a
+             summary table of the stages and the slowest files.
+
+One stage can also be run under cProfile or tracemalloc to see where its
+time or memory goes.
+
+    cpu_s        CPU seconds of this process plus any worker processes that
+                 finished during the stage (workers are reaped by then)
+    bytes_read   size of the source files the stage read
+    pages        database pages written: growth of the main and temp
+                 databases (PRAGMA page_count), i.e. new pages, not rewrites
+    peak_rss_mb  the process's peak RSS when the stage ended; a stage that
+                 raised it shows a jump over the stage before
+
+Usage:
+    from nfhs.instrument import LoadMetrics
+
+    metrics = LoadMetrics(conn, jsonl_path='metrics.jsonl')
+    with metrics.stage("Load state files") as stage:
+        with metrics.file(path) as record:
+            record.rows = store(path)
+    metrics.print_summary()
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from .config import PROCESSED_DIR
+
+PROFILE_DIR = PROCESSED_DIR / 'profiles'
+PROFILERS = ['cprofile', 'tracemalloc']
+
+# Lines printed from a profile, and files listed in the summary
+PROFILE_LINES = 25
+SLOWEST_FILES = 5
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process and of finished worker
+    processes in MB, or (None, None) where the resource module is missing"""
+    if resource is None:
+        return None, None
+    # ru_maxrss is in KiB on Linux but in bytes on macOS
+    unit = 1024 * 1024 if os.uname().sysname == 'Darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit
+    return own, children
+
+
+def cpu_seconds():
+    """CPU time of this process and its reaped child processes"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def page_count(conn):
+    """Pages in the main and temp databases of conn (0 without a connection)"""
+    if conn is None:
+        return 0
+    return sum(conn.execute(f"PRAGMA {schema}.page_count").fetchone()[0]
+               for schema in ('main', 'temp'))
+
+
+class Measurement:
+    """One stage or file load; rows and bytes_read are filled in by the caller"""
+
+    def __init__(self, kind, name, stage=None):
+        self.kind = kind           # 'stage' or 'file'
+        self.name = name
+        self.stage = stage         # stage a file was loaded in
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.rows = 0
+        self.bytes_read = 0
+        self.pages = 0
+        self.peak_rss_mb = None
+        self.extra = {}            # e.g. parse time measured in a worker
+
+    def to_dict(self):
+        record = {
+            'event': self.kind,
+            'name': self.name,
+            'stage': self.stage,
+            'wall_s': round(self.wall_s, 4),
+            'cpu_s': round(self.cpu_s, 4),
+            'rows': self.rows,
+            'bytes_read': self.bytes_read,
+            'pages': self.pages,
+            'peak_rss_mb': None if self.peak_rss_mb is None else round(self.peak_rss_mb, 1),
+        }
+        record.update(self.extra)
+        if self.kind == 'stage':
+            del record['stage']
+        return record
+
+
+class LoadMetrics:
+    """Collects stage and file measurements for one loader run.
+
+    profile_stage names the stage to profile (matched case-insensitively
+    as a substring of the stage name) and profiler is 'cprofile' or
+    'tracemalloc'.
+    """
+
+    def __init__(self, conn=None, jsonl_path=None, profile_stage=None, profiler='cprofile'):
+        if profiler not in PROFILERS:
+            raise ValueError(f"profiler must be one of {PROFILERS}")
+        self.conn = conn
+        self.stages = []
+        self.files = []
+        self.profile_stage = profile_stage.casefold() if profile_stage else None
+        self.profiler = profiler
+        self.profiled = None       # name of the stage that was profiled
+        self._current = None
+        self._jsonl = open(jsonl_path, 'w', encoding='utf-8') if jsonl_path else None
+
+    @property
+    def timings(self):
+        """{stage: wall seconds}, in run order"""
+        return {stage.name: stage.wall_s for stage in self.stages}
+
+    def emit(self, measurement):
+        """Write one measurement as a JSON line"""
+        if self._jsonl is None:
+            return
+        record = {'time': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+                  **measurement.to_dict()}
+        self._jsonl.write(json.dumps(record) + '\n')
+        self._jsonl.flush()  # so a long load can be followed with tail -f
+
+    @contextmanager
+    def _measure(self, measurement):
+        """Fill in wall, CPU, pages and peak memory around the block"""
+        pages = page_count(self.conn)
+        cpu = cpu_seconds()
+        start = time.perf_counter()
+        try:
+            yield measurement
+        finally:
+            measurement.wall_s = time.perf_counter() - start
+            measurement.cpu_s = cpu_seconds() - cpu
+            measurement.pages = page_count(self.conn) - pages
+            measurement.peak_rss_mb = peak_memory_mb()[0]
+            self.emit(measurement)
+
+    @contextmanager
+    def stage(self, name):
+        """Measure a loader stage; file loads inside it add to its rows and bytes"""
+        stage = Measurement('stage', name)
+        self.stages.append(stage)
+        self._current = stage
+        profiling = (self.profile_stage is not None and self.profiled is None
+                     and self.profile_stage in name.casefold())
+        try:
+            with self._measure(stage):
+                if profiling:
+                    self.profiled = name
+                    with self._profile(name):
+                        yield stage
+                else:
+                    yield stage
+        finally:
+            self._current = None
+
+    @contextmanager
+    def file(self, path):
+        """Measure the load of one source file"""
+        stage = self._current
+        record = Measurement('file', path.name, stage.name if stage else None)
+        record.bytes_read = path.stat().st_size if path.exists() else 0
+        self.files.append(record)
+        with self._measure(record):
+            yield record
+        if stage is not None:
+            stage.rows += record.rows
+            stage.bytes_read += record.bytes_read
+
+    @contextmanager
+    def _profile(self, name):
+        """Run the block under the chosen profiler and print what it found"""
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        slug = '_'.join(name.lower().replace('.', ' ').split())
+        if self.profiler == 'cprofile':
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                path = PROFILE_DIR / f"{slug}.prof"
+                profile.dump_stats(path)
+                text = io.StringIO()
+                pstats.Stats(profile, stream=text).sort_stats('cumulative').print_stats(PROFILE_LINES)
+                print(f"\n🔬 cProfile of '{name}' (this process only; workers are not profiled)")
+                print(text.getvalue().rstrip())
+                print(f"📂 Full profile: {path} (open with python -m pstats or snakeviz)")
+        else:
+            tracemalloc.start()
+            before = tracemalloc.take_snapshot()
+            try:
+                yield
+            finally:
+                after = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                path = PROFILE_DIR / f"{slug}.tracemalloc"
+                after.dump(path)
+                print(f"\n🔬 tracemalloc of '{name}': peak traced memory {peak / 1024 / 1024:.2f} MB")
+                print(f"Largest allocation growth by line (top {PROFILE_LINES}):")
+                for stat in after.compare_to(before, 'lineno')[:PROFILE_LINES]:
+                    print(f"  {stat}")
+                print(f"📂 Snapshot: {path} (load with tracemalloc.Snapshot.load)")
+
+    def print_summary(self, rows_loaded=0, used_workers=False):
+        """Print the stage table, throughput, peak memory and the slowest files"""
+        print("\n⏱️ Stage metrics:")
+        print(f"  {'Stage':<22}{'Wall s':>9}{'CPU s':>9}{'Rows':>12}{'MB read':>9}"
+              f"{'Pages':>9}{'Peak MB':>9}")
+        for stage in self.stages:
+            peak = '' if stage.peak_rss_mb is None else f"{stage.peak_rss_mb:.0f}"
+            print(f"  {stage.name:<22}{stage.wall_s:>9.2f}{stage.cpu_s:>9.2f}"
+                  f"{stage.rows:>12,}{stage.bytes_read / 1024 / 1024:>9.1f}"
+                  f"{stage.pages:>9,}{peak:>9}")
+        total = sum(stage.wall_s for stage in self.stages)
+        print(f"  {'Total':<22}{total:>9.2f}{sum(s.cpu_s for s in self.stages):>9.2f}")
+
+        if rows_loaded and total > 0:
+            ingest = sum(stage.wall_s for stage in self.stages if stage.name.startswith("Load "))
+            if ingest > 0:
+                print(f"  • {'Ingest throughput':<24} {rows_loaded / ingest:10,.0f} rows/s")
+            print(f"  • {'Overall throughput':<24} {rows_loaded / total:10,.0f} rows/s")
+
+        own, children = peak_memory_mb()
+        if own is not None:
+            print(f"  • {'Peak memory (RSS)':<24} {own:8.1f} MB")
+            if used_workers and children:
+                print(f"  • {'Peak worker RSS':<24} {children:8.1f} MB")
+
+        if self.files:
+            slowest = sorted(self.files, key=lambda record: record.wall_s, reverse=True)
+            print(f"\n🐢 Slowest files (of {len(self.files)}):")
+            for record in slowest[:SLOWEST_FILES]:
+                parse = record.extra.get('parse_wall_s')
+                parsed = f", parsed in {parse:.2f} s" if parse is not None else ""
+                print(f"  • {record.name:<32} {record.wall_s:6.2f} s  {record.rows:>10,} rows{parsed}")
+
+    def close(self):
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
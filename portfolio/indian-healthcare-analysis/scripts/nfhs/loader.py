@@ -0,0 +1,946 @@
+"""
+NFHS-5 star schema loader - Handles all edge cases
+Loads India.csv + ALL state files
+Author: RK
+
+Only new or changed source files are re-ingested; see manifest.py.
+Rows failing the checks in validation.py are quarantined to etl_quarantine.
+Every stage and file load is measured by instrument.py (--metrics, --profile).
+Run it through the CLI: python -m nfhs load --help
+"""
+
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .aggregates import AGGREGATE_TABLES, ensure_aggregates, refresh_aggregates
+from .config import BASE_DIR, DATABASE_PATH, RAW_DATA_DIR
+from .district_matrix import MATRIX_DIR, build_matrix
+from .indicator_search import INDEX_TABLE, build_indicator_index
+from .instrument import LoadMetrics, peak_memory_mb
+from .lookups import STATE_CODES, STATE_REGIONS
+from .manifest import (bump_data_version, ensure_manifest, finish_sources, forget_sources,
+                       mark_pending, plan_reload, record_source, set_rows_loaded)
+from .normalise import FACT_COLUMNS, iter_csv_chunks, normalise_frame, read_csv
+from .parquet_cache import CACHE_DIR, pyarrow_available, write_cache
+from .trends import (INDICATOR_STATS_TABLE, TREND_COLUMNS, ensure_trend_stats,
+                     forget_trend_stats, refresh_directions, refresh_trend_stats,
+                     refresh_trends)
+from .validation import (QUARANTINE_TABLE, Validator, ensure_quarantine, forget_quarantined,
+                         write_quarantine)
+
+# Text rows are staged per load, then resolved to surrogate keys in one INSERT ... SELECT
+STAGING_TABLE = 'stg_health_metrics'
+STAGING_COLUMNS = FACT_COLUMNS + ['source_id']
+
+# district_code is "<state code>_<first 20 chars of the name>"
+DISTRICT_CODE_LENGTH = 20
+
+# Pragmas used while bulk loading; the previous values are restored afterwards.
+# The database itself is always in WAL mode (see open_database)
+BULK_PRAGMAS = {
+    'synchronous': 'OFF',
+    'cache_size': -262144,  # negative = KiB, i.e. 256 MB
+}
+
+# Built once all rows are in, so inserts don't pay for index maintenance.
+# Each one covers a GROUP BY in first_analysis.py (state, district, indicator)
+# so those aggregations never touch the table rows.
+FACT_INDEXES = {
+    'idx_fact_state': 'fact_health_metrics(state_id, trend, change_value, nfhs4_value, nfhs5_value)',
+    'idx_fact_district': 'fact_health_metrics(district_id, state_id, trend, nfhs4_value)',
+    'idx_fact_indicator': 'fact_health_metrics(indicator_id, state_id, nfhs5_value, nfhs4_value, change_value)',
+    'idx_fact_source': 'fact_health_metrics(source_id)',
+}
+
+FACT_TABLE = 'fact_health_metrics'
+
+
+def open_database(path):
+    """Connect to the database and switch it to WAL mode.
+
+    WAL is persistent, so read-only connections (read_pool.py) keep reading
+    the last committed data while a load writes, and never block it.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    return conn
+
+
+def set_pragmas(conn, pragmas):
+    """Apply pragmas and return their previous values"""
+    previous = {}
+    for name, value in pragmas.items():
+        previous[name] = conn.execute(f"PRAGMA {name}").fetchone()[0]
+        conn.execute(f"PRAGMA {name} = {value}")
+    return previous
+
+
+def create_tables(conn):
+    """Create the dimension and fact tables"""
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE dim_states (
+            state_id INTEGER PRIMARY KEY,
+            state_code TEXT NOT NULL,
+            state_name TEXT NOT NULL UNIQUE,
+            region TEXT,
+            census_code TEXT
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE dim_districts (
+            district_id INTEGER PRIMARY KEY,
+            district_code TEXT NOT NULL,
+            district_name TEXT NOT NULL,
+            state_id INTEGER NOT NULL,
+            census_code TEXT,
+            FOREIGN KEY (state_id) REFERENCES dim_states(state_id),
+            UNIQUE(state_id, district_name)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE dim_indicators (
+            indicator_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            indicator_name TEXT NOT NULL,
+            category TEXT
+        )
+    ''')
+
+    # Lets incremental reloads add indicators with INSERT OR IGNORE
+    cursor.execute('''
+        CREATE UNIQUE INDEX idx_indicators_name
+        ON dim_indicators(indicator_name, IFNULL(category, ''))
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE fact_health_metrics (
+            metric_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            state_id INTEGER REFERENCES dim_states(state_id),
+            district_id INTEGER REFERENCES dim_districts(district_id),
+            indicator_id INTEGER REFERENCES dim_indicators(indicator_id),
+            nfhs5_value REAL,
+            nfhs4_value REAL,
+            change_value REAL,
+            source_id INTEGER REFERENCES etl_manifest(source_id),
+            trend INTEGER,          -- direction-aware, see trends.py
+            improvement REAL,
+            pct_change REAL         -- change_z is computed in vw_health_analysis
+        )
+    ''')
+
+    conn.commit()
+    ensure_manifest(conn)
+    ensure_quarantine(conn)
+    ensure_trend_stats(conn)
+
+
+def supports_incremental(conn):
+    """True if the database was built by this loader with a source manifest
+    and the trend columns"""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    if 'etl_manifest' not in tables or FACT_TABLE not in tables:
+        return False
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({FACT_TABLE})")}
+    return {'source_id', 'state_id', *TREND_COLUMNS} <= columns
+
+
+def create_staging_table(conn):
+    """Create the per-load staging table for text rows (connection-local).
+
+    Staged rows are lost if the load dies before transfer_staged_facts;
+    their files' manifest rows are still pending then, so they are reloaded.
+    """
+    conn.execute(f"DROP TABLE IF EXISTS temp.{STAGING_TABLE}")
+    conn.execute(f'''
+        CREATE TEMP TABLE {STAGING_TABLE} (
+            state_name TEXT,
+            district_name TEXT,
+            indicator TEXT,
+            nfhs5_value REAL,
+            nfhs4_value REAL,
+            change_value REAL,
+            category TEXT,
+            source_id INTEGER
+        )
+    ''')
+
+
+def list_source_files():
+    """India.csv followed by the state files, in load order"""
+    files = []
+    india_csv = RAW_DATA_DIR / 'India.csv'
+    if india_csv.exists():
+        files.append(india_csv)
+    states_folder = RAW_DATA_DIR / '_states'
+    if states_folder.exists():
+        files.extend(sorted(states_folder.glob("*.csv")))
+    return files
+
+
+def remove_stale_sources(conn, plan):
+    """Delete fact rows of changed and removed files, and their quarantine and
+    trend statistics rows. Their manifest rows stay, marked pending, until
+    the load has finished (run_load).
+
+    Returns the number of rows deleted and the names of the states they belonged to.
+    """
+    stale = plan.stale_source_ids
+    if not stale:
+        return 0, []
+
+    stale_states = [row[0] for row in conn.execute(f'''
+        SELECT DISTINCT s.state_name
+        FROM {FACT_TABLE} f JOIN dim_states s ON s.state_id = f.state_id
+        WHERE f.source_id IN ({', '.join('?' * len(stale))})
+    ''', stale)]
+
+    deleted = conn.executemany(
+        f"DELETE FROM {FACT_TABLE} WHERE source_id = ?",
+        [(source_id,) for source_id in stale]
+    ).rowcount
+    forget_quarantined(conn, stale)
+    forget_trend_stats(conn, stale)
+    mark_pending(conn, stale)
+    conn.commit()
+    return deleted, stale_states
+
+
+def write_facts(conn, df):
+    """Append a normalised frame to the staging table with one executemany"""
+    df = df.reindex(columns=STAGING_COLUMNS)
+    placeholders = ', '.join('?' * len(STAGING_COLUMNS))
+    # SQLite stores NaN as NULL, so the tuples can be bound as they are
+    conn.executemany(
+        f"INSERT INTO {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) VALUES ({placeholders})",
+        df.itertuples(index=False, name=None)
+    )
+
+
+class DimensionKeys:
+    """Distinct state, district and indicator keys of the ingested frames,
+    collected before the rows are staged so dimensions never re-read SQLite"""
+
+    # Collapse the collected frames after this many, so streaming thousands
+    # of chunks keeps one deduplicated frame per dimension in memory
+    COMPACT_EVERY = 64
+
+    def __init__(self):
+        self.states = []
+        self.districts = []
+        self.indicators = []
+
+    def add(self, df):
+        df = df.reindex(columns=['state_name', 'district_name', 'indicator', 'category'])
+        self.states.append(df['state_name'].drop_duplicates())
+        self.districts.append(df[['state_name', 'district_name']].drop_duplicates())
+        self.indicators.append(df[['indicator', 'category']].drop_duplicates())
+
+        if len(self.states) >= self.COMPACT_EVERY:
+            for parts in (self.states, self.districts, self.indicators):
+                parts[:] = [pd.concat(parts, ignore_index=True).drop_duplicates()]
+
+    def unique_states(self):
+        if not self.states:
+            return pd.Series(dtype=object, name='state_name')
+        return pd.concat(self.states, ignore_index=True).dropna().drop_duplicates()
+
+    def unique_districts(self):
+        if not self.districts:
+            return pd.DataFrame(columns=['state_name', 'district_name'])
+        districts = pd.concat(self.districts, ignore_index=True).drop_duplicates()
+        return districts[districts['state_name'].notna()
+                         & districts['district_name'].notna()
+                         & (districts['district_name'] != '')]
+
+    def unique_indicators(self):
+        if not self.indicators:
+            return pd.DataFrame(columns=['indicator', 'category'])
+        indicators = pd.concat(self.indicators, ignore_index=True).drop_duplicates()
+        return indicators[indicators['indicator'].notna()]
+
+
+def store_source(conn, path, frames, plan, keys, validator, bulk=False):
+    """Stage one file's rows tagged with its manifest source_id.
+
+    frames is a normalised DataFrame or an iterable of normalised chunks.
+    Each one is validated first, and rows that fail go to the quarantine
+    table instead. Outside bulk mode every file is committed on its own; in
+    bulk mode the whole load shares a single transaction. The manifest row
+    is left pending until run_load has finished.
+    Returns (source_id, rows staged, rows quarantined).
+    """
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+
+    source_id = record_source(conn, path, RAW_DATA_DIR, FACT_TABLE, plan.stats.get(path),
+                              pending=True)
+    rows = quarantined = 0
+    try:
+        for df in frames:
+            df, failed = validator.split(df)
+            if len(failed):
+                write_quarantine(conn, failed, source_id)
+                quarantined += len(failed)
+            write_facts(conn, df.assign(source_id=source_id))
+            keys.add(df)
+            rows += len(df)
+    except Exception:
+        # Leave no staged rows or manifest entry, so the file is retried on the next run
+        conn.execute(f"DELETE FROM {STAGING_TABLE} WHERE source_id = ?", (source_id,))
+        forget_quarantined(conn, [source_id])
+        forget_sources(conn, [source_id])
+        raise
+    if not bulk:
+        conn.commit()
+    return source_id, rows, quarantined
+
+
+def read_state_file(csv_file):
+    """Parse and normalise one state CSV; also returns the parse's wall and CPU seconds.
+
+    Runs inside worker processes, so errors are returned instead of raised:
+    one bad file must not take down the rest of the pool.
+    """
+    start, cpu = time.perf_counter(), time.process_time()
+    try:
+        df = normalise_frame(read_csv(csv_file), csv_file.stem.upper())
+        error = None
+    except Exception as e:
+        df, error = None, f"{type(e).__name__}: {e}"
+    parse = {'parse_wall_s': round(time.perf_counter() - start, 4),
+             'parse_cpu_s': round(time.process_time() - cpu, 4)}
+    return csv_file.name, df, error, parse
+
+
+def iter_state_frames(state_files, workers):
+    """Yield (file name, frame, error, parse timings) per state file, in file order"""
+    if workers == 1:
+        yield from map(read_state_file, state_files)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers or None) as executor:
+        yield from executor.map(read_state_file, state_files)
+
+
+def load_india_csv(conn, plan, keys, metrics, validator, bulk=False, chunksize=None):
+    """Load India.csv into the fact table; returns its source_id"""
+    india_csv = RAW_DATA_DIR / 'India.csv'
+    if not india_csv.exists():
+        return None
+    if india_csv not in plan.to_load:
+        print("✓ India.csv unchanged - skipped")
+        return None
+
+    if chunksize:
+        try:
+            print(f"Streaming India.csv in chunks of {chunksize:,} rows...")
+            with metrics.file(india_csv) as record:
+                source_id, rows, quarantined = store_source(
+                    conn, india_csv, iter_csv_chunks(india_csv, chunksize),
+                    plan, keys, validator, bulk)
+                record.rows = rows
+                record.extra['quarantined'] = quarantined
+            print(f"✓ Loaded {rows:,} records from India.csv")
+            if quarantined:
+                print(f"  ⚠️ {quarantined:,} rows quarantined")
+            return source_id
+        except Exception as e:
+            print(f"✗ Error: {e}")
+            return None
+
+    try:
+        # Read with specific column handling to avoid duplicates
+        print("Reading India.csv...")
+        with metrics.file(india_csv) as record:
+            df = read_csv(india_csv)
+
+            if 'DISTRICT' in df.columns and 'District' in df.columns:
+                print("  Fixed duplicate column issue")
+            print(f"  Rows: {len(df):,}")
+
+            df = normalise_frame(df)
+            print(f"  Columns: {list(df.columns)}")
+
+            # Save to database
+            source_id, record.rows, quarantined = store_source(conn, india_csv, df, plan,
+                                                               keys, validator, bulk)
+            record.extra['quarantined'] = quarantined
+        print(f"✓ Loaded {record.rows:,} records from India.csv")
+        if quarantined:
+            print(f"  ⚠️ {quarantined:,} rows quarantined")
+
+        # Show sample
+        print("\nSample data:")
+        print(df.head(3).to_string(max_colwidth=40))
+        return source_id
+
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def load_state_files(conn, plan, keys, metrics, validator, workers=1, bulk=False,
+                     chunksize=None):
+    """Load new and changed _states/*.csv files; workers parse, this process writes.
+
+    With chunksize every file is streamed in this process instead, so
+    workers are not used. Each file's metrics cover writing it (and, when
+    streaming, parsing it); the parse time of a worker is recorded with it.
+    Returns the source_ids that were loaded.
+    """
+    states_folder = RAW_DATA_DIR / '_states'
+    if not states_folder.exists():
+        return []
+
+    all_files = sorted(states_folder.glob("*.csv"))
+    state_files = [path for path in plan.to_load if path.parent == states_folder]
+    print(f"Found {len(all_files)} state CSV files ({len(state_files)} new or changed)")
+    if not state_files:
+        return []
+    if chunksize:
+        print(f"Streaming all states in chunks of {chunksize:,} rows...")
+        if workers != 1:
+            print("  Note: --workers is ignored when streaming")
+        frames = ((path.name, iter_csv_chunks(path, chunksize, path.stem.upper()), None, {})
+                  for path in state_files)
+    elif workers == 1:
+        print("Loading all states...")
+        frames = iter_state_frames(state_files, workers)
+    else:
+        print(f"Loading all states with {workers or os.cpu_count()} worker processes...")
+        frames = iter_state_frames(state_files, workers)
+
+    successful = 0
+    total_records = 0
+    source_ids = []
+    files_by_name = {path.name: path for path in state_files}
+
+    # Results arrive in file order, so the fact table is identical to a serial load
+    for file_name, df, error, parse in frames:
+        if error is None:
+            try:
+                with metrics.file(files_by_name[file_name]) as record:
+                    record.extra.update(parse)
+                    source_id, rows, quarantined = store_source(
+                        conn, files_by_name[file_name], df, plan, keys, validator, bulk)
+                    record.rows = rows
+                    record.extra['quarantined'] = quarantined
+                source_ids.append(source_id)
+                if quarantined:
+                    print(f"  ⚠️ {file_name}: {quarantined:,} rows quarantined")
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+        if error is not None:
+            print(f"  ✗ {file_name}: {error}")
+            continue
+
+        total_records += rows
+        successful += 1
+
+        if successful % 10 == 0:  # Progress update every 10 states
+            print(f"  ✓ Loaded {successful} states... ({total_records:,} records so far)")
+
+    print(f"\n✓ Successfully loaded {successful}/{len(state_files)} states")
+    print(f"✓ Total records from states: {total_records:,}")
+    return source_ids
+
+
+def state_codes_for(state_names):
+    """Vectorised state code lookup; unknown names fall back to their first two letters"""
+    return state_names.map(STATE_CODES).fillna(state_names.str[:2].str.upper())
+
+
+def build_state_dimension(state_names):
+    """dim_states rows (state_code, state_name, region) for a Series of names"""
+    names = state_names.reset_index(drop=True)
+    codes = state_codes_for(names)
+    return pd.DataFrame({
+        'state_code': codes,
+        'state_name': names,
+        'region': codes.map(STATE_REGIONS).fillna('Other'),
+    })
+
+
+def build_district_dimension(districts, existing_codes):
+    """dim_districts rows (district_code, district_name, state_name) for new districts.
+
+    Codes that collide after truncation, with each other or with codes
+    already in the database, get a numeric suffix and are returned
+    separately so they can be reported.
+    """
+    districts = districts.reset_index(drop=True)
+    base_codes = (state_codes_for(districts['state_name']) + '_'
+                  + districts['district_name'].str.replace(' ', '_').str[:DISTRICT_CODE_LENGTH])
+
+    # Number each code's occurrences, counting the ones already stored first
+    existing_codes = pd.Series(existing_codes, dtype=object)
+    all_codes = pd.concat([existing_codes, base_codes], ignore_index=True)
+    occurrence = all_codes.groupby(all_codes).cumcount().iloc[len(existing_codes):]
+    occurrence = occurrence.reset_index(drop=True)
+    collided = all_codes.duplicated(keep=False).iloc[len(existing_codes):].reset_index(drop=True)
+
+    dimension = pd.DataFrame({
+        'district_code': base_codes.where(occurrence == 0,
+                                          base_codes + '_' + (occurrence + 1).astype(str)),
+        'district_name': districts['district_name'],
+        'state_name': districts['state_name'],
+    })
+    collisions = dimension[collided].assign(base_code=base_codes[collided])
+    return dimension, collisions
+
+
+def report_district_collisions(collisions, limit=10):
+    """Print district codes that were shared after truncation"""
+    if collisions.empty:
+        return
+    groups = collisions.groupby('base_code')['district_name'].agg(list)
+    print(f"⚠️ {len(collisions)} districts share {len(groups)} truncated district codes "
+          f"({DISTRICT_CODE_LENGTH} chars); suffixed to keep them apart:")
+    for base_code, names in groups.head(limit).items():
+        more = f" (+{len(names) - 3} more)" if len(names) > 3 else ""
+        print(f"  • {base_code}: {', '.join(names[:3])}{more}")
+    if len(groups) > limit:
+        print(f"  ... and {len(groups) - limit} more")
+
+
+def populate_dimensions(conn, keys):
+    """Add this load's states, districts and indicators to the dimension tables;
+    returns the number of rows offered to them.
+
+    Codes and regions are computed with column operations on the collected
+    keys and each table gets a single executemany; existing dimension rows
+    are kept by INSERT OR IGNORE.
+    """
+    # Populate states
+    states = build_state_dimension(keys.unique_states())
+    conn.executemany('''
+        INSERT OR IGNORE INTO dim_states (state_code, state_name, region)
+        VALUES (?, ?, ?)
+    ''', states.itertuples(index=False, name=None))
+    print(f"✓ Populated dim_states with {len(states)} states")
+
+    # Populate districts not stored yet
+    existing = pd.read_sql('''
+        SELECT s.state_name, d.district_name, d.district_code
+        FROM dim_districts d JOIN dim_states s ON s.state_id = d.state_id
+    ''', conn)
+    districts = keys.unique_districts().merge(
+        existing[['state_name', 'district_name']], how='left', indicator=True
+    )
+    districts = districts[districts['_merge'] == 'left_only']
+
+    districts, collisions = build_district_dimension(districts, existing['district_code'])
+    state_ids = pd.read_sql("SELECT state_name, state_id FROM dim_states", conn)
+    districts['state_id'] = districts['state_name'].map(
+        state_ids.set_index('state_name')['state_id']
+    )
+    conn.executemany('''
+        INSERT OR IGNORE INTO dim_districts (district_code, district_name, state_id)
+        VALUES (?, ?, ?)
+    ''', districts[['district_code', 'district_name', 'state_id']].itertuples(index=False, name=None))
+    print(f"✓ Populated dim_districts with {len(districts)} new districts")
+    report_district_collisions(collisions)
+
+    # Populate indicators
+    indicators = keys.unique_indicators()
+    conn.executemany('''
+        INSERT OR IGNORE INTO dim_indicators (indicator_name, category)
+        VALUES (?, ?)
+    ''', indicators.itertuples(index=False, name=None))
+    print(f"✓ Populated dim_indicators with {len(indicators)} indicators")
+
+    conn.commit()
+    return len(states) + len(districts) + len(indicators)
+
+
+def transfer_staged_facts(conn, source_ids):
+    """Resolve staged text rows to surrogate keys and append them to the fact
+    table. rows_loaded of the given sources is set in the same transaction,
+    so the manifest never counts rows the fact table doesn't have."""
+    inserted = conn.execute(f'''
+        INSERT INTO fact_health_metrics
+            (state_id, district_id, indicator_id, nfhs5_value, nfhs4_value, change_value, source_id)
+        SELECT s.state_id, d.district_id, i.indicator_id,
+               g.nfhs5_value, g.nfhs4_value, g.change_value, g.source_id
+        FROM {STAGING_TABLE} g
+        LEFT JOIN dim_states s ON s.state_name = g.state_name
+        LEFT JOIN dim_districts d
+               ON d.state_id = s.state_id AND d.district_name = g.district_name
+        LEFT JOIN dim_indicators i
+               ON i.indicator_name = g.indicator AND IFNULL(i.category, '') = IFNULL(g.category, '')
+        ORDER BY g.rowid
+    ''').rowcount
+    counts = dict(conn.execute(
+        f"SELECT source_id, COUNT(*) FROM {STAGING_TABLE} GROUP BY source_id").fetchall())
+    for source_id in source_ids:
+        set_rows_loaded(conn, source_id, counts.get(source_id, 0))
+    conn.execute(f"DROP TABLE temp.{STAGING_TABLE}")
+    conn.commit()
+    return inserted
+
+
+def prune_dimensions(conn):
+    """Drop dimension rows no longer referenced by any fact row"""
+    cursor = conn.cursor()
+    removed = 0
+    for table, key in [('dim_districts', 'district_id'),
+                       ('dim_indicators', 'indicator_id'),
+                       ('dim_states', 'state_id')]:
+        removed += cursor.execute(f'''
+            DELETE FROM {table}
+            WHERE NOT EXISTS (
+                SELECT 1 FROM fact_health_metrics f WHERE f.{key} = {table}.{key}
+            )
+        ''').rowcount
+    conn.commit()
+    return removed
+
+
+def create_indexes(conn):
+    """Create the fact table indexes"""
+    for name, target in FACT_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    conn.execute("ANALYZE")
+    conn.commit()
+
+
+def create_views(conn):
+    """Create the analysis views"""
+    # Recreated on every load, so databases pick up new view columns
+    conn.execute("DROP VIEW IF EXISTS vw_health_analysis")
+    conn.execute("DROP VIEW IF EXISTS vw_fact_health_metrics")
+
+    # Create main analysis view; the ids let queries group on the fact indexes.
+    # trend is the loader's direction-aware classification, and change_z is
+    # relative to the indicator's current statistics (trends.py)
+    conn.execute(f'''
+        CREATE VIEW vw_health_analysis AS
+        SELECT
+            f.state_id,
+            f.district_id,
+            f.indicator_id,
+            s.state_name,
+            d.district_name,
+            i.indicator_name as indicator,
+            i.category,
+            f.nfhs5_value,
+            f.nfhs4_value,
+            f.change_value,
+            CASE f.trend
+                WHEN 1 THEN 'Improved'
+                WHEN -1 THEN 'Declined'
+                ELSE 'No Change'
+            END as trend,
+            f.improvement,
+            f.pct_change,
+            (f.improvement - z.improvement_mean) / z.improvement_std as change_z,
+            s.region
+        FROM fact_health_metrics f
+        LEFT JOIN dim_states s ON s.state_id = f.state_id
+        LEFT JOIN dim_districts d ON d.district_id = f.district_id
+        LEFT JOIN dim_indicators i ON i.indicator_id = f.indicator_id
+        LEFT JOIN {INDICATOR_STATS_TABLE} z ON z.indicator_id = f.indicator_id
+    ''')
+
+    # Compatibility view with the pre-star-schema fact table columns
+    conn.execute('''
+        CREATE VIEW vw_fact_health_metrics AS
+        SELECT
+            f.metric_id,
+            s.state_name,
+            d.district_name,
+            i.indicator_name as indicator,
+            f.nfhs5_value,
+            f.nfhs4_value,
+            f.change_value,
+            i.category,
+            f.source_id
+        FROM fact_health_metrics f
+        LEFT JOIN dim_states s ON s.state_id = f.state_id
+        LEFT JOIN dim_districts d ON d.district_id = f.district_id
+        LEFT JOIN dim_indicators i ON i.indicator_id = f.indicator_id
+    ''')
+
+    conn.commit()
+
+
+def print_summary(conn):
+    """Print table counts and database size"""
+    cursor = conn.cursor()
+
+    # Get final stats
+    tables_info = [
+        ('dim_states', 'States/UTs'),
+        ('dim_districts', 'Districts'),
+        ('dim_indicators', 'Health Indicators'),
+        ('fact_health_metrics', 'Total Data Points'),
+        (QUARANTINE_TABLE, 'Quarantined Rows')
+    ]
+
+    print("\n📊 Database Contents:")
+    for table, label in tables_info:
+        try:
+            count = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            print(f"  • {label}: {count:,}")
+        except:
+            print(f"  • {label}: 0")
+
+    db_size = DATABASE_PATH.stat().st_size / 1024 / 1024
+    print(f"\n💾 Database size: {db_size:.2f} MB")
+    print(f"📂 Location: {DATABASE_PATH}")
+
+
+def write_stats(path, metrics, rows_loaded=0, validation=None):
+    """Save the stage timings, rows loaded, validation counts and peak memory
+    as JSON (read by `nfhs bench`)"""
+    own, children = peak_memory_mb()
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'stages': metrics.timings, 'rows_loaded': rows_loaded,
+                   'peak_rss_mb': own, 'peak_worker_rss_mb': children,
+                   'validation': validation,
+                   'stage_metrics': [stage.to_dict() for stage in metrics.stages]}, f, indent=2)
+
+
+def run_load(conn, plan, args, metrics, validator, full):
+    """Steps 2-8: ingest the planned files and refresh dimensions, indexes,
+    views, summary tables, the Parquet cache and the district matrix.
+
+    The manifest rows of the files are only marked done at the end, so a
+    load that dies halfway is redone by the next run. Returns the number of
+    fact rows inserted.
+    """
+    previous_pragmas = {}
+    if args.bulk:
+        previous_pragmas = set_pragmas(conn, BULK_PRAGMAS)
+        print("✓ Bulk mode: " + ", ".join(f"{k}={v}" for k, v in BULK_PRAGMAS.items()))
+
+    with metrics.stage("Remove stale rows") as stage:
+        ensure_quarantine(conn)
+        # Databases from before the statistics tables get them counted in full
+        rebuild_stats = ensure_trend_stats(conn)
+        deleted, stale_states = remove_stale_sources(conn, plan)
+        stage.rows = deleted
+        if deleted:
+            print(f"✓ Deleted {deleted:,} rows from changed or removed files")
+        create_staging_table(conn)
+
+    print("\n" + "-" * 70)
+    print("STEP 2: Loading India.csv (with duplicate column fix)")
+    print("-" * 70)
+    keys = DimensionKeys()
+    with metrics.stage("Load India.csv"):
+        loaded = [load_india_csv(conn, plan, keys, metrics, validator, bulk=args.bulk,
+                                 chunksize=args.chunksize)]
+
+    print("\n" + "-" * 70)
+    print("STEP 3: Loading ALL state files from _states folder")
+    print("-" * 70)
+    with metrics.stage("Load state files"):
+        loaded += load_state_files(conn, plan, keys, metrics, validator, workers=args.workers,
+                                   bulk=args.bulk, chunksize=args.chunksize)
+        # Bulk mode: everything since the first insert is one transaction
+        conn.commit()
+    validator.print_summary()
+    loaded = [source_id for source_id in loaded if source_id is not None]
+
+    print("\n" + "-" * 70)
+    print("STEP 4: Populating dimension tables, fact keys and trend columns")
+    print("-" * 70)
+    with metrics.stage("Dimension tables") as stage:
+        if loaded:
+            stage.rows = populate_dimensions(conn, keys)
+    with metrics.stage("Fact table keys") as stage:
+        inserted = stage.rows = transfer_staged_facts(conn, loaded)
+        print(f"✓ Inserted {inserted:,} rows into fact_health_metrics")
+        if not full and plan.stale_source_ids:
+            print(f"✓ Pruned {prune_dimensions(conn)} unreferenced dimension rows")
+    with metrics.stage("Trend columns") as stage:
+        sources, directions_changed = refresh_directions(conn)
+        print("✓ Indicator directions: " + ", ".join(
+            f"{count} from {source}" for source, count in sorted(sources.items())))
+        # Only the loaded files' rows, unless new directions change every row
+        scope = None if full or directions_changed else loaded
+        stage.rows = refresh_trends(conn, scope)
+        print(f"✓ Computed trend, improvement and pct_change ({stage.rows:,} rows updated)")
+        indicators = refresh_trend_stats(conn, None if rebuild_stats else scope)
+        print(f"✓ Updated the change_z statistics of {indicators} indicators "
+              f"({INDICATOR_STATS_TABLE})")
+
+    print("\n" + "-" * 70)
+    print("STEP 5: Creating indexes, analysis views and the indicator search index")
+    print("-" * 70)
+    with metrics.stage("Indexes and views"):
+        create_indexes(conn)
+        print(f"✓ Created {len(FACT_INDEXES)} indexes on fact_health_metrics")
+        create_views(conn)
+        print("✓ Created vw_health_analysis and vw_fact_health_metrics views")
+        indexed = build_indicator_index(conn)
+        if indexed is None:
+            print("Note: this SQLite build has no FTS5 - indicator search will use LIKE")
+        else:
+            print(f"✓ Indexed {indexed} indicators for full-text search ({INDEX_TABLE})")
+
+        if previous_pragmas:
+            set_pragmas(conn, previous_pragmas)
+            print("✓ Restored pragmas: " + ", ".join(f"{k}={v}" for k, v in previous_pragmas.items()))
+
+    # Summary tables and the Parquet cache only need the states that gained or
+    # lost rows, unless new directions changed the trends of every state. After
+    # an unfinished load the states it touched are unknown, so all are redone.
+    states = (None if full or directions_changed or plan.resumed
+              else set(keys.unique_states()) | set(stale_states))
+
+    print("\n" + "-" * 70)
+    print("STEP 6: Refreshing summary tables")
+    print("-" * 70)
+    with metrics.stage("Summary tables") as stage:
+        # Databases from before the summary tables get them built in full
+        rebuild = None if ensure_aggregates(conn) else states
+        rows = stage.rows = refresh_aggregates(conn, rebuild)
+        scope = "all states" if rebuild is None else f"{len(rebuild)} states"
+        print(f"✓ Refreshed {', '.join(AGGREGATE_TABLES)} for {scope} "
+              f"({rows:,} state x indicator rows)")
+
+    if not args.no_parquet:
+        update_parquet_cache(conn, states, metrics)
+
+    # Invalidates cached query results (query_cache.py)
+    print(f"✓ Data version is now {bump_data_version(conn)}")
+
+    print("\n" + "-" * 70)
+    print("STEP 8: Building the district x indicator matrix")
+    print("-" * 70)
+    with metrics.stage("District matrix") as stage:
+        districts, indicators = build_matrix(conn)
+        stage.rows = districts * indicators
+        print(f"✓ Wrote {districts:,} districts x {indicators} indicators (float32) to {MATRIX_DIR}")
+
+    finish_sources(conn, loaded, plan.removed.values())
+    return inserted
+
+
+def update_parquet_cache(conn, states, metrics):
+    """Step 7: refresh the Parquet cache for the given states (None = all)"""
+    print("\n" + "-" * 70)
+    print("STEP 7: Updating Parquet cache")
+    print("-" * 70)
+    if not pyarrow_available():
+        print("Note: pyarrow is not installed - skipping the Parquet cache")
+        return
+    with metrics.stage("Parquet cache") as stage:
+        rows = stage.rows = write_cache(conn, CACHE_DIR, states=states)
+        scope = "all states" if states is None else f"{len(states)} states"
+        print(f"✓ Wrote {rows:,} rows for {scope} to {CACHE_DIR}")
+
+
+def main(args):
+    """Run the load for parsed `nfhs load` arguments"""
+
+    print("=" * 70)
+    print("INDIAN HEALTHCARE ANALYSIS - FINAL DATA LOADER")
+    print("=" * 70)
+
+    print(f"\nProject: {BASE_DIR}")
+    print(f"Database: {DATABASE_PATH}")
+
+    print("\n" + "-" * 70)
+    print("STEP 1: Database setup")
+    print("-" * 70)
+
+    validator = Validator(enabled=not args.no_validate)
+    metrics = LoadMetrics(jsonl_path=args.metrics, profile_stage=args.profile,
+                          profiler=args.profiler)
+
+    with metrics.stage("Database setup"):
+        full = args.full or not DATABASE_PATH.exists()
+        if not full:
+            conn = open_database(DATABASE_PATH)
+            if not supports_incremental(conn):
+                print("Existing database has no source manifest or trend columns - rebuilding")
+                conn.close()
+                full = True
+
+        if full:
+            # Remove old database, with its write-ahead log
+            if DATABASE_PATH.exists():
+                os.remove(DATABASE_PATH)
+                print("✓ Removed old database")
+            for suffix in ('-wal', '-shm'):
+                DATABASE_PATH.with_name(DATABASE_PATH.name + suffix).unlink(missing_ok=True)
+
+            # Create new database
+            DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            conn = open_database(DATABASE_PATH)
+
+            # Create tables with clean schema
+            print("Creating tables...")
+            create_tables(conn)
+            print("✓ Tables created")
+        else:
+            print("✓ Incremental reload of existing database (use --full to rebuild)")
+            ensure_manifest(conn)
+
+        metrics.conn = conn
+        source_files = list_source_files()
+        plan = plan_reload(conn, source_files, RAW_DATA_DIR, FACT_TABLE)
+        print(f"Source files: {len(plan.new)} new, {len(plan.changed)} changed, "
+              f"{len(plan.unchanged)} unchanged, {len(plan.removed)} removed")
+        if plan.resumed:
+            print(f"⚠️ The last load did not finish - redoing it ({plan.resumed} pending source files)")
+
+    rows_loaded = 0
+    if plan.is_empty:
+        print(f"✓ All {len(source_files)} source files unchanged - database is up to date")
+    else:
+        rows_loaded = run_load(conn, plan, args, metrics, validator, full)
+
+    print("\n" + "-" * 70)
+    print("FINAL SUMMARY")
+    print("-" * 70)
+    print_summary(conn)
+    metrics.print_summary(rows_loaded,
+                          used_workers=bool(rows_loaded) and args.workers != 1 and not args.chunksize)
+    if args.stats_json:
+        write_stats(args.stats_json, metrics, rows_loaded, validator.summary())
+    if args.metrics:
+        print(f"📂 Metrics (JSON lines): {args.metrics}")
+    if args.profile and metrics.profiled is None:
+        print(f"Note: no stage matched --profile {args.profile!r}")
+
+    metrics.close()
+    conn.close()
+
+    print("\n" + "=" * 70)
+    print("✅ DATA LOADING COMPLETE!")
+    print("=" * 70)
+
+    print("\n🎯 Your data is ready for analysis!")
+    print("\nQuick test query:")
+    print("""
+import sqlite3
+import pandas as pd
+
+conn = sqlite3.connect('data/database/healthcare_india.db')
+result = pd.read_sql("SELECT * FROM vw_health_analysis LIMIT 10", conn)
+print(result)
+""")
+
+    print("\n📊 Next steps:")
+    print("1. Explore: python scripts/explore_database.py")
+    print("2. Query: Use SQL queries from sql/analysis_queries.sql")
+    print("3. Visualize: Open Power BI and connect to the database")
+    print("4. Build your dashboard!")
+
+    print("\n" + "=" * 70)
+
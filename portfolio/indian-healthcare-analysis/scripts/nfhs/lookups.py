@@ -0,0 +1,80 @@
+"""
+State and region lookups shared by every loader
+Author: RK
+Description: One copy of the state/UT codes and regions, plus the spelling
+             variants found in NFHS files ('&' for 'and', upper-case file
+             names, old names). The lookup tables are built once, at import.
+"""
+
+from typing import Dict, Optional
+
+# State code mapping, keyed by the canonical name stored in dim_states
+STATE_CODES: Dict[str, str] = {
+    'Andhra Pradesh': 'AP', 'Arunachal Pradesh': 'AR', 'Assam': 'AS',
+    'Bihar': 'BR', 'Chhattisgarh': 'CG', 'Goa': 'GA', 'Gujarat': 'GJ',
+    'Haryana': 'HR', 'Himachal Pradesh': 'HP', 'Jharkhand': 'JH',
+    'Karnataka': 'KA', 'Kerala': 'KL', 'Madhya Pradesh': 'MP',
+    'Maharashtra': 'MH', 'Manipur': 'MN', 'Meghalaya': 'ML',
+    'Mizoram': 'MZ', 'Nagaland': 'NL', 'Odisha': 'OR', 'Punjab': 'PB',
+    'Rajasthan': 'RJ', 'Sikkim': 'SK', 'Tamil Nadu': 'TN',
+    'Telangana': 'TG', 'Tripura': 'TR', 'Uttar Pradesh': 'UP',
+    'Uttarakhand': 'UK', 'West Bengal': 'WB',
+    'Andaman and Nicobar Islands': 'AN', 'Chandigarh': 'CH',
+    'Dadra and Nagar Haveli and Daman and Diu': 'DD',
+    'Delhi': 'DL', 'Jammu and Kashmir': 'JK',
+    'Ladakh': 'LA', 'Lakshadweep': 'LD', 'Puducherry': 'PY'
+}
+
+STATE_REGIONS: Dict[str, str] = {
+    'AP': 'South', 'AR': 'Northeast', 'AS': 'Northeast', 'BR': 'East',
+    'CG': 'Central', 'GA': 'West', 'GJ': 'West', 'HR': 'North',
+    'HP': 'North', 'JH': 'East', 'KA': 'South', 'KL': 'South',
+    'MP': 'Central', 'MH': 'West', 'MN': 'Northeast', 'ML': 'Northeast',
+    'MZ': 'Northeast', 'NL': 'Northeast', 'OR': 'East', 'PB': 'North',
+    'RJ': 'North', 'SK': 'Northeast', 'TN': 'South', 'TG': 'South',
+    'TR': 'Northeast', 'UP': 'North', 'UK': 'North', 'WB': 'East',
+    'AN': 'South', 'CH': 'North', 'DD': 'West', 'DL': 'North',
+    'JK': 'North', 'LA': 'North', 'LD': 'South', 'PY': 'South'
+}
+
+# Names that differ from the canonical one by more than case, spacing,
+# underscores or '&' vs 'and' (those are handled by _name_key)
+STATE_ALIASES: Dict[str, str] = {
+    'Orissa': 'Odisha',
+    'Pondicherry': 'Puducherry',
+    'Uttaranchal': 'Uttarakhand',
+    'NCT of Delhi': 'Delhi',
+    'Andaman and Nicobar': 'Andaman and Nicobar Islands',
+}
+
+
+def _name_key(name: str) -> str:
+    """Spelling-insensitive key: 'JAMMU_&_KASHMIR' -> 'jammu and kashmir'"""
+    return ' '.join(name.replace('&', ' and ').replace('_', ' ').split()).casefold()
+
+
+# Exact spellings seen so far -> canonical name; misses fall back to the key table
+_EXACT: Dict[str, str] = {name: name for name in STATE_CODES}
+_EXACT.update(STATE_ALIASES)
+_BY_KEY: Dict[str, str] = {_name_key(name): name for name in _EXACT}
+_BY_KEY.update({_name_key(alias): name for alias, name in STATE_ALIASES.items()})
+
+
+def resolve_state(name: str) -> Optional[str]:
+    """Canonical state/UT name for any known spelling, else None"""
+    canonical = _EXACT.get(name)
+    if canonical is None and isinstance(name, str):
+        canonical = _BY_KEY.get(_name_key(name))
+        if canonical is not None:
+            _EXACT[name] = canonical
+    return canonical
+
+
+def state_code(name: str) -> Optional[str]:
+    """Two-letter code for a state name in any known spelling"""
+    return STATE_CODES.get(resolve_state(name))
+
+
+def state_region(code: str) -> Optional[str]:
+    """Region of a state code"""
+    return STATE_REGIONS.get(code)
@@ -0,0 +1,220 @@
+"""
+Source file manifest for incremental loads
+Author: RK
+Description: Records which raw files were loaded into which table, so a
+             reload only re-ingests files that are new or have changed.
+             A loader marks the rows of the files it touches as pending
+             until its whole run has finished; a run that dies halfway
+             leaves them pending, and the next plan reloads those files.
+"""
+
+import hashlib
+import secrets
+import sqlite3
+from pathlib import Path
+
+MANIFEST_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS etl_manifest (
+        source_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        source_path TEXT NOT NULL,
+        target_table TEXT NOT NULL,
+        size_bytes INTEGER,
+        mtime_ns INTEGER,
+        content_hash TEXT,
+        rows_loaded INTEGER,
+        loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        pending INTEGER NOT NULL DEFAULT 0,
+        UNIQUE(source_path, target_table)
+    )
+'''
+
+# One row: a random token replaced by every bump_data_version()
+GENERATION_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS etl_generation (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        generation TEXT NOT NULL,
+        bumped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+
+class ReloadPlan:
+    """Outcome of comparing files on disk with the manifest"""
+
+    def __init__(self):
+        self.new = []          # paths never loaded before
+        self.changed = {}      # path -> source_id for files whose content differs
+        self.unchanged = []    # paths that can be skipped
+        self.removed = {}      # source_path -> source_id for files gone from disk
+        self.stats = {}        # path -> (size_bytes, mtime_ns, content_hash)
+        self.to_load = []      # new and changed paths, in the order given
+        self.resumed = 0       # pending sources left by a load that didn't finish
+
+    @property
+    def stale_source_ids(self):
+        """Sources whose previously loaded rows must be deleted"""
+        return list(self.changed.values()) + list(self.removed.values())
+
+    @property
+    def is_empty(self):
+        return not (self.to_load or self.removed)
+
+
+def ensure_manifest(conn):
+    """Create the manifest table if needed, and add the pending column to
+    manifests from before it"""
+    conn.execute(MANIFEST_SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(etl_manifest)")}
+    if 'pending' not in columns:
+        conn.execute("ALTER TABLE etl_manifest ADD COLUMN pending INTEGER NOT NULL DEFAULT 0")
+    conn.commit()
+
+
+def file_hash(path, chunk_size=1 << 20):
+    """BLAKE2b digest of a file, read in 1 MB chunks"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_key(path, base_dir):
+    """Manifest key for a file: its path relative to the raw data folder"""
+    return Path(path).relative_to(base_dir).as_posix()
+
+
+def plan_reload(conn, files, base_dir, target_table):
+    """Compare files with the manifest and decide what needs loading.
+
+    Size and mtime are checked first; a file is only hashed when they
+    differ, so an unchanged folder costs one stat() per file. Pending
+    sources count as changed (or removed), whatever their content.
+    """
+    known = {
+        row[0]: row[1:]
+        for row in conn.execute('''
+            SELECT source_path, source_id, size_bytes, mtime_ns, content_hash, pending
+            FROM etl_manifest WHERE target_table = ?
+        ''', (target_table,))
+    }
+
+    plan = ReloadPlan()
+    plan.resumed = sum(1 for values in known.values() if values[4])
+    for path in files:
+        key = source_key(path, base_dir)
+        stat = path.stat()
+        previous = known.pop(key, None)
+
+        if previous is not None and previous[4]:
+            plan.stats[path] = (stat.st_size, stat.st_mtime_ns, file_hash(path))
+            plan.changed[path] = previous[0]
+            plan.to_load.append(path)
+            continue
+
+        if previous is not None and previous[1:3] == (stat.st_size, stat.st_mtime_ns):
+            plan.unchanged.append(path)
+            continue
+
+        content_hash = file_hash(path)
+        plan.stats[path] = (stat.st_size, stat.st_mtime_ns, content_hash)
+
+        if previous is None:
+            plan.new.append(path)
+            plan.to_load.append(path)
+        elif previous[3] == content_hash:
+            # Touched but identical: refresh the stat so it isn't hashed again
+            conn.execute('''
+                UPDATE etl_manifest SET size_bytes = ?, mtime_ns = ?
+                WHERE source_id = ?
+            ''', (stat.st_size, stat.st_mtime_ns, previous[0]))
+            plan.unchanged.append(path)
+        else:
+            plan.changed[path] = previous[0]
+            plan.to_load.append(path)
+
+    plan.removed = {key: values[0] for key, values in known.items()}
+    conn.commit()
+    return plan
+
+
+def record_source(conn, path, base_dir, target_table, stats=None, pending=False):
+    """Insert or refresh the manifest row for a file and return its source_id"""
+    if stats is None:
+        stat = path.stat()
+        stats = (stat.st_size, stat.st_mtime_ns, file_hash(path))
+
+    key = source_key(path, base_dir)
+    conn.execute('''
+        INSERT INTO etl_manifest
+            (source_path, target_table, size_bytes, mtime_ns, content_hash, pending)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (source_path, target_table) DO UPDATE SET
+            size_bytes = excluded.size_bytes,
+            mtime_ns = excluded.mtime_ns,
+            content_hash = excluded.content_hash,
+            rows_loaded = NULL,
+            loaded_at = CURRENT_TIMESTAMP,
+            pending = excluded.pending
+    ''', (key, target_table, *stats, int(pending)))
+
+    return conn.execute('''
+        SELECT source_id FROM etl_manifest WHERE source_path = ? AND target_table = ?
+    ''', (key, target_table)).fetchone()[0]
+
+
+def set_rows_loaded(conn, source_id, rows):
+    """Store how many rows a source produced"""
+    conn.execute("UPDATE etl_manifest SET rows_loaded = ? WHERE source_id = ?",
+                 (rows, source_id))
+
+
+def mark_pending(conn, source_ids):
+    """Flag sources as pending: their rows are being replaced or removed"""
+    conn.executemany("UPDATE etl_manifest SET pending = 1, rows_loaded = NULL WHERE source_id = ?",
+                     [(source_id,) for source_id in source_ids])
+
+
+def finish_sources(conn, loaded, removed=()):
+    """Clear the pending flag of the loaded sources and drop the manifest rows
+    of removed ones, once everything built from them is up to date"""
+    conn.executemany("UPDATE etl_manifest SET pending = 0 WHERE source_id = ?",
+                     [(source_id,) for source_id in loaded])
+    forget_sources(conn, removed)
+    conn.commit()
+
+
+def forget_sources(conn, source_ids):
+    """Drop manifest rows, e.g. for files that no longer exist"""
+    conn.executemany("DELETE FROM etl_manifest WHERE source_id = ?",
+                     [(source_id,) for source_id in source_ids])
+
+
+def data_version(conn):
+    """Load generation of the database: "<PRAGMA user_version>-<random token>",
+    or just the user_version ('0' if never set) before the first bump"""
+    counter = conn.execute("PRAGMA user_version").fetchone()[0]
+    try:
+        row = conn.execute("SELECT generation FROM etl_generation").fetchone()
+    except sqlite3.OperationalError:
+        row = None
+    return f"{counter}-{row[0]}" if row else str(counter)
+
+
+def bump_data_version(conn):
+    """Mark the data as changed so caches keyed on data_version() go stale.
+
+    user_version counts the bumps of this file; the random token makes the
+    version unique even across --full rebuilds that start a new file, where
+    the count starts again.
+    """
+    counter = conn.execute("PRAGMA user_version").fetchone()[0] + 1
+    conn.execute(GENERATION_SCHEMA)
+    conn.execute('''
+        INSERT INTO etl_generation (id, generation) VALUES (1, ?)
+        ON CONFLICT (id) DO UPDATE SET generation = excluded.generation,
+                                       bumped_at = CURRENT_TIMESTAMP
+    ''', (secrets.token_hex(8),))
+    conn.execute(f"PRAGMA user_version = {counter}")
+    conn.commit()
+    return data_version(conn)
@@ -0,0 +1,76 @@
+"""
+Column normalisation for NFHS-5 CSV files
+Author: RK
+Description: Turns a raw India.csv / state CSV frame (or a streamed chunk
+             of one) into the standard fact columns
+"""
+
+import pandas as pd
+
+from .lookups import resolve_state
+
+# Standardized column names
+COLUMN_MAPPING = {
+    'NFHS 5': 'nfhs5_value',
+    'NFHS 4': 'nfhs4_value',
+    'State': 'state_name',
+    'District': 'district_name',
+    'Indicator': 'indicator',
+    'Category': 'category'
+}
+
+FACT_COLUMNS = ['state_name', 'district_name', 'indicator',
+                'nfhs5_value', 'nfhs4_value', 'change_value', 'category']
+
+# Read as text in streaming mode, so a chunk whose values all look numeric
+# (or are all empty) is typed the same as every other chunk
+TEXT_COLUMNS = {'State': str, 'District': str, 'DISTRICT': str,
+                'Indicator': str, 'Category': str}
+
+
+def read_csv(csv_file):
+    """Read a whole NFHS CSV file"""
+    return pd.read_csv(csv_file, encoding='utf-8', low_memory=False)
+
+
+def iter_csv_chunks(csv_file, chunksize, default_state=None):
+    """Read a CSV chunksize rows at a time and yield each chunk normalised"""
+    reader = pd.read_csv(csv_file, encoding='utf-8', chunksize=chunksize,
+                         dtype=TEXT_COLUMNS)
+    with reader:
+        for chunk in reader:
+            yield normalise_frame(chunk, default_state)
+
+
+def canonical_state_names(names):
+    """Map every known spelling of a state to its canonical name.
+
+    Resolves each distinct value once; unknown names are kept as they are.
+    """
+    mapping = {name: resolve_state(name) or name for name in names.dropna().unique()}
+    return names.map(mapping)
+
+
+def normalise_frame(df, default_state=None):
+    """Fix duplicate columns, standardize names and calculate change"""
+    # Fix duplicate columns if present (drop the uppercase duplicate)
+    if 'DISTRICT' in df.columns and 'District' in df.columns:
+        df = df.drop(columns=['DISTRICT'])
+
+    df = df.rename(columns=COLUMN_MAPPING)
+
+    # Add state code if missing
+    if default_state is not None and 'state_name' not in df.columns:
+        df['state_name'] = default_state
+
+    if 'state_name' in df.columns:
+        df['state_name'] = canonical_state_names(df['state_name'])
+
+    # Calculate change if both values exist
+    if 'nfhs5_value' in df.columns and 'nfhs4_value' in df.columns:
+        df['nfhs5_value'] = pd.to_numeric(df['nfhs5_value'], errors='coerce')
+        df['nfhs4_value'] = pd.to_numeric(df['nfhs4_value'], errors='coerce')
+        df['change_value'] = df['nfhs5_value'] - df['nfhs4_value']
+
+    # Select relevant columns
+    return df[[col for col in FACT_COLUMNS if col in df.columns]]
@@ -0,0 +1,151 @@
+"""
+Columnar Parquet cache of the normalised NFHS data
+Author: RK
+Description: The loader writes fact_health_metrics (joined to its dimensions)
+             as a Hive-partitioned Parquet dataset, state_name=/category=,
+             with dictionary-encoded text columns. Analyses read it back
+             with column selection and filter pushdown instead of parsing
+             CSVs or fetching every row from SQLite.
+
+Usage:
+    from nfhs.parquet_cache import read_facts
+
+    df = read_facts(columns=['district_name', 'nfhs5_value'],
+                    indicators=['Institutional births (%)'])
+
+Requires pyarrow (optional dependency, see requirements.txt).
+"""
+
+import shutil
+from pathlib import Path
+from urllib.parse import unquote
+
+import pandas as pd
+
+from .config import PROCESSED_DIR
+
+CACHE_DIR = PROCESSED_DIR / 'nfhs5_parquet'
+
+PARTITION_COLUMNS = ['state_name', 'category']
+CATEGORICAL_COLUMNS = ['region', 'district_name', 'indicator']
+
+# Rows are sorted by indicator inside each file, so small row groups let an
+# indicator filter skip most of a file using the row group statistics
+ROWS_PER_GROUP = 8192
+
+CACHE_QUERY = '''
+    SELECT
+        s.state_name,
+        i.category,
+        s.region,
+        d.district_name,
+        i.indicator_name as indicator,
+        f.indicator_id,
+        f.district_id,
+        f.nfhs5_value,
+        f.nfhs4_value,
+        f.change_value,
+        f.trend,
+        f.improvement,
+        f.pct_change
+    FROM fact_health_metrics f
+    LEFT JOIN dim_states s ON s.state_id = f.state_id
+    LEFT JOIN dim_districts d ON d.district_id = f.district_id
+    LEFT JOIN dim_indicators i ON i.indicator_id = f.indicator_id
+'''
+
+
+def pyarrow_available():
+    """True if the optional pyarrow dependency is installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _state_partitions(cache_dir):
+    """Map state name -> its partition directory"""
+    if not cache_dir.exists():
+        return {}
+    return {
+        unquote(path.name.split('=', 1)[1]): path
+        for path in cache_dir.iterdir()
+        if path.is_dir() and path.name.startswith('state_name=')
+    }
+
+
+def write_cache(conn, cache_dir=CACHE_DIR, states=None):
+    """Write the normalised fact data to the Parquet cache.
+
+    With states=None the whole cache is rebuilt; otherwise only the
+    partitions of the given state names are replaced (states without rows
+    any more are just removed). Returns the number of rows written.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    cache_dir = Path(cache_dir)
+    query, params = CACHE_QUERY, ()
+
+    if states is None:
+        if cache_dir.exists():
+            shutil.rmtree(cache_dir)
+    else:
+        states = sorted(set(states))
+        if not states:
+            return 0
+        partitions = _state_partitions(cache_dir)
+        for state in states:
+            if state in partitions:
+                shutil.rmtree(partitions[state])
+        query += f" WHERE s.state_name IN ({', '.join('?' * len(states))})"
+        params = tuple(states)
+
+    df = pd.read_sql(query + " ORDER BY s.state_name, i.category, f.indicator_id", conn,
+                     params=params)
+    if df.empty:
+        return 0
+
+    for column in CATEGORICAL_COLUMNS:
+        df[column] = df[column].astype('category')
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        cache_dir,
+        format='parquet',
+        partitioning=PARTITION_COLUMNS,
+        partitioning_flavor='hive',
+        existing_data_behavior='delete_matching',
+        max_rows_per_group=ROWS_PER_GROUP,
+        min_rows_per_group=0,
+    )
+    return len(df)
+
+
+def read_facts(columns=None, states=None, categories=None, indicators=None,
+               filters=None, cache_dir=CACHE_DIR):
+    """Read normalised rows from the Parquet cache.
+
+    states and categories prune whole partition directories, indicators
+    skip row groups via their statistics, and columns limits what is
+    decoded at all. Extra pyarrow-style filters, e.g.
+    [('nfhs5_value', '>', 90)], are ANDed with the rest.
+    """
+    cache_dir = Path(cache_dir)
+    if not cache_dir.exists():
+        raise FileNotFoundError(
+            f"No Parquet cache at {cache_dir} - run `python -m nfhs load` first"
+        )
+
+    predicates = list(filters or [])
+    if states is not None:
+        predicates.append(('state_name', 'in', list(states)))
+    if categories is not None:
+        predicates.append(('category', 'in', list(categories)))
+    if indicators is not None:
+        predicates.append(('indicator', 'in', list(indicators)))
+
+    return pd.read_parquet(cache_dir, engine='pyarrow', columns=columns,
+                           filters=predicates or None)
@@ -0,0 +1,176 @@
+"""
+On-disk cache of query results
+Author: RK
+Description: Reports re-run the same pd.read_sql queries on every run. The
+             cache stores each result as a pickled DataFrame, keyed by the
+             database file, its load generation (manifest.data_version(),
+             unique to every loader run), the SQL text and the parameters.
+             When the loader changes the data, older entries are ignored and
+             removed.
+             The least recently used entries are evicted once the cache
+             grows past max_bytes.
+
+Usage:
+    from nfhs.query_cache import QueryCache
+
+    cache = QueryCache(conn)
+    df = cache.read_sql("SELECT * FROM agg_region")
+    print(cache.stats())
+
+    cache = QueryCache.open()       # its own read-only connection to DATABASE_PATH
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+
+import pandas as pd
+
+from .config import DATABASE_PATH, PROCESSED_DIR
+from .manifest import data_version
+from .read_pool import read_only_uri
+
+CACHE_DIR = PROCESSED_DIR / 'query_cache'
+
+# 256 MB
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class QueryCache:
+    """pd.read_sql with results cached on disk until the data changes"""
+
+    def __init__(self, conn, cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+        self.conn = conn
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidated = 0
+
+        # One folder per database file, so several databases can share the cache
+        database = next(row[2] for row in conn.execute("PRAGMA database_list")
+                        if row[1] == 'main')
+        self.cache_dir = cache_dir / hashlib.blake2b(
+            os.path.abspath(database or ':memory:').encode(), digest_size=8).hexdigest()
+        self._version = None
+        # ReadPool threads share one cache: counters and the version check
+        # are updated under this lock
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, db_path=DATABASE_PATH, **options):
+        """Cache with its own read-only connection to db_path, usable from any
+        thread (close it with cache.conn.close())"""
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(
+                f"Database not found: {db_path} - run `python -m nfhs load` first"
+            )
+        conn = sqlite3.connect(read_only_uri(db_path), uri=True, check_same_thread=False)
+        return cls(conn, **options)
+
+    def _check_version(self, conn):
+        """Current load generation; drops entries of older ones when it changed"""
+        version = data_version(conn)
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                if self.cache_dir.exists():
+                    for path in self.cache_dir.glob('*.pkl'):
+                        if not path.name.startswith(f"{version}_"):
+                            path.unlink(missing_ok=True)
+                            self.invalidated += 1
+        return version
+
+    def _path(self, version, sql, params):
+        key = hashlib.blake2b(repr((sql, params)).encode(), digest_size=16).hexdigest()
+        return self.cache_dir / f"{version}_{key}.pkl"
+
+    def read_sql(self, sql, params=None, conn=None):
+        """Same as pd.read_sql(sql, conn, params=params), served from the cache when possible.
+
+        conn overrides the cache's own connection for this call, e.g. with
+        one borrowed from a ReadPool on another thread; it must be a
+        connection to the same database.
+        """
+        conn = conn or self.conn
+        if not self.enabled:
+            return pd.read_sql(sql, conn, params=params)
+
+        path = self._path(self._check_version(conn), sql, params)
+        try:
+            with open(path, 'rb') as f:
+                df = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+        else:
+            with self._lock:
+                self.hits += 1
+            try:
+                os.utime(path)  # mtime is the LRU clock
+            except FileNotFoundError:
+                pass  # evicted by another thread since it was read
+            return df
+
+        with self._lock:
+            self.misses += 1
+        df = pd.read_sql(sql, conn, params=params)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so a concurrent reader never sees half a file
+        partial = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(partial, 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+        with self._lock:
+            self._evict()
+        return df
+
+    def _entries(self):
+        """(mtime, size, path) of every entry, oldest first"""
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for path in self.cache_dir.glob('*.pkl'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return sorted(entries)
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes
+        (called with the lock held)"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Delete every cached result of this database"""
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+
+    def stats(self):
+        """Hit/miss counters of this instance plus the cache's current size"""
+        entries = self._entries()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            evictions, invalidated, version = self.evictions, self.invalidated, self._version
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'evictions': evictions,
+            'invalidated': invalidated,
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'data_version': version,
+        }
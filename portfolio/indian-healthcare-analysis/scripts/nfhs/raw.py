@@ -0,0 +1,279 @@
+"""
+Raw table loader for the NFHS-5 CSV structure
+Author: RK
+Description: Copies India.csv and a sample of the state files as they are
+             into india_data / states_data, plus a health_metrics snapshot.
+             Raw tables are only reloaded when their source files changed.
+Run it through the CLI: python -m nfhs raw --help
+"""
+
+import sqlite3
+
+import pandas as pd
+
+from .config import BASE_DIR, DATABASE_PATH, RAW_DATA_DIR, SQL_SCHEMA_PATH
+from .manifest import (bump_data_version, ensure_manifest, plan_reload, record_source,
+                       set_rows_loaded, forget_sources)
+
+
+def find_data_files(india_csv, india_change_csv, states_folder):
+    """Describe the raw files present, or return [] if there are none"""
+    files_found = []
+    if india_csv.exists():
+        files_found.append(f"✓ India.csv ({india_csv.stat().st_size / 1024:.0f} KB)")
+    if india_change_csv.exists():
+        files_found.append(f"✓ India_Change.csv ({india_change_csv.stat().st_size / 1024:.0f} KB)")
+    if states_folder.exists():
+        state_csvs = sorted(states_folder.glob("*.csv"))
+        files_found.append(f"✓ _states folder ({len(state_csvs)} CSV files)")
+    return files_found
+
+
+def create_schema(conn):
+    """Run sql/schema.sql, falling back to a minimal raw table"""
+    cursor = conn.cursor()
+    try:
+        with open(SQL_SCHEMA_PATH, 'r', encoding='utf-8') as f:
+            schema_sql = f.read()
+
+        for statement in schema_sql.split(';'):
+            statement = statement.strip()
+            if statement and not statement.startswith('--'):
+                try:
+                    cursor.execute(statement)
+                except sqlite3.Error as e:
+                    if 'already exists' not in str(e).lower():
+                        pass  # Ignore minor errors
+
+        conn.commit()
+        print("✓ Database schema created")
+    except Exception as e:
+        print(f"Warning: {e}")
+        print("Creating basic schema...")
+
+        # Create minimal schema
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS raw_health_data (
+                state TEXT,
+                district TEXT,
+                indicator TEXT,
+                nfhs5_value REAL,
+                nfhs4_value REAL,
+                change_value REAL
+            )
+        ''')
+        conn.commit()
+        print("✓ Basic schema created")
+
+
+def load_india_table(conn, india_csv, existing_tables):
+    """Copy India.csv into india_data unless unchanged; True if it was reloaded"""
+    india_plan = plan_reload(conn, [india_csv] if india_csv.exists() else [],
+                             RAW_DATA_DIR, 'india_data')
+
+    if india_csv.exists() and india_plan.is_empty and 'india_data' in existing_tables:
+        print("✓ India.csv unchanged - keeping 'india_data' table")
+        return False
+    if not india_csv.exists():
+        return False
+
+    try:
+        print("Reading India.csv...")
+        df = pd.read_csv(india_csv, encoding='utf-8')
+
+        print(f"  Rows: {len(df):,}")
+        print(f"  Columns: {list(df.columns)}")
+
+        # Save to database
+        df.to_sql('india_data', conn, if_exists='replace', index=False)
+        source_id = record_source(conn, india_csv, RAW_DATA_DIR, 'india_data',
+                                  india_plan.stats.get(india_csv))
+        set_rows_loaded(conn, source_id, len(df))
+        conn.commit()
+        print(f"✓ Loaded {len(df):,} records into 'india_data' table")
+
+        # Show sample
+        print("\nSample data:")
+        print(df.head(3).to_string())
+        return True
+
+    except Exception as e:
+        print(f"✗ Error loading India.csv: {e}")
+        return False
+
+
+def load_states_table(conn, states_folder, existing_tables, sample_size=5):
+    """Copy the first sample_size state files into states_data unless unchanged;
+    True if it was reloaded"""
+    state_files = sorted(states_folder.glob("*.csv"))
+    print(f"Found {len(state_files)} state CSV files")
+
+    test_files = state_files[:sample_size]  # Load the first few as a test
+    states_plan = plan_reload(conn, test_files, RAW_DATA_DIR, 'states_data')
+    forget_sources(conn, states_plan.removed.values())
+    conn.commit()
+
+    if states_plan.is_empty and 'states_data' in existing_tables:
+        print(f"✓ {len(test_files)} state files unchanged - keeping 'states_data' table")
+        return False
+
+    all_states_data = []
+    loaded_files = []
+    successful = 0
+
+    for csv_file in test_files:
+        try:
+            state_name = csv_file.stem.replace('_', ' ')
+            print(f"\n  Loading: {csv_file.name}...")
+
+            df = pd.read_csv(csv_file, encoding='utf-8')
+
+            # Add state column if not present
+            if 'State' not in df.columns and 'state' not in df.columns:
+                df['State'] = state_name
+
+            all_states_data.append(df)
+            loaded_files.append((csv_file, len(df)))
+            print(f"    ✓ {len(df):,} records")
+            successful += 1
+
+        except Exception as e:
+            print(f"    ✗ Error: {e}")
+            # Recorded with 0 rows so an unreadable file doesn't force a reload every run
+            loaded_files.append((csv_file, 0))
+
+    if all_states_data:
+        combined_df = pd.concat(all_states_data, ignore_index=True)
+        combined_df.to_sql('states_data', conn, if_exists='replace', index=False)
+        print(f"\n✓ Combined and loaded {len(combined_df):,} records from {successful} states")
+
+    for csv_file, rows in loaded_files:
+        source_id = record_source(conn, csv_file, RAW_DATA_DIR, 'states_data',
+                                  states_plan.stats.get(csv_file))
+        set_rows_loaded(conn, source_id, rows)
+    conn.commit()
+    return True
+
+
+def create_health_metrics(conn, india_reloaded):
+    """(Re)build the health_metrics snapshot of india_data"""
+    cursor = conn.cursor()
+    try:
+        # Rebuild the snapshot whenever india_data was reloaded
+        if india_reloaded:
+            cursor.execute("DROP TABLE IF EXISTS health_metrics")
+
+        # Try to create a unified view from available data
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS health_metrics AS
+            SELECT * FROM india_data
+            LIMIT 100000
+        ''')
+        conn.commit()
+
+        count = cursor.execute("SELECT COUNT(*) FROM health_metrics").fetchone()[0]
+        print(f"✓ Created health_metrics table with {count:,} records")
+
+    except Exception as e:
+        print(f"Note: {e}")
+
+
+def print_tables(conn):
+    """List every table with its row count, then the database size"""
+    cursor = conn.cursor()
+    tables = cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table'"
+    ).fetchall()
+
+    print(f"\n📊 Tables created: {len(tables)}")
+    for table in tables:
+        try:
+            count = cursor.execute(f"SELECT COUNT(*) FROM {table[0]}").fetchone()[0]
+            print(f"  • {table[0]}: {count:,} records")
+        except sqlite3.Error:
+            print(f"  • {table[0]}: (empty)")
+
+    db_size = DATABASE_PATH.stat().st_size / 1024 / 1024
+    print(f"\n💾 Database size: {db_size:.2f} MB")
+    print(f"📂 Location: {DATABASE_PATH}")
+
+
+def main(args):
+    """Run the load for parsed `nfhs raw` arguments; returns an exit code"""
+    print("=" * 70)
+    print("INDIAN HEALTHCARE ANALYSIS - CUSTOM DATA LOADER")
+    print("=" * 70)
+
+    print(f"\nProject directory: {BASE_DIR}")
+    print(f"Data directory: {RAW_DATA_DIR}")
+    print(f"Database: {DATABASE_PATH}")
+
+    print("\n" + "-" * 70)
+    print("STEP 1: Checking for data files...")
+    print("-" * 70)
+
+    india_csv = RAW_DATA_DIR / 'India.csv'
+    india_change_csv = RAW_DATA_DIR / 'India_Change.csv'
+    states_folder = RAW_DATA_DIR / '_states'
+
+    files_found = find_data_files(india_csv, india_change_csv, states_folder)
+    if not files_found:
+        print("✗ No data files found!")
+        return 1
+
+    print("\nFound files:")
+    for f in files_found:
+        print(f"  {f}")
+
+    print("\n" + "-" * 70)
+    print("STEP 2: Creating database schema...")
+    print("-" * 70)
+
+    DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    # Keep the existing database: raw tables are refreshed per source file below
+    conn = sqlite3.connect(DATABASE_PATH)
+    ensure_manifest(conn)
+    existing_tables = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    }
+    create_schema(conn)
+
+    print("\n" + "-" * 70)
+    print("STEP 3: Loading India.csv...")
+    print("-" * 70)
+    india_reloaded = load_india_table(conn, india_csv, existing_tables)
+
+    print("\n" + "-" * 70)
+    print("STEP 4: Loading state-wise data from _states folder...")
+    print("-" * 70)
+    states_reloaded = False
+    if states_folder.exists():
+        states_reloaded = load_states_table(conn, states_folder, existing_tables, args.sample)
+
+    print("\n" + "-" * 70)
+    print("STEP 5: Creating analysis-ready table...")
+    print("-" * 70)
+    create_health_metrics(conn, india_reloaded)
+    if india_reloaded or states_reloaded:
+        # Invalidates cached query results (query_cache.py)
+        bump_data_version(conn)
+
+    print("\n" + "-" * 70)
+    print("STEP 6: Database summary...")
+    print("-" * 70)
+    print_tables(conn)
+
+    conn.close()
+
+    print("\n" + "=" * 70)
+    print("DATA LOADING COMPLETED!")
+    print("=" * 70)
+
+    print("\n✅ Next steps:")
+    print("1. Explore data: python scripts/explore_database.py")
+    print("2. Run sample queries from sql/analysis_queries.sql")
+    print("3. Connect Power BI to the database")
+    print("4. Start building your dashboard!")
+    print("\n" + "=" * 70)
+    return 0
@@ -0,0 +1,125 @@
+"""
+Read-only connection pool for extracts
+Author: RK
+Description: Dashboards need many independent extracts at once. ReadPool
+             keeps up to `size` read-only connections (mode=ro URIs, which
+             can never write or take a write lock) and runs a batch of
+             queries on a thread pool, one connection per thread, timing
+             each query.
+
+SQLite releases the GIL while a statement runs, so queries on different
+connections run in parallel and a batch scales with cores until the
+pandas conversion dominates. The loader keeps the database in WAL mode, so
+these readers never block a load and a load never blocks them: a reader
+sees the last committed data until its query ends.
+
+Usage:
+    from nfhs.read_pool import ReadPool
+
+    with ReadPool(size=8) as pool:
+        results, timings = pool.run({
+            'states': "SELECT * FROM agg_region",
+            'top': ("SELECT * FROM vw_health_analysis WHERE state_name = ?", ['Kerala']),
+        })
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from .config import DATABASE_PATH
+
+
+def read_only_uri(db_path):
+    """file: URI that opens db_path read-only"""
+    return Path(db_path).resolve().as_uri() + '?mode=ro'
+
+
+class ReadPool:
+    """Up to `size` read-only connections, opened on first use and reused"""
+
+    def __init__(self, db_path=DATABASE_PATH, size=None):
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            raise FileNotFoundError(
+                f"Database not found: {self.db_path} - run `python -m nfhs load` first"
+            )
+        self.size = size or os.cpu_count() or 4
+        self._idle = queue.LifoQueue()   # most recently used first: its page cache is warm
+        self._opened = []
+        self._lock = threading.Lock()
+
+    def _borrow(self):
+        """An idle connection, a new one while under size, or wait for one"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._opened) < self.size:
+                # Used by whichever thread borrows it, one thread at a time
+                conn = sqlite3.connect(read_only_uri(self.db_path), uri=True,
+                                       check_same_thread=False)
+                self._opened.append(conn)
+                return conn
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of the block"""
+        conn = self._borrow()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def read_sql(self, sql, params=None, cache=None):
+        """pd.read_sql on a pooled connection (through a QueryCache if given)"""
+        with self.connection() as conn:
+            if cache is not None:
+                return cache.read_sql(sql, params, conn=conn)
+            return pd.read_sql(sql, conn, params=params)
+
+    def run(self, queries, workers=None, cache=None):
+        """Run independent queries concurrently.
+
+        queries maps a name to SQL or to (SQL, params). Returns
+        ({name: DataFrame}, timings), where timings has one row per query
+        (name, ms, rows) in the order given.
+        """
+        def timed_query(name):
+            entry = queries[name]
+            sql, params = entry if isinstance(entry, tuple) else (entry, None)
+            start = time.perf_counter()
+            df = self.read_sql(sql, params, cache)
+            return df, {'name': name, 'ms': (time.perf_counter() - start) * 1000,
+                        'rows': len(df)}
+
+        workers = min(workers or self.size, self.size, max(len(queries), 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            done = dict(zip(queries, executor.map(timed_query, queries)))
+        results = {name: df for name, (df, _) in done.items()}
+        timings = pd.DataFrame([timing for _, timing in done.values()],
+                               columns=['name', 'ms', 'rows'])
+        return results, timings
+
+    def close(self):
+        """Close every connection the pool opened"""
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened.clear()
+        self._idle = queue.LifoQueue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,306 @@
+"""
+Batch report runner
+Author: RK
+Description: Runs the declarative report specs in sql/report_specs.json and
+             writes one CSV/JSON file per report into a national pack, one
+             pack per state and one per region (data/processed/reports).
+
+A spec names a query template, its parameters, its output format(s) and
+whether it runs once, once per state or once per region:
+
+    {"name": "best_districts", "query": "best_districts", "for_each": "state",
+     "params": {"limit": 5, "min_indicators": 50}, "format": "csv"}
+
+A parameter given as {"search": [terms]} is bound to a JSON array of the
+matching indicator ids (indicator_search.py); add "column": "indicator_name"
+to search names only. Templates filter on it with
+indicator_id IN (SELECT value FROM json_each(:name)).
+
+Templates read the shared sources {state_indicator} and {district}. Each
+source is built once per batch into an indexed temp table, from the agg_*
+summary tables when present, else with one pass over the fact table. Every
+query then runs on one connection. Jobs that use the same template run back
+to back, so sqlite3 reuses the prepared statement. Identical queries (same
+SQL and bound values) run once. A thread pool writes the files while the
+next queries run, so 36 state packs cost little more than one.
+
+Run it through the CLI: python -m nfhs report --help
+"""
+
+import json
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .aggregates import DISTRICT_SELECT, STATE_INDICATOR_SELECT, aggregates_available
+from .config import DATABASE_PATH, REPORT_SPECS_PATH, REPORTS_DIR
+from .indicator_search import search_indicators
+from .lookups import resolve_state
+
+FOR_EACH = ['state', 'region']
+FORMATS = ['csv', 'json']
+
+# Parameters bound by the pack a report runs for
+PACK_PARAMS = {None: set(), 'state': {'state', 'region'}, 'region': {'region'}}
+
+# Shared sources: (query, its rows from the summary tables, from the fact table)
+SOURCES = {
+    'state_indicator': ('''
+        SELECT a.*, s.state_name, s.region, i.indicator_name, i.category
+        FROM {rows} a
+        LEFT JOIN dim_states s ON s.state_id = a.state_id
+        LEFT JOIN dim_indicators i ON i.indicator_id = a.indicator_id
+    ''', 'agg_state_indicator', f"({STATE_INDICATOR_SELECT} GROUP BY state_id, indicator_id)"),
+    'district': ('''
+        SELECT a.*, s.state_name, s.region, d.district_name
+        FROM {rows} a
+        JOIN dim_districts d ON d.district_id = a.district_id
+        LEFT JOIN dim_states s ON s.state_id = a.state_id
+    ''', 'agg_district', f"({DISTRICT_SELECT} GROUP BY district_id)"),
+}
+
+_SOURCE_PATTERN = re.compile(r'\{(\w+)\}')
+_PARAM_PATTERN = re.compile(r':(\w+)')
+
+
+class ReportSpec:
+    """One report: a query template, its parameters and output formats"""
+
+    def __init__(self, name, sql, params=None, for_each=None, formats=('csv',)):
+        self.name = name
+        self.sql = sql
+        self.params = dict(params or {})
+        self.for_each = for_each
+        self.formats = list(formats)
+        self.sources = sorted(set(_SOURCE_PATTERN.findall(sql)))
+        # dict.fromkeys keeps the order of first use
+        self.param_names = list(dict.fromkeys(_PARAM_PATTERN.findall(sql)))
+        self.validate()
+
+    def validate(self):
+        """Raise ValueError if the spec can't run"""
+        if self.for_each is not None and self.for_each not in FOR_EACH:
+            raise ValueError(f"report '{self.name}': for_each must be one of {FOR_EACH}")
+        for fmt in self.formats:
+            if fmt not in FORMATS:
+                raise ValueError(f"report '{self.name}': unknown format '{fmt}'")
+        for source in self.sources:
+            if source not in SOURCES:
+                raise ValueError(f"report '{self.name}': unknown source '{{{source}}}'")
+        unbound = set(self.param_names) - set(self.params) - PACK_PARAMS[self.for_each]
+        if unbound:
+            raise ValueError(f"report '{self.name}': no value for "
+                             + ', '.join(f":{name}" for name in sorted(unbound)))
+
+    @property
+    def pack(self):
+        return self.for_each or 'national'
+
+    @classmethod
+    def from_dict(cls, entry, queries):
+        """Build a spec from its JSON entry; 'query' names a shared template"""
+        name = entry['name']
+        sql = entry.get('sql') or queries.get(entry.get('query'))
+        if sql is None:
+            raise ValueError(f"report '{name}': needs 'sql' or a known 'query'")
+        if isinstance(sql, list):
+            sql = '\n'.join(sql)
+        formats = entry.get('format', 'csv')
+        return cls(name, sql, entry.get('params'), entry.get('for_each'),
+                   [formats] if isinstance(formats, str) else formats)
+
+
+def load_specs(path=REPORT_SPECS_PATH, names=None):
+    """Specs from a JSON file, optionally only the reports called `names`"""
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    specs = [ReportSpec.from_dict(entry, document.get('queries', {}))
+             for entry in document['reports']
+             if not names or entry['name'] in names]
+    if names and not specs:
+        raise ValueError(f"no report called {', '.join(names)} in {path}")
+    return specs
+
+
+def file_slug(name):
+    """'Jammu and Kashmir' -> 'Jammu_and_Kashmir'"""
+    return re.sub(r'\W+', '_', name).strip('_')
+
+
+def resolve_searches(conn, params, found=None):
+    """params with every {"search": [...]} value replaced by the JSON array of
+    matching indicator ids; `found` memoises searches across specs"""
+    found = {} if found is None else found
+    resolved = dict(params)
+    for name, value in params.items():
+        if isinstance(value, dict) and 'search' in value:
+            key = (tuple(value['search']), value.get('column'))
+            if key not in found:
+                found[key] = json.dumps(search_indicators(conn, value['search'],
+                                                          value.get('column')))
+            resolved[name] = found[key]
+    return resolved
+
+
+def expand_jobs(conn, specs, out_dir, states=None, packs=None):
+    """(spec, pack folder, params) for every report of every pack.
+
+    states limits the state packs (and region packs) to those state names;
+    packs limits the kinds of pack ('national', 'state', 'region').
+    """
+    state_rows = conn.execute(
+        "SELECT state_name, region FROM dim_states ORDER BY state_name").fetchall()
+    if states is not None:
+        state_rows = [row for row in state_rows if row[0] in states]
+    regions = sorted({region for _, region in state_rows if region})
+
+    targets = {
+        'national': [(out_dir / 'national', {})],
+        'state': [(out_dir / 'states' / file_slug(state), {'state': state, 'region': region})
+                  for state, region in state_rows],
+        'region': [(out_dir / 'regions' / file_slug(region), {'region': region})
+                   for region in regions],
+    }
+    jobs = []
+    found = {}
+    for spec in specs:
+        if packs and spec.pack not in packs:
+            continue
+        params = resolve_searches(conn, spec.params, found)
+        for folder, bound in targets[spec.pack]:
+            jobs.append((spec, folder, {**params, **bound}))
+    return jobs
+
+
+def materialise_sources(conn, names):
+    """Build each shared source once into an indexed temp table"""
+    from_summary = aggregates_available(conn)
+    for name in names:
+        sql, summary_rows, fact_rows = SOURCES[name]
+        table = f"report_{name}"
+        conn.execute(f"DROP TABLE IF EXISTS temp.{table}")
+        conn.execute(f"CREATE TEMP TABLE {table} AS "
+                     + sql.format(rows=summary_rows if from_summary else fact_rows))
+        for column in ['state_name', 'region']:
+            conn.execute(f"CREATE INDEX temp.idx_{table}_{column} ON {table}({column})")
+    return from_summary
+
+
+def drop_sources(conn, names):
+    """Remove the temp tables, leaving a shared connection as it was"""
+    for name in names:
+        conn.execute(f"DROP TABLE IF EXISTS temp.report_{name}")
+
+
+def bind_sources(sql):
+    """Point a template's {source} placeholders at the temp tables"""
+    return _SOURCE_PATTERN.sub(lambda match: f"temp.report_{match.group(1)}", sql)
+
+
+def read_query(conn, sql, params):
+    """Run one query into a DataFrame (cheaper than pd.read_sql for small results)"""
+    cursor = conn.execute(sql, params)
+    columns = [column[0] for column in cursor.description]
+    return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+
+def write_report(df, path, fmt):
+    """Write one report file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'json':
+        df.to_json(path, orient='records', indent=2)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def run_reports(conn, specs, out_dir=REPORTS_DIR, states=None, packs=None, workers=4):
+    """Run a batch of specs and write their files; returns counters and timings"""
+    timings = {}
+    start = time.perf_counter()
+    jobs = expand_jobs(conn, specs, Path(out_dir), states, packs)
+    sources = sorted({source for spec, _, _ in jobs for source in spec.sources})
+    from_summary = materialise_sources(conn, sources)
+    timings['sources'] = time.perf_counter() - start
+
+    results = {}
+    stats = {'jobs': len(jobs), 'queries': 0, 'reused': 0, 'files': 0,
+             'sources': sources, 'from_summary': from_summary}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            writes = []
+            start = time.perf_counter()
+            # Same template back to back: sqlite3 keeps its prepared statement
+            for spec, folder, params in sorted(jobs, key=lambda job: job[0].sql):
+                sql = bind_sources(spec.sql)
+                values = {name: params[name] for name in spec.param_names}
+                key = (sql, tuple(values.values()))
+                if key in results:
+                    stats['reused'] += 1
+                else:
+                    results[key] = read_query(conn, sql, values)
+                    stats['queries'] += 1
+                for fmt in spec.formats:
+                    writes.append(executor.submit(
+                        write_report, results[key], folder / f"{spec.name}.{fmt}", fmt))
+            timings['queries'] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for future in writes:
+                future.result()
+            stats['files'] = len(writes)
+            timings['writes'] = time.perf_counter() - start
+    finally:
+        drop_sources(conn, sources)
+
+    stats['timings'] = timings
+    return stats
+
+
+def main(args):
+    """Run the batch for parsed `nfhs report` arguments; returns an exit code"""
+    print("=" * 70)
+    print("INDIAN HEALTHCARE ANALYSIS - REPORT PACKS")
+    print("=" * 70)
+
+    db = Path(args.db or DATABASE_PATH)
+    specs_path = Path(args.specs or REPORT_SPECS_PATH)
+    out_dir = Path(args.out or REPORTS_DIR)
+
+    if not db.exists():
+        print(f"✗ Database not found: {db}")
+        print("  Run: python -m nfhs load")
+        return 1
+
+    try:
+        specs = load_specs(specs_path, args.report)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"✗ Invalid report specs ({specs_path}): {e}")
+        return 1
+
+    states = None
+    if args.state:
+        states = {resolve_state(name) or name for name in args.state}
+
+    conn = sqlite3.connect(db)
+    stats = run_reports(conn, specs, out_dir, states, args.pack, args.workers)
+    conn.close()
+
+    if not stats['jobs']:
+        print("✗ No reports to run (check --state / --pack)")
+        return 1
+
+    timings = stats['timings']
+    origin = "summary tables" if stats['from_summary'] else "one fact table pass"
+    print(f"\n✓ Sources {', '.join(stats['sources'])} built from {origin} "
+          f"({timings['sources']:.2f}s)")
+    print(f"✓ {stats['jobs']} reports from {len(specs)} specs: {stats['queries']} queries run, "
+          f"{stats['reused']} identical ones reused ({timings['queries']:.2f}s)")
+    print(f"✓ {stats['files']} files written with {args.workers} threads "
+          f"(+{timings['writes']:.2f}s after the last query)")
+    print(f"📂 Location: {out_dir}")
+    return 0
@@ -0,0 +1,177 @@
+"""
+Schema seeding loader for Indian Healthcare Analysis
+Author: RK
+Description: Creates the sql/schema.sql database and fills its state and
+             district dimensions from the State_wise CSV files
+Run it through the CLI: python -m nfhs seed --help
+"""
+
+import sqlite3
+
+import pandas as pd
+
+from .config import DATABASE_PATH, RAW_DATA_DIR, SQL_SCHEMA_PATH
+from .lookups import STATE_CODES, STATE_REGIONS
+from .manifest import bump_data_version
+from .normalise import canonical_state_names
+
+
+def create_database_schema():
+    """Create database and tables from schema.sql"""
+    print("Creating database schema...")
+
+    # Create database directory if it doesn't exist
+    DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(DATABASE_PATH)
+    cursor = conn.cursor()
+
+    # Read and execute schema SQL
+    with open(SQL_SCHEMA_PATH, 'r') as f:
+        schema_sql = f.read()
+        # Split by semicolon and execute each statement
+        for statement in schema_sql.split(';'):
+            if statement.strip():
+                try:
+                    cursor.execute(statement)
+                except sqlite3.Error as e:
+                    print(f"Warning: {e}")
+
+    conn.commit()
+    conn.close()
+    print("✓ Database schema created successfully!")
+
+
+def load_state_wise_data(csv_file='State_wise/State.csv'):
+    """Load state-wise aggregated data"""
+    print(f"\nLoading state-wise data from {csv_file}...")
+
+    file_path = RAW_DATA_DIR / csv_file
+
+    if not file_path.exists():
+        print(f"✗ File not found: {file_path}")
+        return None
+
+    df = pd.read_csv(file_path)
+
+    print(f"  Loaded {len(df)} records")
+    print(f"  Columns: {list(df.columns)}")
+
+    # Display first few rows
+    print("\nSample data:")
+    print(df.head())
+
+    return df
+
+
+def load_district_data(pattern='State_wise/*.csv'):
+    """Load all district-level CSV files"""
+    print(f"\nLoading district data from {pattern}...")
+
+    csv_files = sorted(RAW_DATA_DIR.glob(pattern))
+
+    if not csv_files:
+        print(f"✗ No CSV files found in {RAW_DATA_DIR / pattern}")
+        return None
+
+    print(f"  Found {len(csv_files)} CSV files")
+
+    all_districts = []
+
+    for csv_file in csv_files:
+        try:
+            df = pd.read_csv(csv_file)
+            all_districts.append(df)
+            print(f"  ✓ Loaded {csv_file.name}: {len(df)} records")
+        except Exception as e:
+            print(f"  ✗ Error loading {csv_file.name}: {e}")
+
+    if all_districts:
+        combined_df = pd.concat(all_districts, ignore_index=True)
+        print(f"\n✓ Total records loaded: {len(combined_df)}")
+        return combined_df
+
+    return None
+
+
+def process_and_insert_data(df, conn):
+    """Insert the states and districts of a frame into the schema.sql dimensions"""
+    print("\nProcessing data for database insertion...")
+
+    if 'State' not in df.columns:
+        print("✓ Data processing completed!")
+        return
+
+    # Resolve every spelling ('Jammu & Kashmir', ...) to the canonical name once
+    df = df.assign(State=canonical_state_names(df['State']))
+
+    states = df['State'].dropna().drop_duplicates()
+    print(f"  Found {len(states)} unique states/UTs")
+    # Only states with a known code are inserted
+    codes = states.map(STATE_CODES)
+    state_rows = pd.DataFrame({'state_code': codes, 'state_name': states,
+                               'region': codes.map(STATE_REGIONS)})[codes.notna()]
+    conn.executemany('''
+        INSERT OR IGNORE INTO dim_states (state_code, state_name, region)
+        VALUES (?, ?, ?)
+    ''', state_rows.itertuples(index=False, name=None))
+    conn.commit()
+    print(f"  ✓ Inserted {len(state_rows)} states")
+
+    if 'District' in df.columns:
+        districts = df[['State', 'District']].dropna().drop_duplicates()
+        print(f"  Found {len(districts)} unique districts")
+
+        # Generate district code (you may want to use actual census codes)
+        district_codes = districts['State'].map(STATE_CODES)
+        district_rows = pd.DataFrame({
+            'district_code': district_codes + '_' + districts['District'].astype(str).str.replace(' ', '_'),
+            'district_name': districts['District'],
+            'state_code': district_codes,
+        })[district_codes.notna()]
+        conn.executemany('''
+            INSERT OR IGNORE INTO dim_districts (district_code, district_name, state_code)
+            VALUES (?, ?, ?)
+        ''', district_rows.itertuples(index=False, name=None))
+        conn.commit()
+        print(f"  ✓ Inserted {len(district_rows)} districts")
+
+    print("✓ Data processing completed!")
+
+
+def main(args):
+    """Run the load for parsed `nfhs seed` arguments; returns an exit code"""
+    print("=" * 60)
+    print("INDIAN HEALTHCARE ANALYSIS - DATA LOADER")
+    print("=" * 60)
+
+    create_database_schema()
+
+    if not RAW_DATA_DIR.exists():
+        print(f"\n✗ Raw data directory not found: {RAW_DATA_DIR}")
+        print("\nPlease:")
+        print("1. Download NFHS-5 data from GitHub")
+        print("2. Place CSV files in: data/raw/nfhs5/")
+        print("3. Run this script again")
+        return 1
+
+    state_df = load_state_wise_data()
+    district_df = load_district_data()
+
+    if state_df is not None or district_df is not None:
+        conn = sqlite3.connect(DATABASE_PATH)
+
+        if state_df is not None:
+            process_and_insert_data(state_df, conn)
+
+        if district_df is not None:
+            process_and_insert_data(district_df, conn)
+
+        bump_data_version(conn)
+        conn.close()
+
+    print("\n" + "=" * 60)
+    print("DATA LOADING COMPLETED!")
+    print(f"Database location: {DATABASE_PATH}")
+    print("=" * 60)
+    return 0
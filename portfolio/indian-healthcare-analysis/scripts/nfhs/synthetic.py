@@ -0,0 +1,147 @@
+"""
+Synthetic NFHS-5 data generator
+Author: RK
+Description: Writes India.csv and _states/<State_Name>.csv with the column
+             layout of the real NFHS-5 files, so loads and queries can be
+             tested and benchmarked without the survey data.
+
+    India.csv            state-level rows: State, District, DISTRICT (the
+                         duplicate column of the real file), Indicator,
+                         Category, NFHS 5, NFHS 4
+    _states/<State>.csv  district-level rows without a State column; the
+                         loader takes the state from the file name
+
+Scale 1 is NFHS-5 size: 36 states/UTs, ~707 districts, 131 indicators
+(~97k rows). Scale 10 and 100 multiply the districts per state. The
+same scale and seed always give byte-identical files.
+
+Run it through the CLI: python -m nfhs generate --help
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .lookups import STATE_CODES
+
+# Districts per state/UT in NFHS-5 (approximate), keyed by state code
+DISTRICTS_PER_STATE = {
+    'AP': 13, 'AR': 20, 'AS': 33, 'BR': 38, 'CG': 27, 'GA': 2, 'GJ': 33,
+    'HR': 22, 'HP': 12, 'JH': 24, 'KA': 30, 'KL': 14, 'MP': 51, 'MH': 36,
+    'MN': 9, 'ML': 11, 'MZ': 8, 'NL': 11, 'OR': 30, 'PB': 20, 'RJ': 33,
+    'SK': 4, 'TN': 32, 'TG': 31, 'TR': 8, 'UP': 75, 'UK': 13, 'WB': 22,
+    'AN': 3, 'CH': 1, 'DD': 3, 'DL': 11, 'JK': 20, 'LA': 2, 'LD': 1, 'PY': 4,
+}
+
+INDICATOR_COUNT = 131
+
+# Indicators named in docs/data_dictionary.md; the rest are numbered per category
+NAMED_INDICATORS = [
+    ('Total fertility rate (children per woman)', 'Family Planning'),
+    ('Currently married women age 15-49 using modern contraceptive methods (%)', 'Family Planning'),
+    ('Unmet need for family planning (%)', 'Family Planning'),
+    ('Mothers who had an antenatal check-up in the first trimester (%)', 'Maternal Health'),
+    ('Mothers who had at least 4 antenatal care visits (%)', 'Maternal Health'),
+    ('Institutional births (%)', 'Maternal Health'),
+    ('Postnatal care within 2 days of delivery (%)', 'Maternal Health'),
+    ('C-section deliveries (%)', 'Maternal Health'),
+    ('Health insurance coverage (%)', 'Healthcare Access'),
+    ('Children age 12-23 months fully immunized (%)', 'Child Health'),
+    ('Infant mortality rate (per 1000 live births)', 'Child Health'),
+    ('Under-five mortality rate (U5MR) (per 1000)', 'Child Health'),
+    ('Stunting (height-for-age) (%)', 'Child Health'),
+    ('Wasting (weight-for-height) (%)', 'Child Health'),
+    ('Underweight (weight-for-age) (%)', 'Child Health'),
+    ('Early initiation of breastfeeding (%)', 'Nutrition'),
+    ('Exclusive breastfeeding for 6 months (%)', 'Nutrition'),
+    ('Children age 6-23 months receiving adequate diet (%)', 'Nutrition'),
+    ('Children age 6-59 months who are anaemic (%)', 'Nutrition'),
+    ('Non-pregnant women age 15-49 years who are anaemic (%)', 'Nutrition'),
+    ('Women age 15-49 years with high blood glucose (%)', 'Disease Prevalence'),
+    ('Women age 15-49 years who are overweight/obese (%)', 'Disease Prevalence'),
+    ('Men age 15-54 years with hypertension (%)', 'Disease Prevalence'),
+    ('Women age 15-49 years with hypertension (%)', 'Disease Prevalence'),
+]
+
+CATEGORIES = ['Maternal Health', 'Child Health', 'Nutrition', 'Healthcare Access',
+              'Disease Prevalence', 'Family Planning']
+
+# Share of rows without an NFHS-4 value (new indicators, new districts)
+NFHS4_MISSING = 0.15
+NFHS5_MISSING = 0.01
+
+
+def indicator_table():
+    """The 131 (indicator, category) pairs"""
+    indicators = list(NAMED_INDICATORS)
+    for i in range(len(indicators), INDICATOR_COUNT):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        indicators.append((f"{category} indicator {i + 1:03d} (%)", category))
+    return pd.DataFrame(indicators, columns=['Indicator', 'Category'])
+
+
+def _values(rng, rows):
+    """NFHS 5 / NFHS 4 columns: NFHS-4 within +-15 points of NFHS-5, some missing"""
+    nfhs5 = rng.uniform(0, 100, rows).round(1)
+    nfhs4 = (nfhs5 + rng.uniform(-15, 15, rows)).clip(0, 100).round(1)
+    nfhs5[rng.random(rows) < NFHS5_MISSING] = np.nan
+    nfhs4[rng.random(rows) < NFHS4_MISSING] = np.nan
+    return nfhs5, nfhs4
+
+
+def generate(out_dir, scale=1.0, seed=0):
+    """Write data/raw/nfhs5 under out_dir; returns (files written, rows written)"""
+    raw_dir = Path(out_dir) / 'data' / 'raw' / 'nfhs5'
+    states_dir = raw_dir / '_states'
+    states_dir.mkdir(parents=True, exist_ok=True)
+    for old in states_dir.glob('*.csv'):
+        old.unlink()
+
+    indicators = indicator_table()
+    names = {code: name for name, code in STATE_CODES.items()}
+    files, rows = 0, 0
+
+    for number, (code, base_count) in enumerate(sorted(DISTRICTS_PER_STATE.items())):
+        # One generator per state, so a state's file doesn't depend on the others
+        rng = np.random.default_rng([seed, number])
+        districts = max(1, round(base_count * scale))
+        district_names = [f"District {d:05d}" for d in range(1, districts + 1)]
+        nfhs5, nfhs4 = _values(rng, districts * len(indicators))
+        frame = pd.DataFrame({
+            'District': np.repeat(district_names, len(indicators)),
+            'Indicator': np.tile(indicators['Indicator'].to_numpy(), districts),
+            'Category': np.tile(indicators['Category'].to_numpy(), districts),
+            'NFHS 5': nfhs5,
+            'NFHS 4': nfhs4,
+        })
+        frame.to_csv(states_dir / f"{names[code].replace(' ', '_')}.csv", index=False)
+        files += 1
+        rows += len(frame)
+
+    rng = np.random.default_rng([seed, len(DISTRICTS_PER_STATE)])
+    state_names = [names[code] for code in sorted(DISTRICTS_PER_STATE)]
+    nfhs5, nfhs4 = _values(rng, len(state_names) * len(indicators))
+    india = pd.DataFrame({
+        'State': np.repeat(state_names, len(indicators)),
+        'District': '',
+        'DISTRICT': '',
+        'Indicator': np.tile(indicators['Indicator'].to_numpy(), len(state_names)),
+        'Category': np.tile(indicators['Category'].to_numpy(), len(state_names)),
+        'NFHS 5': nfhs5,
+        'NFHS 4': nfhs4,
+    })
+    india.to_csv(raw_dir / 'India.csv', index=False)
+    return files + 1, rows + len(india)
+
+
+def main(args):
+    """Generate a data set for parsed `nfhs generate` arguments; returns an exit code"""
+    print("=" * 70)
+    print("NFHS-5 SYNTHETIC DATA GENERATOR")
+    print("=" * 70)
+    files, rows = generate(args.out, args.scale, args.seed)
+    print(f"✓ Wrote {files} files, {rows:,} rows (scale {args.scale:g}, seed {args.seed})")
+    print(f"📂 Location: {Path(args.out) / 'data' / 'raw' / 'nfhs5'}")
+    print(f"\nLoad it with: NFHS_PROJECT_DIR={args.out} python -m nfhs load --full")
+    return 0
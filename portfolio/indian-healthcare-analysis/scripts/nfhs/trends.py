@@ -0,0 +1,308 @@
+"""
+Direction-aware NFHS-4 -> NFHS-5 trends
+Author: RK
+Description: A positive change is only an improvement for indicators where
+             higher is better. For stunting, anaemia or infant mortality a
+             fall is the improvement, and for C-sections or fertility the
+             aim is a target range. dim_indicator_direction records that
+             per indicator, and the loader uses it to compute typed trend
+             columns for the fact rows of every loaded file, with NumPy:
+
+    trend        1 improved, -1 declined, 0 no change, NULL without both values
+    improvement  change in the good direction (for a target range: how much
+                 closer to it the value moved)
+    pct_change   change as % of the NFHS-4 value (NULL when that is 0)
+
+change_z, the z-score of improvement among the rows of the same indicator,
+depends on every file, so it is not stored per row. agg_source_trend keeps
+each file's per-indicator count, sum and sum of squares of improvement;
+agg_indicator_trend turns them into a mean and standard deviation per
+indicator, and vw_health_analysis computes change_z from those at query
+time. Reloading one file rewrites its own rows and statistics only.
+
+Directions are seeded from the "Target/Good Value" column of
+docs/data_dictionary.md ('>90%' higher is better, '<20%' lower is better,
+'10-15%' or '2.1' a target). Indicators the dictionary doesn't list fall
+back to name keywords (anaemic, mortality, stunting, ... are lower is
+better) and otherwise to higher is better, the old change_value > 0 rule.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .config import DATA_DICTIONARY_PATH
+
+DIRECTION_TABLE = 'dim_indicator_direction'
+TREND_COLUMNS = ['trend', 'improvement', 'pct_change']
+
+SOURCE_STATS_TABLE = 'agg_source_trend'
+INDICATOR_STATS_TABLE = 'agg_indicator_trend'
+
+HIGHER_IS_BETTER, LOWER_IS_BETTER, TARGET_RANGE = 1, -1, 0
+
+DIRECTION_SCHEMA = f'''
+    CREATE TABLE IF NOT EXISTS {DIRECTION_TABLE} (
+        indicator_id INTEGER PRIMARY KEY REFERENCES dim_indicators(indicator_id),
+        direction INTEGER NOT NULL,    -- 1 higher is better, -1 lower is better, 0 target range
+        target_low REAL,
+        target_high REAL,
+        source TEXT NOT NULL           -- 'dictionary', 'keyword' or 'default'
+    )
+'''
+
+TREND_STATS_SCHEMA = f'''
+    CREATE TABLE IF NOT EXISTS {SOURCE_STATS_TABLE} (
+        source_id INTEGER NOT NULL,        -- etl_manifest entry of the file
+        indicator_id INTEGER,
+        compared INTEGER NOT NULL,         -- rows with an improvement
+        improvement_sum REAL,
+        improvement_sq_sum REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_source_trend ON {SOURCE_STATS_TABLE}(source_id);
+
+    CREATE TABLE IF NOT EXISTS {INDICATOR_STATS_TABLE} (
+        indicator_id INTEGER PRIMARY KEY,
+        compared INTEGER NOT NULL,
+        improvement_mean REAL,
+        improvement_std REAL               -- NULL with fewer than 2 rows or no spread
+    );
+'''
+
+SOURCE_STATS_SELECT = '''
+    SELECT source_id, indicator_id, COUNT(improvement), SUM(improvement),
+           SUM(improvement * improvement)
+    FROM {fact_table}
+    WHERE source_id IS NOT NULL{where}
+    GROUP BY source_id, indicator_id
+'''
+
+# Indicator names containing any of these are lower is better, unless the
+# data dictionary says otherwise
+LOWER_IS_BETTER_TERMS = [
+    'anaemic', 'anemic', 'stunting', 'stunted', 'wasting', 'wasted', 'underweight', 'mortality',
+    'unmet need', 'hypertension', 'blood pressure', 'blood glucose', 'blood sugar',
+    'overweight', 'obese', 'tobacco', 'alcohol', 'married before age 18',
+    'diarrhoea', 'diarrhea', 'acute respiratory',
+]
+
+# | 16 | Institutional births (%) | Deliveries in health facilities | >90% |
+_TABLE_ROW = re.compile(r'^\|\s*[\d-]+\s*\|\s*([^|]+?)\s*\|[^|]*\|\s*([^|]+?)\s*\|\s*$')
+_NUMBER = r'(\d+(?:\.\d+)?)'
+
+
+def parse_target(text):
+    """(direction, target_low, target_high) from a Target/Good Value cell, or None"""
+    text = text.strip().lower()
+    if match := re.match(rf'^([<>])\s*{_NUMBER}', text):
+        value = float(match.group(2))
+        if match.group(1) == '>':
+            return HIGHER_IS_BETTER, value, None
+        return LOWER_IS_BETTER, None, value
+    if match := re.match(rf'^{_NUMBER}\s*%?\s*[-–]\s*{_NUMBER}', text):
+        return TARGET_RANGE, float(match.group(1)), float(match.group(2))
+    if match := re.match(rf'^{_NUMBER}', text):
+        return TARGET_RANGE, float(match.group(1)), float(match.group(1))
+    if 'higher is better' in text:
+        return HIGHER_IS_BETTER, None, None
+    if 'lower is better' in text:
+        return LOWER_IS_BETTER, None, None
+    return None
+
+
+def _name_key(name):
+    return ' '.join(str(name).split()).casefold()
+
+
+def dictionary_targets(path=DATA_DICTIONARY_PATH):
+    """{normalised indicator name: (direction, low, high)} from the data dictionary"""
+    if not path.exists():
+        return {}
+    targets = {}
+    for line in path.read_text(encoding='utf-8').splitlines():
+        match = _TABLE_ROW.match(line.strip())
+        if match and (target := parse_target(match.group(2))) is not None:
+            targets[_name_key(match.group(1))] = target
+    return targets
+
+
+def direction_table(indicators, targets):
+    """dim_indicator_direction rows for an indicator_id/indicator_name frame"""
+    rows = []
+    for indicator_id, name in zip(indicators['indicator_id'], indicators['indicator_name']):
+        key = _name_key(name)
+        if key in targets:
+            rows.append((indicator_id, *targets[key], 'dictionary'))
+        elif any(term in key for term in LOWER_IS_BETTER_TERMS):
+            rows.append((indicator_id, LOWER_IS_BETTER, None, None, 'keyword'))
+        else:
+            rows.append((indicator_id, HIGHER_IS_BETTER, None, None, 'default'))
+    return pd.DataFrame(rows, columns=['indicator_id', 'direction', 'target_low',
+                                       'target_high', 'source'])
+
+
+def refresh_directions(conn, path=DATA_DICTIONARY_PATH):
+    """Rebuild dim_indicator_direction for every indicator.
+
+    Returns (rows by source, changed): changed is True when any existing
+    indicator's direction or target differs from before, i.e. when trends
+    of rows that were not reloaded have to be recomputed.
+    """
+    conn.execute(DIRECTION_SCHEMA)
+    before = pd.read_sql(f"SELECT * FROM {DIRECTION_TABLE}", conn).set_index('indicator_id')
+    indicators = pd.read_sql("SELECT indicator_id, indicator_name FROM dim_indicators", conn)
+    table = direction_table(indicators, dictionary_targets(path))
+
+    conn.execute(f"DELETE FROM {DIRECTION_TABLE}")
+    conn.executemany(f"INSERT INTO {DIRECTION_TABLE} VALUES (?, ?, ?, ?, ?)",
+                     table.itertuples(index=False, name=None))
+    conn.commit()
+
+    after = table.set_index('indicator_id')
+    common = before.index.intersection(after.index)
+    columns = ['direction', 'target_low', 'target_high']
+    changed = not before.loc[common, columns].astype(float).equals(
+        after.loc[common, columns].astype(float))
+    return table['source'].value_counts().to_dict(), changed
+
+
+def _distance_to_range(values, low, high):
+    """How far values lie outside [low, high]; a missing bound is open"""
+    below = np.where(np.isnan(low), 0.0, np.fmax(low - values, 0.0))
+    above = np.where(np.isnan(high), 0.0, np.fmax(values - high, 0.0))
+    return np.where(np.isnan(values), np.nan, below + above)
+
+
+def compute_trends(indicator_ids, nfhs5, nfhs4, change, directions):
+    """The trend columns for arrays of fact rows, as a dict of float arrays.
+
+    directions is the dim_indicator_direction frame. Rows of indicators it
+    doesn't have are treated as higher is better. NaN means NULL.
+    """
+    table = directions.set_index('indicator_id')
+    known = pd.Index(table.index).get_indexer(indicator_ids)
+    has_direction = known >= 0
+    direction = np.where(has_direction, table['direction'].to_numpy(float)[known],
+                         HIGHER_IS_BETTER)
+    low = np.where(has_direction, table['target_low'].to_numpy(float)[known], np.nan)
+    high = np.where(has_direction, table['target_high'].to_numpy(float)[known], np.nan)
+
+    # Rows loaded without a change value but with both values still compare
+    change = np.where(np.isnan(change), nfhs5 - nfhs4, change)
+    toward_range = (_distance_to_range(nfhs4, low, high)
+                    - _distance_to_range(nfhs5, low, high))
+    improvement = np.where(direction == TARGET_RANGE, toward_range, direction * change)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct_change = np.where(nfhs4 != 0, 100.0 * change / np.abs(nfhs4), np.nan)
+
+    return {
+        'trend': np.sign(improvement),
+        'improvement': improvement,
+        'pct_change': pct_change,
+    }
+
+
+def _source_filter(source_ids):
+    """' AND source_id IN (...)' for a list of source ids ('' for None)"""
+    if source_ids is None:
+        return ''
+    ids = ', '.join(str(int(source_id)) for source_id in source_ids) or 'NULL'
+    return f" AND source_id IN ({ids})"
+
+
+def refresh_trends(conn, source_ids=None, fact_table='fact_health_metrics'):
+    """Recompute the trend columns of the given sources' fact rows (every row
+    for None); returns the number of rows updated.
+
+    The columns only depend on the row and its indicator's direction, so
+    the rows are computed in one vectorised pass and only rows whose stored
+    values differ are written back.
+    """
+    directions = pd.read_sql(f"SELECT * FROM {DIRECTION_TABLE}", conn)
+    rows = conn.execute(f'''
+        SELECT metric_id, indicator_id, nfhs5_value, nfhs4_value, change_value,
+               {', '.join(TREND_COLUMNS)}
+        FROM {fact_table}
+        WHERE 1{_source_filter(source_ids)}
+    ''').fetchall()
+    if not rows:
+        return 0
+
+    # None becomes NaN; ids fit exactly in float64
+    data = np.array(rows, dtype=np.float64).reshape(len(rows), 5 + len(TREND_COLUMNS))
+    indicator_ids = np.nan_to_num(data[:, 1], nan=-1).astype(np.int64)
+    trends = compute_trends(indicator_ids, data[:, 2], data[:, 3], data[:, 4], directions)
+
+    # Changed where the value differs, or where exactly one of old/new is NULL
+    changed = np.zeros(len(rows), dtype=bool)
+    for position, column in enumerate(TREND_COLUMNS):
+        old, new = data[:, 5 + position], trends[column]
+        changed |= ~((old == new) | (np.isnan(old) & np.isnan(new)))
+    if not changed.any():
+        return 0
+
+    updates = pd.DataFrame({column: trends[column][changed] for column in TREND_COLUMNS})
+    updates['metric_id'] = data[changed, 0].astype(np.int64)
+    # SQLite stores NaN as NULL, and the INTEGER affinity of trend turns 1.0 into 1
+    conn.executemany(
+        f"UPDATE {fact_table} SET {', '.join(f'{c} = ?' for c in TREND_COLUMNS)} "
+        f"WHERE metric_id = ?",
+        updates.itertuples(index=False, name=None)
+    )
+    conn.commit()
+    return int(changed.sum())
+
+
+def ensure_trend_stats(conn):
+    """Create the trend statistics tables; True if they were missing"""
+    existing = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'")}
+    conn.executescript(TREND_STATS_SCHEMA)
+    return not {SOURCE_STATS_TABLE, INDICATOR_STATS_TABLE} <= existing
+
+
+def forget_trend_stats(conn, source_ids):
+    """Delete the trend statistics of the given sources"""
+    conn.executemany(f"DELETE FROM {SOURCE_STATS_TABLE} WHERE source_id = ?",
+                     [(source_id,) for source_id in source_ids])
+
+
+def refresh_trend_stats(conn, source_ids=None, fact_table='fact_health_metrics'):
+    """Recount the improvement statistics of the given sources (all for None)
+    and rebuild the per-indicator mean and standard deviation from the
+    per-source sums. Returns the number of indicators with statistics."""
+    if source_ids is None:
+        conn.execute(f"DELETE FROM {SOURCE_STATS_TABLE}")
+    else:
+        forget_trend_stats(conn, source_ids)
+    conn.execute(f"INSERT INTO {SOURCE_STATS_TABLE} "
+                 + SOURCE_STATS_SELECT.format(fact_table=fact_table,
+                                              where=_source_filter(source_ids)))
+
+    totals = pd.read_sql(f'''
+        SELECT indicator_id, SUM(compared) as compared, SUM(improvement_sum) as total,
+               SUM(improvement_sq_sum) as squares
+        FROM {SOURCE_STATS_TABLE}
+        WHERE indicator_id IS NOT NULL
+        GROUP BY indicator_id
+    ''', conn)
+    counts = totals['compared'].to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = totals['total'].to_numpy(dtype=np.float64) / counts
+        std = np.sqrt(np.fmax(totals['squares'].to_numpy(dtype=np.float64) / counts
+                              - mean * mean, 0.0))
+    # Indicators with fewer than two compared rows, or no spread, have no z-score
+    std[(counts < 2) | ~(std > 0)] = np.nan
+    mean[counts < 1] = np.nan
+
+    conn.execute(f"DELETE FROM {INDICATOR_STATS_TABLE}")
+    # SQLite stores NaN as NULL
+    conn.executemany(
+        f"INSERT INTO {INDICATOR_STATS_TABLE} VALUES (?, ?, ?, ?)",
+        zip(totals['indicator_id'].astype(int).tolist(), totals['compared'].astype(int).tolist(),
+            mean.tolist(), std.tolist())
+    )
+    conn.commit()
+    return len(totals)
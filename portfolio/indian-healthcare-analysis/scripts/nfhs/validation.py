@@ -0,0 +1,208 @@
+"""
+Data-quality checks run while loading
+Author: RK
+Description: Every normalised frame (or streamed chunk) is checked before it
+             is staged. Rows that fail a check go to etl_quarantine, with the
+             names of the checks they failed, instead of the fact table:
+
+    unknown_state    state name not in lookups.STATE_CODES (it would get the
+                     made-up code state[:2].upper() and region 'Other')
+    missing_key      no state or no indicator name
+    no_values        neither an NFHS-5 nor an NFHS-4 value
+    out_of_range     a value outside its indicator's range: 0-100 for
+                     percentages, not negative otherwise
+    duplicate_key    (state, district, indicator) already loaded; only the
+                     first row of a key that passes the other checks is
+                     loaded
+
+The checks are column operations on the whole chunk. Text columns are
+factorised first, so state lookups, indicator bounds and key hashes are
+computed once per distinct value, and keys are compared as 64-bit hashes.
+On the scale-1 sample checking takes about 0.3s of a 3-4s load, roughly 7%
+of the load and 15% of its ingest stages. Quarantined rows belong to their
+file's etl_manifest entry and are replaced when the file is reloaded.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from .lookups import STATE_CODES
+
+QUARANTINE_TABLE = 'etl_quarantine'
+
+CHECKS = ['unknown_state', 'missing_key', 'no_values', 'out_of_range', 'duplicate_key']
+
+KEY_COLUMNS = ['state_name', 'district_name', 'indicator']
+VALUE_COLUMNS = ['nfhs5_value', 'nfhs4_value']
+
+# Mixes the per-column hashes of a key into one (a large odd multiplier)
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+QUARANTINE_COLUMNS = ['source_id', 'state_name', 'district_name', 'indicator', 'category',
+                      'nfhs5_value', 'nfhs4_value', 'reasons']
+
+QUARANTINE_SCHEMA = f'''
+    CREATE TABLE IF NOT EXISTS {QUARANTINE_TABLE} (
+        quarantine_id INTEGER PRIMARY KEY,
+        source_id INTEGER NOT NULL,     -- etl_manifest entry of the file
+        state_name TEXT,
+        district_name TEXT,
+        indicator TEXT,
+        category TEXT,
+        nfhs5_value REAL,
+        nfhs4_value REAL,
+        reasons TEXT NOT NULL           -- failed checks, comma separated
+    );
+    CREATE INDEX IF NOT EXISTS idx_quarantine_source ON {QUARANTINE_TABLE}(source_id);
+'''
+
+
+def ensure_quarantine(conn):
+    """Create the quarantine table if it doesn't exist"""
+    conn.executescript(QUARANTINE_SCHEMA)
+
+
+def write_quarantine(conn, failed, source_id):
+    """Append a file's failed rows (with their 'reasons') to the quarantine table"""
+    failed = failed.assign(source_id=source_id).reindex(columns=QUARANTINE_COLUMNS)
+    conn.executemany(
+        f"INSERT INTO {QUARANTINE_TABLE} ({', '.join(QUARANTINE_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(QUARANTINE_COLUMNS))})",
+        failed.itertuples(index=False, name=None)
+    )
+
+
+def forget_quarantined(conn, source_ids):
+    """Delete the quarantined rows of the given sources"""
+    conn.executemany(f"DELETE FROM {QUARANTINE_TABLE} WHERE source_id = ?",
+                     [(source_id,) for source_id in source_ids])
+
+
+def indicator_bounds(name):
+    """(low, high) range of valid values for an indicator name"""
+    if '%' in name:
+        return 0.0, 100.0
+    return 0.0, np.inf
+
+
+class Validator:
+    """Checks the frames of one load and counts what failed.
+
+    Keys of every checked row are remembered, so duplicates are found
+    across chunks and files. Rows already in the database from files that
+    are not reloaded are not compared against.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.rows = 0
+        self.quarantined = 0
+        self.failures = dict.fromkeys(CHECKS, 0)
+        self.seconds = 0.0
+        self._seen = np.empty(0, dtype=np.uint64)   # sorted key hashes
+        self._bounds = {}                           # indicator name -> (low, high)
+
+    def _indicator_bounds(self, codes, names):
+        """Arrays of the low and high bound of every row (NaN without an indicator)"""
+        bounds = np.full((len(names) + 1, 2), np.nan)   # the last row is for code -1
+        for position, name in enumerate(names):
+            if name not in self._bounds:
+                self._bounds[name] = indicator_bounds(name)
+            bounds[position] = self._bounds[name]
+        return bounds[codes, 0], bounds[codes, 1]
+
+    @staticmethod
+    def _key_hashes(factorised):
+        """One 64-bit hash per row of the (codes, uniques) of the key columns"""
+        combined = np.zeros(len(factorised[0][0]), dtype=np.uint64)
+        for codes, uniques in factorised:
+            # Hash each distinct value once; missing (code -1) hashes as None
+            hashes = pd.util.hash_array(np.append(np.asarray(uniques, dtype=object), None))
+            combined = combined * _HASH_MULTIPLIER ^ hashes[codes]
+        return combined
+
+    def _duplicates(self, hashes, valid):
+        """Rows whose key was loaded before, in this frame or an earlier one.
+
+        Only valid rows (passing the other checks) are loaded, so only they
+        claim a key: a failed first row doesn't block a later valid one.
+        """
+        position = np.searchsorted(self._seen, hashes)
+        earlier = np.zeros(len(hashes), dtype=bool)
+        if len(self._seen):
+            earlier = self._seen[np.minimum(position, len(self._seen) - 1)] == hashes
+
+        # First valid row of every new key in this frame; later rows repeat it
+        candidates = np.flatnonzero(valid & ~earlier)
+        new, first = np.unique(hashes[candidates], return_index=True)
+        repeated = np.zeros(len(hashes), dtype=bool)
+        if len(new):
+            match = np.minimum(np.searchsorted(new, hashes), len(new) - 1)
+            repeated = (new[match] == hashes) & (np.arange(len(hashes)) > candidates[first][match])
+
+        # Two sorted runs: a stable sort (timsort) merges them in linear time
+        self._seen = np.concatenate([self._seen, new])
+        self._seen.sort(kind='stable')
+        return earlier | repeated
+
+    def split(self, df):
+        """(rows that pass, rows that fail with a 'reasons' column) of a normalised frame"""
+        if not self.enabled or df.empty:
+            return df, df.iloc[:0].assign(reasons=pd.Series(dtype=object))
+        start = time.perf_counter()
+
+        frame = df.reindex(columns=KEY_COLUMNS + VALUE_COLUMNS)
+        factorised = [pd.factorize(frame[column]) for column in KEY_COLUMNS]
+        (states, state_names), _, (indicators, indicator_names) = factorised
+        known_state = np.append(pd.Index(state_names).isin(list(STATE_CODES)), True)
+
+        values = frame[VALUE_COLUMNS].to_numpy(dtype=np.float64)
+        low, high = self._indicator_bounds(indicators, indicator_names)
+        # NaN compares False, so missing values and bounds never fail the range check
+        outside = (values < low[:, None]) | (values > high[:, None])
+
+        failed = np.column_stack([
+            ~known_state[states],
+            (states < 0) | (indicators < 0),
+            np.isnan(values).all(axis=1),
+            outside.any(axis=1),
+        ])
+        duplicate = self._duplicates(self._key_hashes(factorised), ~failed.any(axis=1))
+        failed = np.column_stack([failed, duplicate])
+        bad = failed.any(axis=1)
+
+        self.rows += len(df)
+        self.quarantined += int(bad.sum())
+        for check, count in zip(CHECKS, failed.sum(axis=0)):
+            self.failures[check] += int(count)
+
+        if not bad.any():
+            self.seconds += time.perf_counter() - start
+            return df, df.iloc[:0].assign(reasons=pd.Series(dtype=object))
+
+        # Each failing row's checks as a bit pattern, turned into text once per pattern
+        patterns = failed[bad] @ (1 << np.arange(len(CHECKS)))
+        names = {pattern: ','.join(check for bit, check in enumerate(CHECKS) if pattern >> bit & 1)
+                 for pattern in np.unique(patterns)}
+        quarantined = df[bad].assign(reasons=pd.Series(patterns).map(names).to_numpy())
+        self.seconds += time.perf_counter() - start
+        return df[~bad], quarantined
+
+    def summary(self):
+        """Counters as a dict, for the load statistics"""
+        return {'enabled': self.enabled, 'rows_checked': self.rows,
+                'quarantined': self.quarantined, 'failures': dict(self.failures),
+                'seconds': round(self.seconds, 4)}
+
+    def print_summary(self):
+        """Print how many rows were checked and quarantined, by check"""
+        if not self.enabled:
+            print("Validation: off (--no-validate)")
+            return
+        print(f"✓ Validated {self.rows:,} rows in {self.seconds:.2f}s: "
+              f"{self.quarantined:,} quarantined to {QUARANTINE_TABLE}")
+        for check, count in self.failures.items():
+            if count:
+                print(f"  • {check}: {count:,}")
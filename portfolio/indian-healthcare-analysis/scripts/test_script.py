@@ -1,37 +1,45 @@
-import sqlite3
-import pandas as pd
+from nfhs.query_cache import QueryCache
+from nfhs.read_pool import ReadPool
 
-conn = sqlite3.connect('data/database/healthcare_india.db')
+QUERIES = {
+    # 1. Check tables
+    'tables': "SELECT name FROM sqlite_master WHERE type='table'",
+    # 2. Sample your data
+    'sample': "SELECT * FROM vw_health_analysis LIMIT 10",
+    # 3. Top indicators
+    'indicators': """
+        SELECT indicator, COUNT(*) as count 
+        FROM vw_health_analysis 
+        GROUP BY indicator 
+        ORDER BY count DESC 
+        LIMIT 10
+    """,
+    # 4. States covered
+    'states': """
+        SELECT state_name, region, COUNT(*) as data_points
+        FROM vw_health_analysis
+        GROUP BY state_name, region
+        ORDER BY data_points DESC
+    """,
+}
 
-# 1. Check tables
-print("📊 AVAILABLE TABLES:")
-tables = pd.read_sql("SELECT name FROM sqlite_master WHERE type='table'", conn)
-print(tables)
+HEADINGS = {
+    'tables': "📊 AVAILABLE TABLES:",
+    'sample': "\n🔍 SAMPLE DATA:",
+    'indicators': "\n📈 TOP HEALTH INDICATORS:",
+    'states': "\n🗺️ STATES COVERED:",
+}
 
-# 2. Sample your data
-print("\n🔍 SAMPLE DATA:")
-sample = pd.read_sql("SELECT * FROM vw_health_analysis LIMIT 10", conn)
-print(sample)
+# The four queries are independent, so they run concurrently on read-only
+# connections to the loader's database (nfhs.config.DATABASE_PATH)
+cache = QueryCache.open()
+with ReadPool(size=len(QUERIES)) as pool:
+    results, timings = pool.run(QUERIES, cache=cache)
+cache.conn.close()
 
-# 3. Top indicators
-print("\n📈 TOP HEALTH INDICATORS:")
-indicators = pd.read_sql("""
-    SELECT indicator, COUNT(*) as count 
-    FROM vw_health_analysis 
-    GROUP BY indicator 
-    ORDER BY count DESC 
-    LIMIT 10
-""", conn)
-print(indicators)
+for name, heading in HEADINGS.items():
+    print(heading)
+    print(results[name])
 
-# 4. States covered
-print("\n🗺️ STATES COVERED:")
-states = pd.read_sql("""
-    SELECT state_name, region, COUNT(*) as data_points
-    FROM vw_health_analysis
-    GROUP BY state_name, region
-    ORDER BY data_points DESC
-""", conn)
-print(states)
-
-conn.close()
\ No newline at end of file
+print("\n⏱️ QUERY TIMES:")
+print(timings.to_string(index=False, float_format='{:.1f}'.format))
@@ -3,19 +3,39 @@ Fiscal Federalism Analysis: State Tax Contributions vs Devolutions
 Data Source: Ministry of Finance, Rajya Sabha Unstarred Question 236 (Dec 2, 2025)
 Period: FY 2020-21 to FY 2024-25
 Author: RK Jat (@rkjat65)
-"""
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.patches import Rectangle
-import warnings
-warnings.filterwarnings('ignore')
+Importing this module does no work: the merged DataFrame is built on first
+access and cached, and matplotlib, seaborn and squarify are only imported
+when a chart is drawn. The old module attributes still work and are built
+on first use:
+
+    from fiscal_federalism_analysis import df, df_sorted
+    from fiscal_federalism_analysis import get_data, get_summary
+
+The figures are held in a FiscalStore (fiscal_store.py), which can also
+load year-by-year and per-tax-head datasets: get_store('data/annual.csv').
+
+Usage:
+    python fiscal_federalism_analysis.py                # summary, charts and CSV export
+    python fiscal_federalism_analysis.py --no-charts    # summary and CSV export only
+    python fiscal_federalism_analysis.py --preset web --preset social --workers 4
 
-# Set style for professional visualizations
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+Charts are rendered by render_charts(): each one in a fresh worker process
+on the Agg backend, saved in every requested format and DPI, then closed,
+so regenerating the set scales with cores and memory doesn't build up.
+
+Output goes to --out, $FISCAL_OUTPUT_DIR or outputs/ next to this script.
+Renders are cached by a hash of the chart's data columns, the plot style
+and its drawing code, so only charts whose inputs changed are redrawn;
+renders no output file uses any more are deleted.
+"""
+
+import json
+import os
+import shutil
+import time
+from functools import lru_cache
+from pathlib import Path
 
 # ==============================================================================
 # DATA PREPARATION
@@ -77,101 +97,198 @@ devolution_data = {
     ]
 }
 
-# Create DataFrames
-df_tax = pd.DataFrame(tax_collection_data)
-df_devolution = pd.DataFrame(devolution_data)
+# Both annexures cover the five fiscal years as one period
+PERIOD = '2020-25'
+
+WATERMARK = '@rkjat65 | Source: Ministry of Finance, Rajya Sabha'
+PLOT_STYLE = {'style': 'seaborn-v0_8-darkgrid', 'palette': 'husl'}
+
+
+@lru_cache(maxsize=None)
+def get_store(*paths):
+    """FiscalStore of the two annexures, plus any dataset files given (cached).
+
+    The files can add years and tax heads, or override the annexure figures.
+    """
+    import pandas as pd
+    from fiscal_store import FiscalStore, read_dataset
+
+    frames = [pd.DataFrame(tax_collection_data).assign(Year=PERIOD),
+              pd.DataFrame(devolution_data).assign(Year=PERIOD)]
+    frames += [read_dataset(path) for path in paths]
+    return FiscalStore.from_frames(frames, ['Annexure A', 'Annexure B', *map(str, paths)])
+
+
+@lru_cache(maxsize=None)
+def get_data():
+    """Tax collection and devolution data with the derived metrics, for PERIOD.
+
+    Built on first call and cached; treat the returned frame as read-only.
+    """
+    from fiscal_analytics import classify
+
+    # The store computes Net_Difference_PP, Net_Difference_Absolute,
+    # Devolution_Ratio and Multiplier
+    df = get_store().frame(PERIOD)
+
+    # Classify states
+    df['Classification'] = classify(df['Net_Difference_PP'])
+    return df
+
+
+@lru_cache(maxsize=None)
+def get_ranking(column='Net_Difference_PP'):
+    """Ranking of the states by a column, largest first (cached)"""
+    from fiscal_analytics import Ranking
+    return Ranking(get_data()[column])
+
+
+@lru_cache(maxsize=None)
+def get_sorted():
+    """States sorted by net difference, largest contributor first (cached)"""
+    return get_data().iloc[get_ranking().order]
+
+
+@lru_cache(maxsize=None)
+def get_summary():
+    """Totals, classification and extreme cases as a dict (cached)"""
+    from fiscal_analytics import classification_codes
+    df = get_data()
+    ranking = get_ranking()
+    codes = classification_codes(df['Net_Difference_PP'])
+    columns = ['State', 'Tax_Collection_Percent', 'Devolution_Percent', 'Net_Difference_PP']
+    total_tax = df['Tax_Collection_Lakh_Crore'].sum()
+    total_devolution = df['Devolution_Lakh_Crore'].sum()
+    return {
+        'total_tax': total_tax,
+        'total_devolution': total_devolution,
+        'devolution_rate': total_devolution / total_tax * 100,
+        'contributors': df[codes == 0],
+        'beneficiaries': df[codes == 1],
+        'neutral': df[codes == 2],
+        'top_contributors': df.iloc[ranking.top(5)][columns],
+        'top_beneficiaries': df.iloc[ranking.bottom(5)][columns],
+        'max_contributor': df.iloc[ranking.top(1)[0]],
+        'max_beneficiary': df.iloc[ranking.bottom(1)[0]],
+    }
 
-# Merge datasets
-df = pd.merge(df_tax, df_devolution, on='State')
 
-# Calculate key metrics
-df['Net_Difference_PP'] = df['Tax_Collection_Percent'] - df['Devolution_Percent']
-df['Net_Difference_Absolute'] = df['Tax_Collection_Lakh_Crore'] - df['Devolution_Lakh_Crore']
-df['Devolution_Ratio'] = df['Devolution_Lakh_Crore'] / df['Tax_Collection_Lakh_Crore']
-df['Multiplier'] = df['Devolution_Percent'] / df['Tax_Collection_Percent']
+# Old module-level names, built on first access (PEP 562) instead of at import
+_LAZY_ATTRIBUTES = {
+    'df': get_data,
+    'df_sorted': get_sorted,
+    'df_tax': lambda: get_data()[['State', 'Tax_Collection_Lakh_Crore',
+                                  'Tax_Collection_Percent']],
+    'df_devolution': lambda: get_data()[['State', 'Devolution_Lakh_Crore',
+                                         'Devolution_Percent']],
+    **{name: (lambda name=name: get_summary()[name])
+       for name in ['contributors', 'beneficiaries', 'neutral', 'top_contributors',
+                    'top_beneficiaries', 'max_contributor', 'max_beneficiary']},
+}
+
 
-# Classify states
-df['Classification'] = df['Net_Difference_PP'].apply(
-    lambda x: 'Net Contributor' if x > 0 else 'Net Beneficiary'
-)
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = _LAZY_ATTRIBUTES[name]()
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Sort by net difference for better visualization
-df_sorted = df.sort_values('Net_Difference_PP', ascending=False)
 
 # ==============================================================================
 # STATISTICAL SUMMARY
 # ==============================================================================
 
-print("="*80)
-print("FISCAL FEDERALISM ANALYSIS: STATE TAX CONTRIBUTIONS VS DEVOLUTIONS")
-print("Period: FY 2020-21 to FY 2024-25")
-print("="*80)
-print()
-
-print("OVERALL STATISTICS")
-print("-"*80)
-print(f"Total Tax Collection: ₹{df['Tax_Collection_Lakh_Crore'].sum():.2f} lakh crore")
-print(f"Total Devolution: ₹{df['Devolution_Lakh_Crore'].sum():.2f} lakh crore")
-print(f"Devolution as % of Collection: {(df['Devolution_Lakh_Crore'].sum()/df['Tax_Collection_Lakh_Crore'].sum()*100):.2f}%")
-print()
-
-print("STATE CLASSIFICATION")
-print("-"*80)
-contributors = df[df['Net_Difference_PP'] > 0]
-beneficiaries = df[df['Net_Difference_PP'] < 0]
-neutral = df[df['Net_Difference_PP'] == 0]
-
-print(f"Net Contributors: {len(contributors)} states")
-print(f"Net Beneficiaries: {len(beneficiaries)} states")
-print(f"Neutral: {len(neutral)} states")
-print()
-
-print("TOP 5 NET CONTRIBUTORS (by percentage point difference)")
-print("-"*80)
-top_contributors = df_sorted.head(5)[['State', 'Tax_Collection_Percent', 
-                                       'Devolution_Percent', 'Net_Difference_PP']]
-print(top_contributors.to_string(index=False))
-print()
-
-print("TOP 5 NET BENEFICIARIES (by percentage point difference)")
-print("-"*80)
-top_beneficiaries = df_sorted.tail(5)[['State', 'Tax_Collection_Percent', 
-                                        'Devolution_Percent', 'Net_Difference_PP']]
-print(top_beneficiaries.to_string(index=False))
-print()
-
-print("EXTREME CASES")
-print("-"*80)
-max_contributor = df_sorted.iloc[0]
-max_beneficiary = df_sorted.iloc[-1]
-
-print(f"Largest Contributor: {max_contributor['State']}")
-print(f"  Tax Share: {max_contributor['Tax_Collection_Percent']:.2f}%")
-print(f"  Devolution Share: {max_contributor['Devolution_Percent']:.2f}%")
-print(f"  Net Difference: +{max_contributor['Net_Difference_PP']:.2f} pp")
-print(f"  Multiplier: {max_contributor['Multiplier']:.2f}x")
-print()
-
-print(f"Largest Beneficiary: {max_beneficiary['State']}")
-print(f"  Tax Share: {max_beneficiary['Tax_Collection_Percent']:.2f}%")
-print(f"  Devolution Share: {max_beneficiary['Devolution_Percent']:.2f}%")
-print(f"  Net Difference: {max_beneficiary['Net_Difference_PP']:.2f} pp")
-print(f"  Multiplier: {max_beneficiary['Multiplier']:.2f}x")
-print()
+def print_summary():
+    """Print the overall statistics, classification and extreme cases"""
+    stats = get_summary()
+
+    print("="*80)
+    print("FISCAL FEDERALISM ANALYSIS: STATE TAX CONTRIBUTIONS VS DEVOLUTIONS")
+    print("Period: FY 2020-21 to FY 2024-25")
+    print("="*80)
+    print()
+
+    print("OVERALL STATISTICS")
+    print("-"*80)
+    print(f"Total Tax Collection: ₹{stats['total_tax']:.2f} lakh crore")
+    print(f"Total Devolution: ₹{stats['total_devolution']:.2f} lakh crore")
+    print(f"Devolution as % of Collection: {stats['devolution_rate']:.2f}%")
+    print()
+
+    print("STATE CLASSIFICATION")
+    print("-"*80)
+    print(f"Net Contributors: {len(stats['contributors'])} states")
+    print(f"Net Beneficiaries: {len(stats['beneficiaries'])} states")
+    print(f"Neutral: {len(stats['neutral'])} states")
+    print()
+
+    print("TOP 5 NET CONTRIBUTORS (by percentage point difference)")
+    print("-"*80)
+    print(stats['top_contributors'].to_string(index=False))
+    print()
+
+    print("TOP 5 NET BENEFICIARIES (by percentage point difference)")
+    print("-"*80)
+    print(stats['top_beneficiaries'].to_string(index=False))
+    print()
+
+    print("EXTREME CASES")
+    print("-"*80)
+    max_contributor = stats['max_contributor']
+    max_beneficiary = stats['max_beneficiary']
+
+    print(f"Largest Contributor: {max_contributor['State']}")
+    print(f"  Tax Share: {max_contributor['Tax_Collection_Percent']:.2f}%")
+    print(f"  Devolution Share: {max_contributor['Devolution_Percent']:.2f}%")
+    print(f"  Net Difference: +{max_contributor['Net_Difference_PP']:.2f} pp")
+    print(f"  Multiplier: {max_contributor['Multiplier']:.2f}x")
+    print()
+
+    print(f"Largest Beneficiary: {max_beneficiary['State']}")
+    print(f"  Tax Share: {max_beneficiary['Tax_Collection_Percent']:.2f}%")
+    print(f"  Devolution Share: {max_beneficiary['Devolution_Percent']:.2f}%")
+    print(f"  Net Difference: {max_beneficiary['Net_Difference_PP']:.2f} pp")
+    print(f"  Multiplier: {max_beneficiary['Multiplier']:.2f}x")
+    print()
+
+
+# ==============================================================================
+# PLOTTING SETUP
+# ==============================================================================
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    """matplotlib.pyplot, imported and styled on the first chart"""
+    import warnings
+
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    warnings.filterwarnings('ignore')
+
+    # Set style for professional visualizations
+    plt.style.use(PLOT_STYLE['style'])
+    sns.set_palette(PLOT_STYLE['palette'])
+    return plt
+
 
 # ==============================================================================
 # VISUALIZATION 1: DIVERGING BAR CHART
 # ==============================================================================
 
-def create_diverging_bar_chart():
+def draw_diverging_bar_chart():
     """Create professional diverging bar chart showing net contributors vs beneficiaries"""
+    from fiscal_analytics import BENEFICIARY_COLOUR, CONTRIBUTOR_COLOUR, colours
+    plt = _pyplot()
+    df_sorted = get_sorted()
     
     fig, ax = plt.subplots(figsize=(14, 12))
     
     # Prepare data
     states = df_sorted['State'].values
     differences = df_sorted['Net_Difference_PP'].values
-    colors = ['#d62728' if x > 0 else '#2ca02c' for x in differences]
+    colors = colours(differences)
     
     # Create bars
     bars = ax.barh(states, differences, color=colors, alpha=0.8, edgecolor='black', linewidth=0.5)
@@ -197,8 +314,10 @@ def create_diverging_bar_chart():
     # Add legend
     from matplotlib.patches import Patch
     legend_elements = [
-        Patch(facecolor='#d62728', alpha=0.8, label='Net Contributor (Contributes > Receives)'),
-        Patch(facecolor='#2ca02c', alpha=0.8, label='Net Beneficiary (Receives > Contributes)')
+        Patch(facecolor=CONTRIBUTOR_COLOUR, alpha=0.8,
+              label='Net Contributor (Contributes > Receives)'),
+        Patch(facecolor=BENEFICIARY_COLOUR, alpha=0.8,
+              label='Net Beneficiary (Receives > Contributes)')
     ]
     ax.legend(handles=legend_elements, loc='lower right', fontsize=10)
     
@@ -207,21 +326,20 @@ def create_diverging_bar_chart():
     ax.set_axisbelow(True)
     
     # Add watermark
-    fig.text(0.99, 0.01, '@rkjat65 | Source: Ministry of Finance, Rajya Sabha', 
+    fig.text(0.99, 0.01, WATERMARK, 
              ha='right', va='bottom', fontsize=8, alpha=0.6, style='italic')
     
     plt.tight_layout()
-    plt.savefig('/mnt/user-data/outputs/chart1_diverging_bar.png', dpi=300, bbox_inches='tight')
-    print("✓ Chart 1 saved: chart1_diverging_bar.png")
-    
     return fig
 
 # ==============================================================================
 # VISUALIZATION 2: SCATTER PLOT WITH EQUITY LINE
 # ==============================================================================
 
-def create_scatter_plot():
+def draw_scatter_plot():
     """Create scatter plot showing relationship between contribution and devolution"""
+    plt = _pyplot()
+    df = get_data()
     
     fig, ax = plt.subplots(figsize=(14, 10))
     
@@ -280,25 +398,25 @@ def create_scatter_plot():
     ax.set_axisbelow(True)
     
     # Add watermark
-    fig.text(0.99, 0.01, '@rkjat65 | Source: Ministry of Finance, Rajya Sabha', 
+    fig.text(0.99, 0.01, WATERMARK, 
              ha='right', va='bottom', fontsize=8, alpha=0.6, style='italic')
     
     plt.tight_layout()
-    plt.savefig('/mnt/user-data/outputs/chart2_scatter_plot.png', dpi=300, bbox_inches='tight')
-    print("✓ Chart 2 saved: chart2_scatter_plot.png")
-    
     return fig
 
 # ==============================================================================
 # VISUALIZATION 3: STACKED BAR COMPARISON
 # ==============================================================================
 
-def create_stacked_comparison():
+def draw_stacked_comparison():
     """Create stacked bar comparison for top states"""
+    import numpy as np
+    plt = _pyplot()
+    df = get_data()
     
-    # Select top 10 by absolute collection
-    top_10 = df.nlargest(10, 'Tax_Collection_Lakh_Crore').copy()
-    top_10 = top_10.sort_values('Tax_Collection_Percent', ascending=True)
+    # Select top 10 by absolute collection, smallest tax share first
+    top_10 = df.iloc[get_ranking('Tax_Collection_Lakh_Crore').top(10)]
+    top_10 = top_10.iloc[np.argsort(top_10['Tax_Collection_Percent'].to_numpy(), kind='stable')]
     
     fig, ax = plt.subplots(figsize=(14, 8))
     
@@ -329,33 +447,34 @@ def create_stacked_comparison():
     ax.set_axisbelow(True)
     
     # Add watermark
-    fig.text(0.99, 0.01, '@rkjat65 | Source: Ministry of Finance, Rajya Sabha', 
+    fig.text(0.99, 0.01, WATERMARK, 
              ha='right', va='bottom', fontsize=8, alpha=0.6, style='italic')
     
     plt.tight_layout()
-    plt.savefig('/mnt/user-data/outputs/chart3_stacked_comparison.png', dpi=300, bbox_inches='tight')
-    print("✓ Chart 3 saved: chart3_stacked_comparison.png")
-    
     return fig
 
 # ==============================================================================
 # VISUALIZATION 4: TREEMAP OF TAX COLLECTION
 # ==============================================================================
 
-def create_treemap():
+def draw_treemap():
     """Create treemap showing tax collection contribution by state"""
     import squarify
+    plt = _pyplot()
+    df = get_data()
     
     fig, ax = plt.subplots(figsize=(16, 10))
     
     # Prepare data (top 15 states + others)
-    top_15 = df.nlargest(15, 'Tax_Collection_Percent')
-    others_value = df.nsmallest(13, 'Tax_Collection_Percent')['Tax_Collection_Percent'].sum()
+    ranking = get_ranking('Tax_Collection_Percent')
+    top_15 = df.iloc[ranking.top(15)]
+    others = ranking.rest(15)
+    others_value = ranking.values[others].sum()
     
     sizes = list(top_15['Tax_Collection_Percent']) + [others_value]
     labels = [f"{state}\n{pct:.2f}%" 
               for state, pct in zip(top_15['State'], top_15['Tax_Collection_Percent'])]
-    labels += [f"Others (13 states)\n{others_value:.2f}%"]
+    labels += [f"Others ({len(others)} states)\n{others_value:.2f}%"]
     
     # Create color map based on net difference
     colors_list = list(top_15['Net_Difference_PP']) + [0]
@@ -376,26 +495,291 @@ def create_treemap():
     ax.axis('off')
     
     # Add watermark
-    fig.text(0.99, 0.01, '@rkjat65 | Source: Ministry of Finance, Rajya Sabha', 
+    fig.text(0.99, 0.01, WATERMARK, 
              ha='right', va='bottom', fontsize=8, alpha=0.6, style='italic')
     
     plt.tight_layout()
-    plt.savefig('/mnt/user-data/outputs/chart4_treemap.png', dpi=300, bbox_inches='tight')
-    print("✓ Chart 4 saved: chart4_treemap.png")
-    
     return fig
 
+# ==============================================================================
+# RENDERING PIPELINE
+# ==============================================================================
+
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent / 'outputs'
+
+# Chart name -> (file stem, drawing function, data columns it plots), in report order
+CHARTS = {
+    'diverging_bar': ('chart1_diverging_bar', draw_diverging_bar_chart,
+                      ['State', 'Net_Difference_PP']),
+    'scatter_plot': ('chart2_scatter_plot', draw_scatter_plot,
+                     ['State', 'Tax_Collection_Percent', 'Devolution_Percent',
+                      'Tax_Collection_Lakh_Crore', 'Net_Difference_PP']),
+    'stacked_comparison': ('chart3_stacked_comparison', draw_stacked_comparison,
+                           ['State', 'Tax_Collection_Lakh_Crore', 'Tax_Collection_Percent',
+                            'Devolution_Percent']),
+    'treemap': ('chart4_treemap', draw_treemap,
+                ['State', 'Tax_Collection_Percent', 'Net_Difference_PP']),
+}
+
+# A new version of any of these changes how every chart looks
+PLOTTING_PACKAGES = ['matplotlib', 'seaborn', 'squarify']
+
+OUTPUT_FORMATS = ['png', 'svg', 'webp']
+DEFAULT_DPI = 300
+
+# Batches of (format, dpi): print is the original 300 dpi PNG set
+FORMAT_PRESETS = {
+    'print': [('png', 300)],
+    'web': [('svg', None), ('webp', 100)],
+    'social': [('png', 150), ('webp', 150)],
+}
+
+
+def parse_format(text):
+    """('png', 150) from 'png:150'; SVG is vector so has no dpi, the others default to 300"""
+    fmt, _, dpi = text.lower().partition(':')
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported format {fmt!r} - use one of {', '.join(OUTPUT_FORMATS)}")
+    if fmt == 'svg':
+        return fmt, None
+    return fmt, int(dpi) if dpi else DEFAULT_DPI
+
+
+def output_name(stem, fmt, dpi):
+    """chart1_diverging_bar.png at the default dpi, chart1_diverging_bar_150dpi.png otherwise"""
+    if dpi is None or dpi == DEFAULT_DPI:
+        return f"{stem}.{fmt}"
+    return f"{stem}_{dpi}dpi.{fmt}"
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class OutputTarget:
+    """Directory the charts and CSVs are written to, with a content-addressed
+    cache of chart renders in its .render_cache folder.
+
+    A render is stored as .render_cache/<chart key>/<file> and copied out to
+    the directory; the manifest records which key each published file came
+    from, so an unchanged chart is neither redrawn nor copied again. Renders
+    that no published file and no chart of the current run use are pruned.
+    """
+
+    CACHE_DIR = '.render_cache'
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory or os.environ.get('FISCAL_OUTPUT_DIR')
+                              or DEFAULT_OUTPUT_DIR)
+        self.cache_dir = self.directory / self.CACHE_DIR
+        self._manifest = None
+
+    def path(self, name):
+        """Path of an output file (the directory is created if needed)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        return self.directory / name
+
+    def cached(self, key, name):
+        """Path of a file in the render cache"""
+        return self.cache_dir / key / name
+
+    @property
+    def manifest(self):
+        """{published file: key of the render it was copied from}"""
+        if self._manifest is None:
+            path = self.cache_dir / self.MANIFEST
+            self._manifest = json.loads(path.read_text(encoding='utf-8')) if path.exists() else {}
+        return self._manifest
+
+    def is_current(self, key, name):
+        """True if the published file is the render with this key"""
+        return self.manifest.get(name) == key and (self.directory / name).exists()
+
+    def publish(self, key, name):
+        """Copy a cached render into the output directory"""
+        shutil.copyfile(self.cached(key, name), self.path(name))
+        self.manifest[name] = key
+
+    def prune(self, keys=()):
+        """Delete cached renders other than the given keys and those of the
+        published files; returns the number of renders removed"""
+        self._manifest = {name: key for name, key in self.manifest.items()
+                          if (self.directory / name).exists()}
+        keep = set(keys) | set(self.manifest.values())
+        if not self.cache_dir.exists():
+            return 0
+        stale = [path for path in self.cache_dir.iterdir()
+                 if path.is_dir() and path.name not in keep]
+        for path in stale:
+            shutil.rmtree(path, ignore_errors=True)
+        return len(stale)
+
+    def save_manifest(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        partial = self.cache_dir / (self.MANIFEST + '.tmp')
+        partial.write_text(json.dumps(self.manifest, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(partial, self.cache_dir / self.MANIFEST)
+
+
+def chart_key(name):
+    """Content address of a chart: a hash of the data columns it plots, the
+    plot style and the code that draws it (including the ordering helpers and
+    fiscal_analytics, whose colours and classification the charts use) and
+    package versions"""
+    import hashlib
+    import inspect
+    from importlib.metadata import PackageNotFoundError, version
+
+    import fiscal_analytics
+    import pandas as pd
+
+    _, draw, columns = CHARTS[name]
+    digest = hashlib.blake2b(digest_size=12)
+    data = get_data()[columns]
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    versions = []
+    for package in PLOTTING_PACKAGES:
+        try:
+            versions.append(version(package))
+        except PackageNotFoundError:
+            versions.append(None)
+    digest.update(repr((columns, PLOT_STYLE, WATERMARK, versions)).encode())
+    for source in (draw, _pyplot, get_ranking, get_sorted, fiscal_analytics):
+        digest.update(inspect.getsource(source).encode())
+    return digest.hexdigest()
+
+
+def render_chart(name, formats, output_dir):
+    """Draw one chart headless and save it in every (format, dpi); the figure
+    is always closed. Returns (name, [(file, bytes)], seconds, peak RSS MB)."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+    start = time.perf_counter()
+    stem, draw, _ = CHARTS[name]
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fig = draw()
+    try:
+        files = []
+        for fmt, dpi in formats:
+            path = output_dir / output_name(stem, fmt, dpi)
+            # Write then rename, so the cache never holds half a file
+            partial = path.with_name(path.name + '.tmp')
+            fig.savefig(partial, format=fmt, dpi=dpi or DEFAULT_DPI, bbox_inches='tight')
+            os.replace(partial, path)
+            files.append((path.name, path.stat().st_size))
+    finally:
+        _pyplot().close(fig)
+    return name, files, time.perf_counter() - start, _peak_rss_mb()
+
+
+def render_charts(names=None, formats=None, workers=None, target=None, force=False):
+    """Bring the output directory's charts up to date, rendering in parallel.
+
+    Only (chart, format) files missing from the render cache are drawn
+    (everything with force=True), one fresh worker process per chart.
+    Workers are spawned (no inherited pyplot state) and exit after their
+    chart, so the memory of one render never carries over to the next.
+    Cached renders that neither this run nor a published file uses are
+    deleted. Returns (name, [(file, bytes)], seconds, peak RSS MB, status)
+    per chart, in chart order; status is 'rendered', 'cached' (copied from
+    the cache) or 'unchanged'.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    names = list(names or CHARTS)
+    formats = formats or FORMAT_PRESETS['print']
+    target = target or OutputTarget()
+
+    plan = []
+    for name in names:
+        key = chart_key(name)
+        files = [output_name(CHARTS[name][0], fmt, dpi) for fmt, dpi in formats]
+        missing = [fmt for fmt, file in zip(formats, files)
+                   if force or not target.cached(key, file).exists()]
+        plan.append((name, key, files, missing))
+
+    rendered = {}
+    todo = [(name, key, missing) for name, key, _, missing in plan if missing]
+    if todo:
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            futures = {name: executor.submit(render_chart, name, missing,
+                                             target.cache_dir / key)
+                       for name, key, missing in todo}
+            rendered = {name: future.result() for name, future in futures.items()}
+
+    results = []
+    for name, key, files, missing in plan:
+        stale = [file for file in files if name in rendered or not target.is_current(key, file)]
+        for file in stale:
+            target.publish(key, file)
+        _, _, seconds, peak_mb = rendered.get(name, (name, [], 0.0, None))
+        status = 'rendered' if name in rendered else 'cached' if stale else 'unchanged'
+        results.append((name, [(file, target.path(file).stat().st_size) for file in files],
+                        seconds, peak_mb, status))
+    # Renders of older data or code are never reused, so the cache holds at
+    # most one render per published file and chart of this run
+    target.prune(key for _, key, _, _ in plan)
+    target.save_manifest()
+    return results
+
+
+def _create(name, number, target=None):
+    """Draw a chart, save it as the 300 dpi PNG and return the open figure"""
+    stem, draw, _ = CHARTS[name]
+    target = target or OutputTarget()
+    fig = draw()
+    fig.savefig(target.path(f"{stem}.png"), dpi=DEFAULT_DPI, bbox_inches='tight')
+    print(f"✓ Chart {number} saved: {stem}.png")
+    return fig
+
+
+# One-off versions of the charts for interactive use; close the figure when done
+def create_diverging_bar_chart(target=None):
+    """Create professional diverging bar chart showing net contributors vs beneficiaries"""
+    return _create('diverging_bar', 1, target)
+
+
+def create_scatter_plot(target=None):
+    """Create scatter plot showing relationship between contribution and devolution"""
+    return _create('scatter_plot', 2, target)
+
+
+def create_stacked_comparison(target=None):
+    """Create stacked bar comparison for top states"""
+    return _create('stacked_comparison', 3, target)
+
+
+def create_treemap(target=None):
+    """Create treemap showing tax collection contribution by state"""
+    return _create('treemap', 4, target)
+
+
 # ==============================================================================
 # DATA EXPORT
 # ==============================================================================
 
-def export_data():
+def export_data(target=None):
     """Export cleaned data for further analysis"""
+    import pandas as pd
+    target = target or OutputTarget()
+    stats = get_summary()
+    max_contributor = stats['max_contributor']
+    max_beneficiary = stats['max_beneficiary']
     
     # Export main dataset
-    df_export = df.copy()
-    df_export = df_export.sort_values('Net_Difference_PP', ascending=False)
-    df_export.to_csv('/mnt/user-data/outputs/fiscal_federalism_data.csv', index=False)
+    df_export = get_sorted().copy()
+    df_export.to_csv(target.path('fiscal_federalism_data.csv'), index=False)
     print("✓ Data exported: fiscal_federalism_data.csv")
     
     # Create summary statistics file
@@ -412,11 +796,11 @@ def export_data():
             'Largest Beneficiary (pp difference)'
         ],
         'Value': [
-            f"{df['Tax_Collection_Lakh_Crore'].sum():.2f}",
-            f"{df['Devolution_Lakh_Crore'].sum():.2f}",
-            f"{(df['Devolution_Lakh_Crore'].sum()/df['Tax_Collection_Lakh_Crore'].sum()*100):.2f}",
-            len(contributors),
-            len(beneficiaries),
+            f"{stats['total_tax']:.2f}",
+            f"{stats['total_devolution']:.2f}",
+            f"{stats['devolution_rate']:.2f}",
+            len(stats['contributors']),
+            len(stats['beneficiaries']),
             max_contributor['State'],
             f"{max_contributor['Net_Difference_PP']:.2f}",
             max_beneficiary['State'],
@@ -424,7 +808,7 @@ def export_data():
         ]
     }
     
-    pd.DataFrame(summary).to_csv('/mnt/user-data/outputs/summary_statistics.csv', index=False)
+    pd.DataFrame(summary).to_csv(target.path('summary_statistics.csv'), index=False)
     print("✓ Summary exported: summary_statistics.csv")
     
     return df_export
@@ -433,27 +817,87 @@ def export_data():
 # MAIN EXECUTION
 # ==============================================================================
 
-if __name__ == "__main__":
-    print("\nGenerating visualizations...\n")
-    
-    # Create all visualizations
-    create_diverging_bar_chart()
-    create_scatter_plot()
-    create_stacked_comparison()
-    create_treemap()
+def parse_args(argv=None):
+    """Parse command line options"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Fiscal federalism analysis: state tax contributions vs devolutions")
+    parser.add_argument('--out', default=None, metavar='DIR',
+                        help="output directory (default: $FISCAL_OUTPUT_DIR or outputs/ "
+                             "next to this script)")
+    parser.add_argument('--force', action='store_true',
+                        help="redraw every chart even if its cached render is current")
+    parser.add_argument('--no-charts', action='store_true',
+                        help="print the summary and export the data without drawing charts")
+    parser.add_argument('--chart', action='append', choices=list(CHARTS),
+                        help="render only this chart (repeatable; default: all)")
+    parser.add_argument('--format', action='append', default=[], metavar='FMT[:DPI]',
+                        help="output format png, svg or webp, with an optional dpi "
+                             "(repeatable, e.g. --format webp:100)")
+    parser.add_argument('--preset', action='append', choices=list(FORMAT_PRESETS), default=[],
+                        help="a batch of formats (repeatable; default: print = png:300)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="chart rendering processes (default: one per CPU core)")
+    args = parser.parse_args(argv)
+
+    try:
+        formats = [fmt for preset in args.preset for fmt in FORMAT_PRESETS[preset]]
+        formats += [parse_format(text) for text in args.format]
+    except ValueError as e:
+        parser.error(str(e))
+    # Keep the first of any repeated (format, dpi)
+    args.formats = list(dict.fromkeys(formats)) or FORMAT_PRESETS['print']
+    return args
+
+
+def main(argv=None):
+    """Print the summary, draw every chart and export the data"""
+    args = parse_args(argv)
+    target = OutputTarget(args.out)
+    print_summary()
+
+    rendered = []
+    if not args.no_charts:
+        print(f"\nGenerating visualizations in {target.directory}...\n")
+
+        # Render the changed charts in parallel worker processes
+        start = time.perf_counter()
+        rendered = render_charts(args.chart, args.formats, args.workers, target, args.force)
+        for number, (name, files, seconds, peak_mb, status) in enumerate(rendered, 1):
+            names = ', '.join(file for file, _ in files)
+            if status == 'rendered':
+                memory = f", peak {peak_mb:.0f} MB" if peak_mb else ""
+                print(f"✓ Chart {number} saved: {names} ({seconds:.1f}s{memory})")
+            else:
+                print(f"✓ Chart {number} {status}: {names} (render cache)")
+        redrawn = sum(status == 'rendered' for *_, status in rendered)
+        print(f"  {redrawn} of {len(rendered)} charts rendered in "
+              f"{time.perf_counter() - start:.1f}s")
     
     # Export data
     print("\nExporting data...\n")
-    export_data()
+    export_data(target)
     
     print("\n" + "="*80)
     print("ANALYSIS COMPLETE!")
     print("="*80)
     print("\nGenerated files:")
-    print("  1. chart1_diverging_bar.png - Main visualization for Twitter")
-    print("  2. chart2_scatter_plot.png - Contribution vs Devolution map")
-    print("  3. chart3_stacked_comparison.png - Top 10 states comparison")
-    print("  4. chart4_treemap.png - Tax collection proportions")
-    print("  5. fiscal_federalism_data.csv - Complete dataset")
-    print("  6. summary_statistics.csv - Key metrics")
+    descriptions = {
+        'diverging_bar': "Main visualization for Twitter",
+        'scatter_plot': "Contribution vs Devolution map",
+        'stacked_comparison': "Top 10 states comparison",
+        'treemap': "Tax collection proportions",
+    }
+    number = 0
+    for name, files, *_ in rendered:
+        for file, _ in files:
+            number += 1
+            print(f"  {number}. {file} - {descriptions[name]}")
+    print(f"  {number + 1}. fiscal_federalism_data.csv - Complete dataset")
+    print(f"  {number + 2}. summary_statistics.csv - Key metrics")
     print("\n")
+
+
+if __name__ == "__main__":
+    main()
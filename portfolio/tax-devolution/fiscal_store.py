@@ -0,0 +1,363 @@
+"""
+Fiscal Federalism Data Store: state x period x metric
+Data Source: Ministry of Finance annual tax collection and devolution figures
+Author: RK Jat (@rkjat65)
+
+Loads any number of datasets (CSV or Parquet) into one float64 cube of
+states x periods x metrics, so years, Finance Commission periods and tax
+heads live side by side without merging frames.
+
+A dataset has a State and a Year column and either
+    - one column per metric (wide), e.g. Tax_Collection_Lakh_Crore, or
+    - Metric and Value columns (long).
+An optional Tax_Head column (e.g. 'Income Tax', 'CGST') stores its rows as
+'<metric>:<head>', so per-head figures sit next to the totals. Year takes
+'2020-21', 'FY 2020-21', 2020 (one fiscal year) or '2020-25' (a multi-year
+period). Tax collection and devolution can come from separate files: each
+value goes to its own cell, and a later dataset overrides an earlier one.
+
+Shares missing from a dataset (Tax_Collection_Percent, Devolution_Percent)
+are computed from the amounts, as % of the states' total in that period.
+The derived metrics (Net_Difference_PP, Net_Difference_Absolute,
+Devolution_Ratio, Multiplier) are computed for the whole cube at once with
+NumPy, for the totals and for every tax head.
+
+Usage:
+    from fiscal_store import FiscalStore
+
+    store = FiscalStore.load(['data/tax_2015_2025.csv', 'data/devolution.parquet'])
+    store.series('Bihar', 'Multiplier', start=2015, end=2025)   # one value per year
+    store.trend('Net_Difference_PP', states=['Bihar', 'Maharashtra'])
+    store.frame('2020-25')                                      # one period, wide
+
+    python fiscal_store.py data/*.csv --metric Multiplier --state Bihar --from 2015 --to 2025
+"""
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = ['State', 'Year', 'Tax_Head']
+
+# Input metrics, in the order they are stored
+BASE_METRICS = ['Tax_Collection_Lakh_Crore', 'Tax_Collection_Percent',
+                'Devolution_Lakh_Crore', 'Devolution_Percent']
+
+# Computed by the store; inputs with these names are ignored
+DERIVED_METRICS = ['Net_Difference_PP', 'Net_Difference_Absolute',
+                   'Devolution_Ratio', 'Multiplier']
+
+# Share metric -> amount it is computed from when a dataset doesn't have it
+SHARES = {'Tax_Collection_Percent': 'Tax_Collection_Lakh_Crore',
+          'Devolution_Percent': 'Devolution_Lakh_Crore'}
+
+# Derived metric -> (operation, left input, right input)
+FORMULAS = {
+    'Net_Difference_PP': (np.subtract, 'Tax_Collection_Percent', 'Devolution_Percent'),
+    'Net_Difference_Absolute': (np.subtract, 'Tax_Collection_Lakh_Crore', 'Devolution_Lakh_Crore'),
+    'Devolution_Ratio': (np.divide, 'Devolution_Lakh_Crore', 'Tax_Collection_Lakh_Crore'),
+    'Multiplier': (np.divide, 'Devolution_Percent', 'Tax_Collection_Percent'),
+}
+
+HEAD_SEPARATOR = ':'
+
+_PERIOD_PATTERN = re.compile(r'(\d{4})(?:\s*[-/–]\s*(\d{2}|\d{4}))?')
+
+
+def metric_name(metric, head=None):
+    """Stored name of a metric, for one tax head or the total (head=None)"""
+    return f"{metric}{HEAD_SEPARATOR}{head}" if head else metric
+
+
+def split_metric(name):
+    """(metric, tax head or None) of a stored metric name"""
+    metric, _, head = name.partition(HEAD_SEPARATOR)
+    return metric, head or None
+
+
+def parse_period(value):
+    """(label, first year, last year) of a Year value: 2020 and 'FY 2020-21'
+    are ('2020-21', 2020, 2021); '2020-25' is ('2020-25', 2020, 2025)"""
+    if isinstance(value, (int, np.integer)) or (isinstance(value, float) and value.is_integer()):
+        start, end = int(value), int(value) + 1
+    else:
+        text = str(value).strip().upper().removeprefix('FY').strip()
+        match = _PERIOD_PATTERN.fullmatch(text)
+        if not match:
+            raise ValueError(f"Unrecognised fiscal year: {value!r}")
+        start = int(match[1])
+        if match[2] is None:
+            end = start + 1
+        elif len(match[2]) == 4:
+            end = int(match[2])
+        else:
+            end = start - start % 100 + int(match[2])
+            if end <= start:
+                end += 100
+        if end <= start:
+            raise ValueError(f"Fiscal period ends before it starts: {value!r}")
+    return f"{start}-{end % 100:02d}", start, end
+
+
+def read_dataset(path):
+    """A dataset file as a DataFrame (.csv or .parquet)"""
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        return pd.read_csv(path)
+    if path.suffix.lower() in ('.parquet', '.pq'):
+        return pd.read_parquet(path)
+    raise ValueError(f"{path}: datasets must be .csv or .parquet")
+
+
+def _records(frame, source):
+    """(State, Year, Metric, Value) rows of a wide or long dataset"""
+    missing = [column for column in ['State', 'Year'] if column not in frame.columns]
+    if missing:
+        raise ValueError(f"{source}: missing column(s) {', '.join(missing)}")
+    keys = [column for column in KEY_COLUMNS if column in frame.columns]
+
+    if {'Metric', 'Value'} <= set(frame.columns):
+        long = frame[keys + ['Metric', 'Value']]
+    else:
+        metrics = [column for column in frame.columns
+                   if column not in KEY_COLUMNS and column not in DERIVED_METRICS
+                   and pd.api.types.is_numeric_dtype(frame[column])]
+        long = frame.melt(id_vars=keys, value_vars=metrics, var_name='Metric', value_name='Value')
+
+    long = long[~long['Metric'].isin(DERIVED_METRICS)]
+    metric = long['Metric'].astype(str)
+    if 'Tax_Head' in long.columns:
+        head = long['Tax_Head']
+        metric = metric.where(head.isna(), metric + HEAD_SEPARATOR + head.astype(str))
+    return pd.DataFrame({
+        'State': long['State'].astype(str).str.strip().to_numpy(),
+        'Year': long['Year'].to_numpy(),
+        'Metric': metric.to_numpy(),
+        'Value': pd.to_numeric(long['Value']).to_numpy(dtype=np.float64),
+    }).dropna(subset=['Value'])
+
+
+def _metric_order(names):
+    """Stored metrics: per head (totals first), the base metrics with any
+    shares that can be computed, other inputs, then the derived metrics
+    whose inputs are available"""
+    heads = {}
+    for name in names:
+        metric, head = split_metric(name)
+        heads.setdefault(head, []).append(metric)
+
+    ordered = []
+    for head in sorted(heads, key=lambda head: (head is not None, head or '')):
+        present = set(heads[head])
+        present |= {share for share, amount in SHARES.items() if amount in present}
+        metrics = [metric for metric in BASE_METRICS if metric in present]
+        metrics += [metric for metric in dict.fromkeys(heads[head]) if metric not in BASE_METRICS]
+        metrics += [metric for metric, (_, left, right) in FORMULAS.items()
+                    if left in present and right in present]
+        ordered += [metric_name(metric, head) for metric in metrics]
+    return ordered
+
+
+class FiscalStore:
+    """Values of every state, period and metric in one (states, periods,
+    metrics) float64 array, NaN where a dataset has no value"""
+
+    def __init__(self, values, states, periods, metrics):
+        self.values = values            # (states, periods, metrics) float64
+        self.states = list(states)
+        self.periods = periods          # label, start, end per period, sorted
+        self.metrics = list(metrics)
+        self._state_pos = {state: i for i, state in enumerate(self.states)}
+        self._period_pos = {label: i for i, label in enumerate(periods['label'])}
+        self._metric_pos = {metric: i for i, metric in enumerate(self.metrics)}
+        self._starts = periods['start'].to_numpy()
+        self._ends = periods['end'].to_numpy()
+
+    @classmethod
+    def load(cls, paths):
+        """Store of the dataset files, later files overriding earlier ones"""
+        paths = [Path(path) for path in paths]
+        return cls.from_frames([read_dataset(path) for path in paths],
+                               sources=[str(path) for path in paths])
+
+    @classmethod
+    def from_frames(cls, frames, sources=None):
+        """Store of in-memory datasets, later frames overriding earlier ones"""
+        sources = sources or [f"dataset {number}" for number in range(1, len(frames) + 1)]
+        records = pd.concat([_records(frame, source) for frame, source in zip(frames, sources)],
+                            ignore_index=True)
+
+        # Codes per column; states keep the order they first appear in
+        state_codes, states = pd.factorize(records['State'])
+        year_codes, years = pd.factorize(records['Year'])
+        parsed = [parse_period(year) for year in years]
+        periods = (pd.DataFrame(parsed, columns=['label', 'start', 'end'])
+                   .drop_duplicates('label')
+                   .sort_values(['start', 'end'], ignore_index=True))
+        period_pos = {label: i for i, label in enumerate(periods['label'])}
+        period_codes = np.array([period_pos[label] for label, _, _ in parsed],
+                                dtype=np.intp)[year_codes]
+        metrics = _metric_order(pd.unique(records['Metric']))
+        metric_pos = {metric: i for i, metric in enumerate(metrics)}
+        metric_codes = records['Metric'].map(metric_pos).to_numpy(dtype=np.intp)
+
+        # One scatter into the cube; the last value of a repeated cell wins
+        cells = pd.DataFrame({'s': state_codes, 'p': period_codes, 'm': metric_codes})
+        last = ~cells.duplicated(keep='last').to_numpy()
+        values = np.full((len(states), len(periods), len(metrics)), np.nan)
+        values[state_codes[last], period_codes[last], metric_codes[last]] = \
+            records['Value'].to_numpy()[last]
+
+        store = cls(values, states, periods, metrics)
+        store._derive()
+        return store
+
+    def _derive(self):
+        """Fill missing shares from the amounts and compute the derived
+        metrics, for every tax head, across all states and periods"""
+        heads = {split_metric(name)[1] for name in self.metrics}
+        for head in heads:
+            def column(metric):
+                position = self._metric_pos.get(metric_name(metric, head))
+                return None if position is None else self.values[:, :, position]
+
+            for share, amount in SHARES.items():
+                shares, amounts = column(share), column(amount)
+                if shares is None or amounts is None:
+                    continue
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    computed = amounts / np.nansum(amounts, axis=0, keepdims=True) * 100
+                np.copyto(shares, computed, where=np.isnan(shares))
+
+            for metric, (operation, left, right) in FORMULAS.items():
+                result = column(metric)
+                if result is not None:
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        operation(column(left), column(right), out=result)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def _positions(self, lookup, keys, kind):
+        """Positions of the given keys (all for None)"""
+        if keys is None:
+            return np.arange(len(lookup))
+        if isinstance(keys, str):
+            keys = [keys]
+        missing = [key for key in keys if key not in lookup]
+        if missing:
+            raise KeyError(f"Unknown {kind}: {', '.join(map(repr, missing))}")
+        return np.array([lookup[key] for key in keys], dtype=np.intp)
+
+    def period_positions(self, start=None, end=None, span=None):
+        """Positions of the periods within [start, end] (years), of `span`
+        years each (any length for None)"""
+        mask = np.ones(len(self._starts), dtype=bool)
+        if start is not None:
+            mask &= self._starts >= start
+        if end is not None:
+            mask &= self._ends <= end
+        if span is not None:
+            mask &= self._ends - self._starts == span
+        return np.flatnonzero(mask)
+
+    def select(self, states=None, metrics=None, start=None, end=None, span=None):
+        """(values, states, period labels, metrics) of a slice of the cube"""
+        rows = self._positions(self._state_pos, states, 'state')
+        cols = self._positions(self._metric_pos, metrics, 'metric')
+        periods = self.period_positions(start, end, span)
+        values = self.values[np.ix_(rows, periods, cols)]
+        return (values, [self.states[i] for i in rows],
+                self.periods['label'].to_numpy()[periods].tolist(),
+                [self.metrics[i] for i in cols])
+
+    def series(self, state, metric, start=None, end=None, span=1):
+        """One state's metric over time, indexed by period (single fiscal
+        years by default; span=None includes multi-year periods)"""
+        values, _, periods, _ = self.select(state, metric, start, end, span)
+        return pd.Series(values[0, :, 0], index=pd.Index(periods, name='Year'),
+                         name=f"{state} {metric}")
+
+    def trend(self, metric, states=None, start=None, end=None, span=1):
+        """A metric over time, one column per state and one row per period"""
+        values, states, periods, _ = self.select(states, metric, start, end, span)
+        return pd.DataFrame(values[:, :, 0].T, index=pd.Index(periods, name='Year'),
+                            columns=states)
+
+    def frame(self, period, head=None):
+        """One period as a wide DataFrame (State plus one column per metric of
+        the totals, or of a tax head), without states or metrics it lacks"""
+        if period not in self._period_pos:
+            period = parse_period(period)[0]
+        values = self.values[:, self._positions(self._period_pos, period, 'period')[0], :]
+        cols = [i for i, name in enumerate(self.metrics) if split_metric(name)[1] == head]
+        values = values[:, cols]
+        rows = ~np.isnan(values).all(axis=1)
+        present = ~np.isnan(values[rows]).all(axis=0)
+        df = pd.DataFrame(values[rows][:, present],
+                          columns=[split_metric(self.metrics[i])[0]
+                                   for i, keep in zip(cols, present) if keep])
+        df.insert(0, 'State', np.array(self.states, dtype=object)[rows])
+        return df
+
+    def to_long(self):
+        """Every value as (State, Year, Metric, Value) rows"""
+        s, p, m = np.nonzero(~np.isnan(self.values))
+        return pd.DataFrame({
+            'State': np.array(self.states, dtype=object)[s],
+            'Year': self.periods['label'].to_numpy()[p],
+            'Metric': np.array(self.metrics, dtype=object)[m],
+            'Value': self.values[s, p, m],
+        })
+
+    def describe(self):
+        """One line with the size of the store"""
+        heads = sorted({head for head in map(lambda name: split_metric(name)[1], self.metrics)
+                        if head})
+        labels = self.periods['label']
+        span = f"{labels.iloc[0]} to {labels.iloc[-1]}" if len(labels) else "no periods"
+        return (f"{len(self.states)} states x {len(labels)} periods ({span}) x "
+                f"{len(self.metrics)} metrics"
+                + (f", tax heads: {', '.join(heads)}" if heads else ""))
+
+
+# ==============================================================================
+# MAIN EXECUTION
+# ==============================================================================
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query multi-year fiscal federalism datasets")
+    parser.add_argument('datasets', nargs='+', help="CSV or Parquet files, later ones override")
+    parser.add_argument('--metric', default='Multiplier',
+                        help="metric to show, '<metric>:<tax head>' for one head "
+                             "(default: Multiplier)")
+    parser.add_argument('--state', action='append', dest='states', default=None,
+                        help="state to show (repeatable; default: all)")
+    parser.add_argument('--from', type=int, dest='start', default=None, metavar='YEAR')
+    parser.add_argument('--to', type=int, dest='end', default=None, metavar='YEAR')
+    parser.add_argument('--all-periods', action='store_true',
+                        help="include multi-year periods, not just single fiscal years")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Load the datasets and print a metric's trend"""
+    args = parse_args(argv)
+    store = FiscalStore.load(args.datasets)
+    print(f"✓ Loaded {len(args.datasets)} dataset(s): {store.describe()}")
+    print()
+    trend = store.trend(args.metric, args.states, args.start, args.end,
+                        span=None if args.all_periods else 1)
+    print(f"{args.metric.upper()} BY YEAR")
+    print("-"*80)
+    print(trend.to_string(float_format=lambda value: f"{value:.2f}"))
+
+
+if __name__ == "__main__":
+    main()